@@ -1,8 +1,16 @@
 import logging
 import os
+import threading
+import time
 from pathlib import Path
 
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.migrations import run_migrations
 
 # プロジェクトルートのパスを取得
 BASE_DIR = Path(__file__).parent.parent
@@ -20,19 +28,240 @@ if DATABASE_URL.startswith("sqlite:///"):
 
 logger = logging.getLogger(__name__)
 
-connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid integer for {name}: {value!r}, using {default}")
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+POOL_WAIT_WARN_MS = env_int("DB_POOL_WAIT_WARN_MS", 100)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """接続の取得待ち時間を記録する QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        if waited * 1000 >= POOL_WAIT_WARN_MS:
+            logger.warning(
+                f"Waited {waited * 1000:.1f}ms for a database connection "
+                f"(checked_out={self.checkedout()}, overflow={self.overflow()})"
+            )
+        return connection
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """非同期エンジン用（接続の取得待ちの記録は InstrumentedQueuePool と同じ）"""
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url in {"sqlite://", "sqlite:///:memory:"}
+
+
+def _pool_options(url: str) -> dict:
+    # インメモリ SQLite は単一接続前提のプールを使うため設定しない
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": env_int("DB_POOL_SIZE", 5),
+        "max_overflow": env_int("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": env_int("DB_POOL_RECYCLE", -1),
+        "pool_pre_ping": env_bool("DB_POOL_PRE_PING", False),
+    }
+
+
+# SQLITE_PROFILE=production で WAL などの本番向け PRAGMA を接続ごとに適用する
+SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "").strip().lower()
+
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": env_int("SQLITE_BUSY_TIMEOUT_MS", 5000),
+    "mmap_size": env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+    "cache_size": env_int("SQLITE_CACHE_SIZE", -64000),
+    "temp_store": "MEMORY",
+}
+
+
+def apply_sqlite_pragmas(target: Engine, pragmas: dict) -> None:
+    @event.listens_for(target, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def build_engine(url: str, sqlite_profile: str = SQLITE_PROFILE) -> Engine:
+    connect_args = {}
+    if url.startswith("sqlite"):
+        connect_args = {"check_same_thread": False}
+    new_engine = create_engine(url, connect_args=connect_args, **_pool_options(url))
+    if url.startswith("sqlite") and not _is_memory_sqlite(url) and sqlite_profile == "production":
+        apply_sqlite_pragmas(new_engine, SQLITE_PRODUCTION_PRAGMAS)
+    return new_engine
+
+
+def to_async_url(url: str) -> str:
+    """SQLite は aiosqlite、PostgreSQL は asyncpg の URL にする
+
+    それ以外のデータベースは ASYNC_DATABASE_URL で指定する
+    """
+    scheme, rest = url.split(":", 1)
+    if scheme == "sqlite":
+        return "sqlite+aiosqlite:" + rest
+    if scheme in {"postgresql", "postgresql+psycopg2", "postgresql+psycopg"}:
+        return "postgresql+asyncpg:" + rest
+    if scheme in {"sqlite+aiosqlite", "postgresql+asyncpg"}:
+        return url
+    raise ValueError(f"ASYNC_DATABASE_URL is required for this database ({scheme})")
+
+
+def build_async_engine(url: str, sqlite_profile: str = SQLITE_PROFILE) -> AsyncEngine:
+    sync_url = url.replace("+aiosqlite", "")
+    options = _pool_options(sync_url)
+    if "poolclass" in options:
+        # 非同期エンジンは AsyncAdaptedQueuePool 系のプールでなければならない
+        options["poolclass"] = InstrumentedAsyncQueuePool
+    new_engine = create_async_engine(url, **options)
+    if (
+        sync_url.startswith("sqlite")
+        and not _is_memory_sqlite(sync_url)
+        and sqlite_profile == "production"
+    ):
+        apply_sqlite_pragmas(new_engine.sync_engine, SQLITE_PRODUCTION_PRAGMAS)
+    return new_engine
+
+
+engine = build_engine(DATABASE_URL)
+
+# 一覧系の読み込みはレプリカに振り分ける（未設定ならプライマリを使う）
+DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL")
+replica_engine: Engine | None = None
+if DATABASE_REPLICA_URL:
+    replica_engine = build_engine(DATABASE_REPLICA_URL)
+
+# 読み込み中心のページと通知の配信はイベントループ上で処理するため非同期エンジンも使う。
+# ドライバや URL の不備で import 時に落ちないよう、最初に使うときに作成する
+ASYNC_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL")
+ASYNC_DATABASE_REPLICA_URL = os.environ.get("ASYNC_DATABASE_REPLICA_URL")
+
+_async_engines: dict[str, AsyncEngine] = {}
+_async_engines_lock = threading.Lock()
+
+
+def _lazy_async_engine(name: str, async_url: str | None, url: str) -> AsyncEngine:
+    with _async_engines_lock:
+        if name not in _async_engines:
+            try:
+                _async_engines[name] = build_async_engine(async_url or to_async_url(url))
+            except (ValueError, ImportError, exc.ArgumentError) as e:
+                raise RuntimeError(
+                    f"Async database engine ({name}) is unavailable: {e}. "
+                    "Set ASYNC_DATABASE_URL or install the async driver "
+                    "(e.g. the 'postgresql' extra for asyncpg)"
+                ) from e
+        return _async_engines[name]
+
+
+def get_async_engine() -> AsyncEngine:
+    return _lazy_async_engine("primary", ASYNC_DATABASE_URL, DATABASE_URL)
+
+
+def get_async_replica_engine() -> AsyncEngine | None:
+    if not DATABASE_REPLICA_URL:
+        return None
+    return _lazy_async_engine("replica", ASYNC_DATABASE_REPLICA_URL, DATABASE_REPLICA_URL)
+
+
+# 書き込み後この秒数はレプリカ遅延を避けるためプライマリから読む
+READ_YOUR_WRITES_SECONDS = env_int("DATABASE_REPLICA_STICKY_SECONDS", 5)
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_flush(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("read_only_session")
+
+
+def get_pool_stats(target: Engine | AsyncEngine | None = None) -> dict:
+    if isinstance(target, AsyncEngine):
+        target = target.sync_engine
+    pool = (target or engine).pool
+    stats: dict = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        with pool._stats_lock:
+            checkouts = pool.checkouts
+            wait_avg = pool.total_wait / checkouts if checkouts else 0.0
+            stats.update(
+                {
+                    "checkouts": checkouts,
+                    "timeouts": pool.timeouts,
+                    "wait_ms_avg": round(wait_avg * 1000, 3),
+                    "wait_ms_max": round(pool.max_wait * 1000, 3),
+                }
+            )
+    return stats
+
+
+def create_schema(target: Engine) -> list[int]:
+    SQLModel.metadata.create_all(target)
+    return run_migrations(target)
 
 
 def init_db() -> None:
     try:
         if DATABASE_PATH:
             logger.info(f"Creating database at: {DATABASE_PATH}")
-        SQLModel.metadata.create_all(engine)
+        applied = create_schema(engine)
         logger.info("Database tables created successfully")
+        if applied:
+            logger.info(f"Applied migrations: {applied}")
     except Exception as e:
         logger.error(f"Failed to create database: {e}", exc_info=True)
         raise
@@ -40,3 +269,22 @@ def init_db() -> None:
 
 def get_session() -> Session:
     return Session(engine)
+
+
+def get_async_session() -> AsyncSession:
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
+
+
+def replica_configured() -> bool:
+    return replica_engine is not None
+
+
+def get_read_session(use_primary: bool = False) -> Session:
+    target = engine if use_primary or replica_engine is None else replica_engine
+    return Session(target, info={"read_only": True})
+
+
+def get_async_read_session(use_primary: bool = False) -> AsyncSession:
+    replica = None if use_primary else get_async_replica_engine()
+    target = replica or get_async_engine()
+    return AsyncSession(target, expire_on_commit=False, info={"read_only": True})
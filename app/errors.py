@@ -12,3 +12,7 @@ class AuthenticationError(AppError):
 
 class AuthorizationError(AppError):
     pass
+
+
+class TooManyStreamsError(AppError):
+    pass
@@ -9,10 +9,22 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.staticfiles import StaticFiles
 
-from app.db import init_db
-from app.routes import admin, auth, organizer, stallholder, setup
+from app.db import (
+    engine,
+    env_bool,
+    get_async_engine,
+    get_async_replica_engine,
+    init_db,
+    replica_configured,
+    replica_engine,
+)
+from app.routes import admin, api, auth, organizer, stallholder, setup
 from app.routes import messages
 from app.routes import notifications
+from app.routes.deps import stick_to_primary
+from app.services.event_catalog import attach_event_catalog
+from app.services.notification_hub import notification_hub
+from app.services.notification_worker import start_notification_worker, stop_notification_worker
 
 # ログ設定
 logging.basicConfig(level=logging.INFO)
@@ -22,8 +34,27 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).parent.parent
 
 
+def _async_catalog_aliases() -> list:
+    # 非同期エンジンを作れない構成でも、同期エンジンでの検索にはカタログを使う
+    try:
+        targets = [get_async_engine(), get_async_replica_engine()]
+    except RuntimeError as e:
+        logger.warning(f"Event catalog is not attached to the async engines: {e}")
+        return []
+    return [target.sync_engine for target in targets if target is not None]
+
+
 def create_app() -> FastAPI:
     app = FastAPI()
+
+    # レプリカ利用時は書き込みリクエストの直後だけプライマリから読む
+    # request.session を使うため SessionMiddleware より先に（内側に）登録する
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        if request.method not in {"GET", "HEAD", "OPTIONS"} and replica_configured():
+            stick_to_primary(request)
+        return await call_next(request)
+
     secret_key = os.environ.get("SESSION_SECRET") or secrets.token_hex(32)
     app.add_middleware(SessionMiddleware, secret_key=secret_key)
     
@@ -43,6 +74,22 @@ def create_app() -> FastAPI:
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}", exc_info=True)
             raise
+        if env_bool("EVENT_CATALOG_ENABLED", True):
+            # 公開中イベントの検索はプロセス内カタログで答える（初回検索時に読み込む）
+            attach_event_catalog(engine, replica_engine, *_async_catalog_aliases())
+
+    @app.on_event("startup")
+    async def on_startup_worker() -> None:
+        if env_bool("NOTIFICATION_WORKER_ENABLED", True):
+            # 通知の配信はリクエストの外で、イベントループ上のタスクがまとめて行う
+            # 非同期エンジンを作れない構成（ドライバや URL の不備）はここで起動エラーになる
+            start_notification_worker(get_async_engine())
+
+    @app.on_event("shutdown")
+    async def on_shutdown() -> None:
+        # 通知のストリームを終わらせないとサーバーの終了を待たせる
+        notification_hub.close_all()
+        await stop_notification_worker()
 
     # エラーハンドリング
     @app.exception_handler(Exception)
@@ -68,6 +115,7 @@ def create_app() -> FastAPI:
     app.include_router(setup.router)
     app.include_router(messages.router)
     app.include_router(notifications.router)
+    app.include_router(api.router, prefix="/api")
 
     return app
 
@@ -0,0 +1,377 @@
+"""バージョン付きスキーマ移行
+
+create_all は既存テーブルのインデックスを変更しないため、稼働中の DB へのインデックス追加・削除は
+ここに移行として積み上げる。適用済みのバージョンは schema_migration テーブルに記録する。
+各操作は IF (NOT) EXISTS 付きで、create_all 直後の新規 DB に流しても結果は変わらない。
+"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import (
+    Connection,
+    Date,
+    DateTime,
+    Dialect,
+    Engine,
+    Float,
+    Integer,
+    String,
+    column,
+    insert,
+    inspect,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.types import TypeEngine
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_TABLE = "schema_migration"
+
+
+@dataclass(frozen=True)
+class CreateIndex:
+    name: str
+    table: str
+    columns: tuple[str, ...]
+
+    def apply(self, connection: Connection) -> None:
+        target = f'{self.name} ON "{self.table}" ({", ".join(self.columns)})'
+        if connection.dialect.name == "postgresql":
+            # 書き込みを止めずに作成する（トランザクション外で実行される）
+            sql = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {target}"
+        else:
+            sql = f"CREATE INDEX IF NOT EXISTS {target}"
+        connection.execute(text(sql))
+
+
+@dataclass(frozen=True)
+class DropIndex:
+    name: str
+
+    def apply(self, connection: Connection) -> None:
+        if connection.dialect.name == "postgresql":
+            sql = f"DROP INDEX CONCURRENTLY IF EXISTS {self.name}"
+        else:
+            sql = f"DROP INDEX IF EXISTS {self.name}"
+        connection.execute(text(sql))
+
+
+@dataclass(frozen=True)
+class AddColumn:
+    table: str
+    name: str
+    column_type: TypeEngine
+    options: str = ""
+
+    def column_sql(self, dialect: Dialect) -> str:
+        # 型名は方言ごとに異なる（DateTime は SQLite で DATETIME、PostgreSQL で TIMESTAMP）
+        return " ".join(filter(None, [self.column_type.compile(dialect=dialect), self.options]))
+
+    def apply(self, connection: Connection) -> None:
+        # create_all で作られた新規 DB には既に列がある
+        if self.name in {col["name"] for col in inspect(connection).get_columns(self.table)}:
+            return
+        column_sql = self.column_sql(connection.dialect)
+        connection.execute(text(f'ALTER TABLE "{self.table}" ADD COLUMN {self.name} {column_sql}'))
+
+
+@dataclass(frozen=True)
+class RunSQL:
+    sql: str
+    dialect: str | None = None
+
+    def apply(self, connection: Connection) -> None:
+        if self.dialect and connection.dialect.name != self.dialect:
+            return
+        connection.execute(text(self.sql))
+
+
+@dataclass(frozen=True)
+class RunPython:
+    func: Callable[[Connection], None]
+
+    def apply(self, connection: Connection) -> None:
+        self.func(connection)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    operations: list = field(default_factory=list)
+
+
+def _backfill_event_days(connection: Connection) -> None:
+    # 移行時点のスキーマに固定するため、モデルではなく表定義を直接使う
+    event = table(
+        "event",
+        column("id"),
+        column("start_date", DateTime),
+        column("end_date", DateTime),
+    )
+    event_day = table("event_day", column("event_id"), column("day", Date))
+    indexed = select(event_day.c.event_id).distinct()
+    result = connection.execute(
+        select(event.c.id, event.c.start_date, event.c.end_date).where(event.c.id.not_in(indexed))
+    )
+    while batch := result.fetchmany(1000):
+        rows = [
+            {"event_id": event_id, "day": start.date() + timedelta(days=offset)}
+            for event_id, start, end in batch
+            for offset in range((end.date() - start.date()).days + 1)
+        ]
+        if rows:
+            connection.execute(insert(event_day), rows)
+
+
+def _backfill_event_feed(connection: Connection) -> None:
+    # 派生テーブルなので、移行時点ではなく現在のスコア計算で作る
+    from app.repositories.feed_repo import rebuild_feeds
+
+    rebuild_feeds(connection)
+
+
+def _backfill_unread_counters(connection: Connection) -> None:
+    from app.repositories.unread_repo import reconcile_unread_counters
+
+    reconcile_unread_counters(connection)
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(
+        1,
+        "revise_indexes_for_keyset_lists",
+        [
+            # event: 状態別一覧・主催者別一覧・検索はいずれも created_at の新しい順で読む
+            DropIndex("ix_event_organizer_id"),
+            DropIndex("ix_event_region"),
+            DropIndex("ix_event_genre"),
+            DropIndex("ix_event_status"),
+            DropIndex("ix_event_search"),
+            CreateIndex("ix_event_status_created", "event", ("status", "created_at")),
+            CreateIndex("ix_event_organizer_created", "event", ("organizer_id", "created_at")),
+            CreateIndex("ix_event_search", "event", ("status", "region", "genre", "created_at")),
+            # application: event_id の先頭一致は一意制約のインデックスで足りる
+            DropIndex("ix_application_event_id"),
+            DropIndex("ix_application_stallholder_id"),
+            DropIndex("ix_application_status"),
+            DropIndex("ix_application_event_status_created"),
+            CreateIndex("ix_application_event_created", "application", ("event_id", "created_at")),
+            CreateIndex(
+                "ix_application_event_status_created",
+                "application",
+                ("event_id", "status", "created_at"),
+            ),
+            CreateIndex(
+                "ix_application_stallholder_created",
+                "application",
+                ("stallholder_id", "created_at"),
+            ),
+            DropIndex("ix_message_application_id"),
+            DropIndex("ix_report_status"),
+            CreateIndex(
+                "ix_stallholder_profile_review_created",
+                "stallholder_profile",
+                ("review_status", "created_at"),
+            ),
+            # notification: 一覧は user_id で絞って created_at の新しい順
+            DropIndex("ix_notification_user_id"),
+            DropIndex("ix_notification_is_read"),
+            DropIndex("ix_notification_user_status_created"),
+            CreateIndex("ix_notification_user_created", "notification", ("user_id", "created_at")),
+        ],
+    ),
+    Migration(
+        2,
+        "event_fulltext_search",
+        [
+            # 日本語は分かち書きしないため trigram で部分一致を索引する
+            RunSQL(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS event_fts USING fts5("
+                "title, description, venue_address, region, genre, tokenize='trigram')",
+                dialect="sqlite",
+            ),
+            RunSQL(
+                "INSERT INTO event_fts (rowid, title, description, venue_address, region, genre) "
+                "SELECT id, title, description, venue_address, region, genre FROM event "
+                "WHERE id NOT IN (SELECT rowid FROM event_fts)",
+                dialect="sqlite",
+            ),
+        ],
+    ),
+    # event_day テーブル自体は create_all で作成される
+    Migration(3, "backfill_event_days", [RunPython(_backfill_event_days)]),
+    # event_facet テーブル自体は create_all で作成される
+    Migration(
+        4,
+        "backfill_event_facets",
+        [
+            RunSQL("DELETE FROM event_facet"),
+            RunSQL(
+                "INSERT INTO event_facet (facet, value, open_count) "
+                "SELECT 'region', region, COUNT(*) FROM event "
+                "WHERE status = 'open' AND region <> '' GROUP BY region"
+            ),
+            RunSQL(
+                "INSERT INTO event_facet (facet, value, open_count) "
+                "SELECT 'genre', genre, COUNT(*) FROM event "
+                "WHERE status = 'open' AND genre <> '' GROUP BY genre"
+            ),
+        ],
+    ),
+    Migration(
+        5,
+        "event_sort_indexes",
+        [
+            CreateIndex("ix_event_status_start", "event", ("status", "start_date")),
+            CreateIndex("ix_event_status_deadline", "event", ("status", "application_deadline")),
+        ],
+    ),
+    Migration(
+        6,
+        "admin_substring_search",
+        [
+            RunSQL(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS user_email_fts "
+                "USING fts5(email, tokenize='trigram')",
+                dialect="sqlite",
+            ),
+            RunSQL(
+                "INSERT INTO user_email_fts (rowid, email) SELECT id, email FROM user "
+                "WHERE id NOT IN (SELECT rowid FROM user_email_fts)",
+                dialect="sqlite",
+            ),
+            RunSQL(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS review_comment_fts "
+                "USING fts5(comment, tokenize='trigram')",
+                dialect="sqlite",
+            ),
+            RunSQL(
+                "INSERT INTO review_comment_fts (rowid, comment) SELECT id, comment FROM review "
+                "WHERE id NOT IN (SELECT rowid FROM review_comment_fts)",
+                dialect="sqlite",
+            ),
+        ],
+    ),
+    Migration(
+        7,
+        "application_search_indexes",
+        [
+            CreateIndex("ix_application_created", "application", ("created_at",)),
+            CreateIndex("ix_application_status_created", "application", ("status", "created_at")),
+        ],
+    ),
+    Migration(
+        8,
+        "event_venue_location",
+        [
+            AddColumn("event", "latitude", Float()),
+            AddColumn("event", "longitude", Float()),
+            # 点は min = max の矩形として持つ
+            RunSQL(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS event_geo "
+                "USING rtree(id, min_lat, max_lat, min_lng, max_lng)",
+                dialect="sqlite",
+            ),
+            RunSQL(
+                "INSERT INTO event_geo (id, min_lat, max_lat, min_lng, max_lng) "
+                "SELECT id, latitude, latitude, longitude, longitude FROM event "
+                "WHERE latitude IS NOT NULL AND longitude IS NOT NULL "
+                "AND id NOT IN (SELECT id FROM event_geo)",
+                dialect="sqlite",
+            ),
+        ],
+    ),
+    # event_feed テーブル自体は create_all で作成される
+    Migration(9, "backfill_event_feed", [RunPython(_backfill_event_feed)]),
+    Migration(
+        10,
+        "notification_outbox",
+        [
+            AddColumn("notification", "attempts", Integer(), "NOT NULL DEFAULT 0"),
+            AddColumn("notification", "next_attempt_at", DateTime()),
+            AddColumn("notification", "last_error", String()),
+            RunSQL(
+                "UPDATE notification SET next_attempt_at = created_at "
+                "WHERE next_attempt_at IS NULL"
+            ),
+            CreateIndex(
+                "ix_notification_delivery_due",
+                "notification",
+                ("delivery_status", "next_attempt_at"),
+            ),
+            DropIndex("ix_notification_delivery_status"),
+        ],
+    ),
+    # unread_counter テーブル自体は create_all で作成される
+    Migration(11, "backfill_unread_counters", [RunPython(_backfill_unread_counters)]),
+]
+
+
+def _ensure_migration_table(engine: Engine) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {MIGRATION_TABLE} ("
+                "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at VARCHAR NOT NULL)"
+            )
+        )
+
+
+def applied_versions(engine: Engine) -> set[int]:
+    _ensure_migration_table(engine)
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"SELECT version FROM {MIGRATION_TABLE}")).all()
+    return {row[0] for row in rows}
+
+
+def _apply(engine: Engine, migration: Migration) -> None:
+    if engine.dialect.name == "postgresql":
+        # CONCURRENTLY はトランザクション内で実行できないため操作ごとに自動コミットする
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for operation in migration.operations:
+                operation.apply(connection)
+        with engine.begin() as connection:
+            _record(connection, migration)
+        return
+    with engine.begin() as connection:
+        for operation in migration.operations:
+            operation.apply(connection)
+        _record(connection, migration)
+
+
+def _record(connection: Connection, migration: Migration) -> None:
+    connection.execute(
+        text(
+            f"INSERT INTO {MIGRATION_TABLE} (version, name, applied_at) "
+            "VALUES (:version, :name, :applied_at) ON CONFLICT (version) DO NOTHING"
+        ),
+        {
+            "version": migration.version,
+            "name": migration.name,
+            "applied_at": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+
+
+def run_migrations(engine: Engine, migrations: list[Migration] | None = None) -> list[int]:
+    """未適用の移行をバージョン順に適用し、適用したバージョンを返す
+
+    複数ワーカーが同時に起動しても、各操作と記録は冪等なので結果は同じになる。
+    """
+    done = applied_versions(engine)
+    applied = []
+    if migrations is None:
+        migrations = MIGRATIONS
+    for migration in sorted(migrations, key=lambda item: item.version):
+        if migration.version in done:
+            continue
+        logger.info(f"Applying migration {migration.version}: {migration.name}")
+        _apply(engine, migration)
+        applied.append(migration.version)
+    return applied
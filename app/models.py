@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Optional
 
 from sqlalchemy import Index, UniqueConstraint
@@ -45,7 +45,10 @@ class StallholderProfile(Timestamped, table=True):
     reviewed_at: Optional[datetime] = None
     review_note: Optional[str] = None
 
-    __table_args__ = (UniqueConstraint("user_id", name="uq_stallholder_profile_user"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_stallholder_profile_user"),
+        Index("ix_stallholder_profile_review_created", "review_status", "created_at"),
+    )
 
 
 class OrganizerProfile(Timestamped, table=True):
@@ -65,27 +68,67 @@ class Event(Timestamped, table=True):
     __tablename__ = "event"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    organizer_id: int = Field(foreign_key="user.id", index=True)
+    organizer_id: int = Field(foreign_key="user.id")
     title: str
     description: str
-    region: str = Field(index=True)
+    region: str
     venue_address: str
-    genre: str = Field(index=True)
+    genre: str
     start_date: datetime
     end_date: datetime
     application_deadline: datetime
     capacity: int
-    status: str = Field(default="draft", index=True)
+    status: str = Field(default="draft")
+    # 会場の座標（任意）。距離検索は R*Tree の event_geo から引く
+    latitude: Optional[float] = Field(default=None)
+    longitude: Optional[float] = Field(default=None)
 
+    # 一覧は (created_at, id) のキーセットで新しい順に読むため、絞り込み列の後ろに created_at を置く
     __table_args__ = (
-        Index(
-            "ix_event_search",
-            "region",
-            "genre",
-            "start_date",
-            "application_deadline",
-            "status",
-        ),
+        Index("ix_event_status_created", "status", "created_at"),
+        Index("ix_event_organizer_created", "organizer_id", "created_at"),
+        Index("ix_event_search", "status", "region", "genre", "created_at"),
+        # JSON API の開催日順・締切順
+        Index("ix_event_status_start", "status", "start_date"),
+        Index("ix_event_status_deadline", "status", "application_deadline"),
+    )
+
+
+class EventDay(SQLModel, table=True):
+    """イベントの開催日を 1 日 1 行に展開したもの（日付検索用）"""
+
+    __tablename__ = "event_day"
+
+    event_id: int = Field(foreign_key="event.id", primary_key=True)
+    day: date = Field(primary_key=True)
+
+    __table_args__ = (Index("ix_event_day_day_event", "day", "event_id"),)
+
+
+class EventFacet(SQLModel, table=True):
+    """募集中イベントの地域・ジャンルごとの件数（ダッシュボードの絞り込み候補）"""
+
+    __tablename__ = "event_facet"
+
+    facet: str = Field(primary_key=True)
+    value: str = Field(primary_key=True)
+    open_count: int = Field(default=0)
+
+
+class EventFeed(SQLModel, table=True):
+    """出店者ごとのおすすめイベント（スコア上位のみ。feed_repo がバッチと差分で更新する）"""
+
+    __tablename__ = "event_feed"
+
+    stallholder_id: int = Field(foreign_key="user.id", primary_key=True)
+    event_id: int = Field(foreign_key="event.id", primary_key=True)
+    score: int = Field(default=0)
+
+    __table_args__ = (
+        Index("ix_event_feed_stallholder_score", "stallholder_id", "score", "event_id"),
+        # イベントの終了・変更時にそのイベントの行を消す
+        Index("ix_event_feed_event", "event_id"),
+        {"sqlite_with_rowid": False},
     )
 
 
@@ -93,10 +136,10 @@ class Application(Timestamped, table=True):
     __tablename__ = "application"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    event_id: int = Field(foreign_key="event.id", index=True)
-    stallholder_id: int = Field(foreign_key="user.id", index=True)
+    event_id: int = Field(foreign_key="event.id")
+    stallholder_id: int = Field(foreign_key="user.id")
     memo: Optional[str] = None
-    status: str = Field(default="pending", index=True)
+    status: str = Field(default="pending")
     decided_at: Optional[datetime] = None
 
     __table_args__ = (
@@ -105,13 +148,12 @@ class Application(Timestamped, table=True):
             "stallholder_id",
             name="uq_application_event_stallholder",
         ),
-        Index(
-            "ix_application_event_status_created",
-            "event_id",
-            "stallholder_id",
-            "status",
-            "created_at",
-        ),
+        Index("ix_application_event_created", "event_id", "created_at"),
+        Index("ix_application_event_status_created", "event_id", "status", "created_at"),
+        Index("ix_application_stallholder_created", "stallholder_id", "created_at"),
+        # 管理画面の応募検索（条件なし・状態のみ）
+        Index("ix_application_created", "created_at"),
+        Index("ix_application_status_created", "status", "created_at"),
     )
 
 
@@ -119,7 +161,7 @@ class Message(SQLModel, table=True):
     __tablename__ = "message"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    application_id: int = Field(foreign_key="application.id", index=True)
+    application_id: int = Field(foreign_key="application.id")
     sender_id: int = Field(foreign_key="user.id")
     content: str
     is_read: bool = Field(default=False, index=True)
@@ -159,7 +201,7 @@ class Report(Timestamped, table=True):
     target_id: int
     reason_code: Optional[str] = None
     reason_detail: Optional[str] = None
-    status: str = Field(default="open", index=True)
+    status: str = Field(default="open")
     handled_by: Optional[int] = Field(default=None, foreign_key="user.id")
     handled_at: Optional[datetime] = None
     resolution_note: Optional[str] = None
@@ -197,25 +239,54 @@ class Notification(SQLModel, table=True):
     __tablename__ = "notification"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
     event_type: str
     channel: str
     title: str
     body: str
     related_type: Optional[str] = None
     related_id: Optional[int] = None
-    delivery_status: str = Field(default="queued", index=True)
-    is_read: bool = Field(default=False, index=True)
+    # 配信キュー: queued → sending（配信中。next_attempt_at が期限）→ sent / failed
+    delivery_status: str = Field(default="queued")
+    attempts: int = Field(default=0)
+    next_attempt_at: Optional[datetime] = Field(default_factory=utc_now)
+    last_error: Optional[str] = None
+    is_read: bool = Field(default=False)
     sent_at: Optional[datetime] = None
     read_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=utc_now)
 
     __table_args__ = (
-        Index(
-            "ix_notification_user_status_created",
-            "user_id",
-            "is_read",
-            "created_at",
-            "delivery_status",
-        ),
+        Index("ix_notification_user_created", "user_id", "created_at"),
+        # 配信ワーカーが期限の来た queued を古い順に取り出す
+        Index("ix_notification_delivery_due", "delivery_status", "next_attempt_at"),
     )
+
+
+class UnreadCounter(SQLModel, table=True):
+    """ユーザーごとの未読件数（通知・メッセージの作成と既読と同じトランザクションで加減算する）"""
+
+    __tablename__ = "unread_counter"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    notifications: int = Field(default=0)
+    messages: int = Field(default=0)
+
+    __table_args__ = ({"sqlite_with_rowid": False},)
+
+
+class NotificationArchive(SQLModel, table=True):
+    """保存期間を過ぎた既読通知（配信の管理列は持たない。notification_retention が移す）"""
+
+    __tablename__ = "notification_archive"
+
+    id: int = Field(primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    event_type: str
+    title: str
+    body: str
+    related_type: Optional[str] = None
+    related_id: Optional[int] = None
+    created_at: datetime
+    read_at: Optional[datetime] = None
+    archived_at: datetime = Field(default_factory=utc_now)
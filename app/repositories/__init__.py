@@ -1 +1,11 @@
 # Repository package
+
+# flush 時に派生テーブルと索引を更新する購読者を登録する
+from app.repositories import (  # noqa: F401
+    admin_search_repo,
+    event_day_repo,
+    event_geo_repo,
+    event_search_repo,
+    facet_repo,
+    feed_repo,
+)
@@ -1,25 +1,29 @@
 from sqlmodel import Session, select
 
 from app.models import AdminNote, Guide, Report
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from app.repositories.unit_of_work import persist
 
 
 def save_report(session: Session, report: Report) -> Report:
-    session.add(report)
-    session.commit()
-    session.refresh(report)
-    return report
+    return persist(session, report)
 
 
-def list_reports(session: Session) -> list[Report]:
+def list_reports(
+    session: Session,
+    status: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Report]:
     statement = select(Report)
-    return list(session.exec(statement).all())
+    if status:
+        statement = statement.where(Report.status == status)
+    return paginate(session, statement, Report.created_at, Report.id, after, before, limit)
 
 
 def save_admin_note(session: Session, note: AdminNote) -> AdminNote:
-    session.add(note)
-    session.commit()
-    session.refresh(note)
-    return note
+    return persist(session, note)
 
 
 def list_admin_notes(session: Session, target_type: str | None = None, target_id: int | None = None) -> list[AdminNote]:
@@ -31,8 +35,14 @@ def list_admin_notes(session: Session, target_type: str | None = None, target_id
     return list(session.exec(statement).all())
 
 
+def list_guides(
+    session: Session,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Guide]:
+    return paginate(session, select(Guide), Guide.created_at, Guide.id, after, before, limit)
+
+
 def save_guide(session: Session, guide: Guide) -> Guide:
-    session.add(guide)
-    session.commit()
-    session.refresh(guide)
-    return guide
+    return persist(session, guide)
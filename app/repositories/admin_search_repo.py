@@ -0,0 +1,99 @@
+"""管理画面のユーザー（メールアドレス）・レビュー（コメント）の部分一致検索
+
+SQLite では FTS5 の trigram 索引を rowid の降順に読み、1 ページ分で打ち切る。
+3 文字未満の語を含む場合と SQLite 以外の DB では LIKE で探す。
+索引はイベントの派生テーブルと同じく flush 時に更新するため、保存の経路を問わない。
+"""
+
+from sqlalchemy import column, delete, event, insert, inspect, literal_column, table
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+
+from app.models import Review, User
+from app.repositories.event_search_repo import (
+    MIN_FTS_TERM_LENGTH,
+    fts_available,
+    fts_query,
+    split_keyword,
+)
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate_by_id
+
+user_email_fts = table("user_email_fts", column("rowid"), column("email"))
+review_comment_fts = table("review_comment_fts", column("rowid"), column("comment"))
+
+
+# 索引するモデルごとの (全文検索テーブル, 列)
+INDEXED_TEXT = {User: (user_email_fts, "email"), Review: (review_comment_fts, "comment")}
+
+
+def _text_changed(instance, field: str) -> bool:
+    return inspect(instance).attrs[field].history.has_changes()
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _index_substring_text(session: OrmSession, flush_context) -> None:
+    # after_flush では new / dirty / deleted と属性の履歴が flush 前の状態のまま残っている
+    for model, (fts, field) in INDEXED_TEXT.items():
+        deleted = [instance.id for instance in session.deleted if isinstance(instance, model)]
+        saved = [
+            instance
+            for instance in (*session.new, *session.dirty)
+            if isinstance(instance, model)
+            and (instance in session.new or _text_changed(instance, field))
+        ]
+        if not (deleted or saved) or not fts_available(session.get_bind()):
+            continue
+        connection = session.connection()
+        ids = deleted + [instance.id for instance in saved]
+        connection.execute(delete(fts).where(fts.c.rowid.in_(ids)))
+        if saved:
+            rows = [{"rowid": instance.id, field: getattr(instance, field)} for instance in saved]
+            connection.execute(insert(fts), rows)
+
+
+def _substring_page(
+    session: Session,
+    model,
+    fts,
+    field: str,
+    query: str,
+    after: str | None,
+    before: str | None,
+    limit: int,
+) -> Page:
+    terms = split_keyword(query)
+    if not terms:
+        return Page()
+    statement = select(model)
+    use_fts = fts_available(session.get_bind())
+    if use_fts and all(len(term) >= MIN_FTS_TERM_LENGTH for term in terms):
+        # rowid の範囲と並びを全文検索テーブル側に渡すと、一致を全件集めずに済む
+        statement = statement.join(fts, fts.c.rowid == model.id).where(
+            literal_column(fts.name).match(fts_query(terms))
+        )
+        return paginate_by_id(session, statement, fts.c.rowid, after, before, limit)
+    for term in terms:
+        statement = statement.where(getattr(model, field).contains(term, autoescape=True))
+    return paginate_by_id(session, statement, model.id, after, before, limit)
+
+
+def search_users_by_email(
+    session: Session,
+    query: str,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[User]:
+    return _substring_page(session, User, user_email_fts, "email", query, after, before, limit)
+
+
+def search_reviews_by_comment(
+    session: Session,
+    query: str,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Review]:
+    return _substring_page(
+        session, Review, review_comment_fts, "comment", query, after, before, limit
+    )
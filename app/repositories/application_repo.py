@@ -1,6 +1,8 @@
 from sqlmodel import Session, select
 
-from app.models import Application
+from app.models import Application, Event, User
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from app.repositories.unit_of_work import persist
 
 
 def get_application(session: Session, application_id: int) -> Application | None:
@@ -17,8 +19,89 @@ def find_application(
     return session.exec(statement).first()
 
 
+def list_applications_for_event(
+    session: Session,
+    event_id: int,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Application]:
+    statement = select(Application).where(Application.event_id == event_id)
+    return paginate(
+        session, statement, Application.created_at, Application.id, after, before, limit
+    )
+
+
+def list_applications_for_stallholder(
+    session: Session,
+    stallholder_id: int,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Application]:
+    statement = select(Application).where(Application.stallholder_id == stallholder_id)
+    return paginate(
+        session, statement, Application.created_at, Application.id, after, before, limit
+    )
+
+
+# 管理画面の応募検索で 1 行に表示する列（イベント名・出店者のメールアドレスを結合して読む）
+APPLICATION_SEARCH_COLUMNS = (
+    Application.id,
+    Application.event_id,
+    Application.stallholder_id,
+    Application.status,
+    Application.created_at,
+    Event.title.label("event_title"),
+    User.email.label("stallholder_email"),
+)
+
+
+def _application_search_statement(
+    application_id: int | None = None,
+    event_id: int | None = None,
+    stallholder_id: int | None = None,
+    stallholder_email: str | None = None,
+    status: str | None = None,
+):
+    statement = (
+        select(*APPLICATION_SEARCH_COLUMNS)
+        .join(Event, Event.id == Application.event_id)
+        .join(User, User.id == Application.stallholder_id)
+    )
+    if application_id is not None:
+        statement = statement.where(Application.id == application_id)
+    if event_id is not None:
+        statement = statement.where(Application.event_id == event_id)
+    if stallholder_id is not None:
+        statement = statement.where(Application.stallholder_id == stallholder_id)
+    if stallholder_email:
+        # メールアドレスは一意索引で id に解決してから応募の索引で引く
+        user_id = select(User.id).where(User.email == stallholder_email).scalar_subquery()
+        statement = statement.where(Application.stallholder_id == user_id)
+    if status:
+        statement = statement.where(Application.status == status)
+    return statement
+
+
+def search_applications(
+    session: Session,
+    application_id: int | None = None,
+    event_id: int | None = None,
+    stallholder_id: int | None = None,
+    stallholder_email: str | None = None,
+    status: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    statement = _application_search_statement(
+        application_id, event_id, stallholder_id, stallholder_email, status
+    )
+    return paginate(
+        session, statement, Application.created_at, Application.id, after, before, limit
+    )
+
+
 def save_application(session: Session, application: Application) -> Application:
-    session.add(application)
-    session.commit()
-    session.refresh(application)
-    return application
+    return persist(session, application)
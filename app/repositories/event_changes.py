@@ -0,0 +1,135 @@
+"""イベント行の変更通知
+
+サービス経由の保存に限らず、セッションで flush されたイベントの変更を拾い、
+- 同じトランザクション内で派生テーブルを更新する購読者（on_event_flush）
+- COMMIT 後にプロセス内のキャッシュなどを更新する購読者（on_event_commit）
+へ変更前後の値を渡す。ロールバックされた変更は on_event_commit に届かない。
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models import Event
+
+# 変更前の値が必要な列。期限切れの状態で代入されても元の値を読み込ませる
+TRACKED_FIELDS = ("status", "region", "genre", "start_date", "end_date", "organizer_id")
+# 全文検索・開催日・位置の索引に使う列。変更前の値は要らないため変わったかだけを見る
+INDEXED_FIELDS = ("title", "description", "venue_address", "latitude", "longitude")
+CHANGE_FIELDS = TRACKED_FIELDS + INDEXED_FIELDS
+# 変更後の値として渡す列（一覧表示と索引に使う列を含む）
+SNAPSHOT_FIELDS = CHANGE_FIELDS + (
+    "application_deadline",
+    "capacity",
+    "created_at",
+)
+
+_PENDING_KEY = "event_changes"
+
+
+@dataclass(frozen=True)
+class EventChange:
+    event_id: int
+    before: dict | None = None
+    after: dict | None = None
+    changed_fields: frozenset[str] = field(default_factory=frozenset)
+
+    @property
+    def created(self) -> bool:
+        return self.before is None
+
+    @property
+    def deleted(self) -> bool:
+        return self.after is None
+
+
+def matches_any_change(changes: list[EventChange]) -> Callable[[object], bool]:
+    """キャッシュのキーの matches が変更前または変更後の状態に一致するかを判定する述語"""
+    snapshots = [snapshot for change in changes for snapshot in (change.before, change.after)]
+    return lambda key: any(map(key.matches, snapshots))
+
+
+FlushSubscriber = Callable[[Session, list[EventChange]], None]
+CommitSubscriber = Callable[[Session, list[EventChange]], None]
+
+_flush_subscribers: list[FlushSubscriber] = []
+_commit_subscribers: list[CommitSubscriber] = []
+
+
+def on_event_flush(func: FlushSubscriber) -> FlushSubscriber:
+    _flush_subscribers.append(func)
+    return func
+
+
+def on_event_commit(func: CommitSubscriber) -> CommitSubscriber:
+    _commit_subscribers.append(func)
+    return func
+
+
+for _name in TRACKED_FIELDS:
+    event.listen(getattr(Event, _name), "set", lambda *args: None, active_history=True)
+
+
+def _snapshot(instance: Event) -> dict:
+    return {name: getattr(instance, name) for name in SNAPSHOT_FIELDS}
+
+
+def _change_for(
+    instance: Event, created: bool = False, deleted: bool = False
+) -> EventChange | None:
+    state = inspect(instance)
+    if created:
+        return EventChange(instance.id, None, _snapshot(instance), frozenset(CHANGE_FIELDS))
+    before = {}
+    changed = set()
+    for name in TRACKED_FIELDS:
+        history = state.attrs[name].history
+        if history.has_changes():
+            changed.add(name)
+            before[name] = history.deleted[0] if history.deleted else None
+        else:
+            before[name] = getattr(instance, name)
+    changed.update(name for name in INDEXED_FIELDS if state.attrs[name].history.has_changes())
+    if deleted:
+        return EventChange(instance.id, before, None, frozenset(CHANGE_FIELDS))
+    if not changed and not state.modified:
+        return None
+    return EventChange(instance.id, before, _snapshot(instance), frozenset(changed))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_event_changes(session: Session, flush_context) -> None:
+    # after_flush では new / dirty / deleted と属性の履歴が flush 前の状態のまま残っている
+    changes = []
+    for instance in session.new:
+        if isinstance(instance, Event):
+            changes.append(_change_for(instance, created=True))
+    for instance in session.dirty:
+        if isinstance(instance, Event) and session.is_modified(instance):
+            changes.append(_change_for(instance))
+    for instance in session.deleted:
+        if isinstance(instance, Event):
+            changes.append(_change_for(instance, deleted=True))
+    changes = [change for change in changes if change is not None]
+    if not changes:
+        return
+    for subscriber in _flush_subscribers:
+        subscriber(session, changes)
+    if _commit_subscribers:
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_event_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+    for subscriber in _commit_subscribers:
+        subscriber(session, changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_event_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,110 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Boolean, delete, func, insert, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Event, EventDay
+from app.repositories.event_changes import EventChange, on_event_flush
+
+EVENT_DATE_FIELDS = ("start_date", "end_date")
+
+
+class likely(FunctionElement):
+    """SQLite のプランナに条件の成立確率を伝える（他の DB では条件そのもの）"""
+
+    type = Boolean()
+    inherit_cache = True
+    name = "likelihood"
+
+
+@compiles(likely)
+def _compile_likely(element, compiler, **kw):
+    return compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(likely, "sqlite")
+def _compile_likely_sqlite(element, compiler, **kw):
+    return f"likelihood({compiler.process(element.clauses, **kw)})"
+
+
+def event_days(start: datetime, end: datetime) -> list[date]:
+    first, last = start.date(), end.date()
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+@on_event_flush
+def _index_event_days(session: Session, changes: list[EventChange]) -> None:
+    # 開催期間が変わったイベントだけ、同じトランザクションで開催日を展開し直す
+    changes = [
+        change
+        for change in changes
+        if change.deleted or change.changed_fields & set(EVENT_DATE_FIELDS)
+    ]
+    if not changes:
+        return
+    connection = session.connection()
+    ids = [change.event_id for change in changes]
+    connection.execute(delete(EventDay).where(EventDay.event_id.in_(ids)))
+    rows = [
+        {"event_id": change.event_id, "day": day}
+        for change in changes
+        if not change.deleted
+        for day in event_days(change.after["start_date"], change.after["end_date"])
+    ]
+    if rows:
+        connection.execute(insert(EventDay), rows)
+
+
+def running_on(start: date, end: date | None = None):
+    """start〜end のいずれかの日に開催しているイベントの条件"""
+    end = end or start
+    if end < start:
+        start, end = end, start
+    day_condition = EventDay.day == start if start == end else EventDay.day.between(start, end)
+    return Event.id.in_(select(EventDay.event_id).where(day_condition))
+
+
+def status_hint(condition, probability: float = 0.9):
+    # 日付で絞るときは status の索引より event_day から辿る方が速いため、status を低選択度と伝える
+    # （likelihood() の第 2 引数は定数である必要がある）
+    return likely(condition, literal_column(repr(probability)))
+
+
+def _day_counts_statement(first: date, last: date, region: str | None, genre: str | None):
+    # event_day の (day, event_id) 索引を日付の範囲で読み、イベントは主キーで引いて日ごとに数える
+    statement = (
+        select(EventDay.day, func.count())
+        .join(Event, Event.id == EventDay.event_id)
+        .where(EventDay.day.between(first, last), status_hint(Event.status == "open"))
+    )
+    if region:
+        statement = statement.where(Event.region == region)
+    if genre:
+        statement = statement.where(Event.genre == genre)
+    return statement.group_by(EventDay.day)
+
+
+def count_open_events_by_day(
+    session: Session,
+    first: date,
+    last: date,
+    region: str | None = None,
+    genre: str | None = None,
+) -> dict[date, int]:
+    """first〜last の各日に開催している募集中イベントの件数（0 件の日は含まない）"""
+    rows = session.exec(_day_counts_statement(first, last, region, genre)).all()
+    return {day: count for day, count in rows}
+
+
+async def count_open_events_by_day_async(
+    session: AsyncSession,
+    first: date,
+    last: date,
+    region: str | None = None,
+    genre: str | None = None,
+) -> dict[date, int]:
+    rows = (await session.exec(_day_counts_statement(first, last, region, genre))).all()
+    return {day: count for day, count in rows}
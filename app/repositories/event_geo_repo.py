@@ -0,0 +1,126 @@
+import math
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, and_, case, column, delete, insert, or_, table
+from sqlmodel import Session, select
+
+from app.models import Event
+from app.repositories.event_changes import EventChange, on_event_flush
+
+EVENT_LOCATION_FIELDS = ("latitude", "longitude")
+
+# 緯度 1 度あたりの距離（km）。経度 1 度はこれに cos(緯度) を掛ける
+KM_PER_DEGREE = 111.32
+MAX_RADIUS_KM = 500.0
+
+event_geo = table(
+    "event_geo",
+    column("id"),
+    column("min_lat"),
+    column("max_lat"),
+    column("min_lng"),
+    column("max_lng"),
+)
+
+
+@dataclass(frozen=True)
+class GeoRadius:
+    """中心座標から radius_km 以内という検索条件"""
+
+    latitude: float
+    longitude: float
+    radius_km: float
+
+    def bounding_boxes(self) -> list[tuple[float, float, float, float]]:
+        """(南端, 北端, 西端, 東端) の緯度経度。経度 ±180° をまたぐ範囲は東西 2 つに分ける"""
+        lat_delta = self.radius_km / KM_PER_DEGREE
+        south = max(self.latitude - lat_delta, -90.0)
+        north = min(self.latitude + lat_delta, 90.0)
+        cos_lat = math.cos(math.radians(self.latitude))
+        # 極を含む・極に近い範囲では経度方向の幅が発散するため、経度は絞らない
+        if south <= -90.0 or north >= 90.0 or cos_lat < 0.01:
+            return [(south, north, -180.0, 180.0)]
+        lng_delta = self.radius_km / (KM_PER_DEGREE * cos_lat)
+        if lng_delta >= 180.0:
+            return [(south, north, -180.0, 180.0)]
+        west, east = self.longitude - lng_delta, self.longitude + lng_delta
+        if west < -180.0:
+            return [(south, north, west + 360.0, 180.0), (south, north, -180.0, east)]
+        if east > 180.0:
+            return [(south, north, west, 180.0), (south, north, -180.0, east - 360.0)]
+        return [(south, north, west, east)]
+
+
+def geo_index_available(bind: Engine) -> bool:
+    # 空間索引は SQLite の R*Tree でのみ作成している
+    return bind.dialect.name == "sqlite"
+
+
+@on_event_flush
+def _index_event_locations(session: Session, changes: list[EventChange]) -> None:
+    # 座標が変わったイベントだけ、同じトランザクションで R*Tree を更新する
+    changes = [
+        change
+        for change in changes
+        if change.deleted or change.changed_fields & set(EVENT_LOCATION_FIELDS)
+    ]
+    if not changes or not geo_index_available(session.get_bind()):
+        return
+    connection = session.connection()
+    ids = [change.event_id for change in changes]
+    connection.execute(delete(event_geo).where(event_geo.c.id.in_(ids)))
+    rows = [
+        {
+            "id": change.event_id,
+            "min_lat": change.after["latitude"],
+            "max_lat": change.after["latitude"],
+            "min_lng": change.after["longitude"],
+            "max_lng": change.after["longitude"],
+        }
+        for change in changes
+        if not change.deleted
+        and change.after["latitude"] is not None
+        and change.after["longitude"] is not None
+    ]
+    if rows:
+        connection.execute(insert(event_geo), rows)
+
+
+def within_radius(near: GeoRadius, use_index: bool) -> list:
+    """near の範囲内にあるイベントの条件
+
+    外接矩形で候補を絞り（R*Tree があれば索引から）、距離は正距円筒図法の近似で判定する。
+    数百 km 以内なら誤差は 1% 未満。経度 ±180° をまたぐ範囲は矩形を分けて引き、
+    経度差は短い方の向きで測る。極の近くでは経度を絞らないため候補が増え、近似の誤差も大きくなる。
+    """
+    boxes = near.bounding_boxes()
+    if use_index:
+        box = Event.id.in_(
+            select(event_geo.c.id).where(
+                or_(
+                    *(
+                        and_(
+                            event_geo.c.max_lat >= south,
+                            event_geo.c.min_lat <= north,
+                            event_geo.c.max_lng >= west,
+                            event_geo.c.min_lng <= east,
+                        )
+                        for south, north, west, east in boxes
+                    )
+                )
+            )
+        )
+    else:
+        box = or_(
+            *(
+                Event.latitude.between(south, north) & Event.longitude.between(west, east)
+                for south, north, west, east in boxes
+            )
+        )
+    lng_diff = Event.longitude - near.longitude
+    lng_diff = case(
+        (lng_diff > 180.0, lng_diff - 360.0), (lng_diff < -180.0, lng_diff + 360.0), else_=lng_diff
+    )
+    lat_km = (Event.latitude - near.latitude) * KM_PER_DEGREE
+    lng_km = lng_diff * (KM_PER_DEGREE * math.cos(math.radians(near.latitude)))
+    return [box, lat_km * lat_km + lng_km * lng_km <= near.radius_km * near.radius_km]
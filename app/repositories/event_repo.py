@@ -1,19 +1,102 @@
+from sqlalchemy import func
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import Event
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate, paginate_async
+from app.repositories.unit_of_work import persist
 
 
 def get_event(session: Session, event_id: int) -> Event | None:
     return session.get(Event, event_id)
 
 
-def list_events(session: Session) -> list[Event]:
-    statement = select(Event)
-    return list(session.exec(statement).all())
+async def get_event_async(session: AsyncSession, event_id: int) -> Event | None:
+    return await session.get(Event, event_id)
+
+
+def _in_given_order(events, ids: list[int]) -> list[Event]:
+    by_id = {event.id: event for event in events}
+    return [by_id[event_id] for event_id in ids if event_id in by_id]
+
+
+def list_events_by_ids(session: Session, ids: list[int]) -> list[Event]:
+    if not ids:
+        return []
+    events = session.exec(select(Event).where(Event.id.in_(ids))).all()
+    return _in_given_order(events, ids)
+
+
+async def list_events_by_ids_async(session: AsyncSession, ids: list[int]) -> list[Event]:
+    if not ids:
+        return []
+    events = (await session.exec(select(Event).where(Event.id.in_(ids)))).all()
+    return _in_given_order(events, ids)
+
+
+def list_events(
+    session: Session,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Event]:
+    return paginate(session, select(Event), Event.created_at, Event.id, after, before, limit)
+
+
+async def list_events_async(
+    session: AsyncSession,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Event]:
+    return await paginate_async(
+        session, select(Event), Event.created_at, Event.id, after, before, limit
+    )
+
+
+def list_events_by_status(
+    session: Session,
+    status: str,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Event]:
+    statement = select(Event).where(Event.status == status)
+    return paginate(session, statement, Event.created_at, Event.id, after, before, limit)
+
+
+async def list_open_events_async(
+    session: AsyncSession,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Event]:
+    statement = select(Event).where(Event.status == "open")
+    return await paginate_async(
+        session, statement, Event.created_at, Event.id, after, before, limit
+    )
+
+
+def list_events_for_organizer(
+    session: Session,
+    organizer_id: int,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Event]:
+    statement = select(Event).where(Event.organizer_id == organizer_id)
+    return paginate(session, statement, Event.created_at, Event.id, after, before, limit)
+
+
+def count_events_by_status_for_organizer(session: Session, organizer_id: int) -> dict[str, int]:
+    statement = (
+        select(Event.status, func.count())
+        .where(Event.organizer_id == organizer_id)
+        .group_by(Event.status)
+    )
+    return {row[0]: row[1] for row in session.exec(statement).all()}
 
 
 def save_event(session: Session, event: Event) -> Event:
-    session.add(event)
-    session.commit()
-    session.refresh(event)
-    return event
+    # 全文検索・開催日・位置の索引は flush 時に event_changes の購読者が更新する
+    return persist(session, event)
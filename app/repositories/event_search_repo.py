@@ -0,0 +1,72 @@
+from sqlalchemy import Engine, column, delete, insert, literal_column, or_, table
+from sqlmodel import Session
+
+from app.models import Event
+from app.repositories.event_changes import EventChange, on_event_flush
+
+EVENT_SEARCH_FIELDS = ("title", "description", "venue_address", "region", "genre")
+
+# trigram トークナイザは 3 文字未満の語に一致しないため、短い語は LIKE で探す
+MIN_FTS_TERM_LENGTH = 3
+
+event_fts = table("event_fts", column("rowid"), column("rank"), *map(column, EVENT_SEARCH_FIELDS))
+
+
+def fts_available(bind: Engine) -> bool:
+    # 全文検索テーブルは SQLite の FTS5 でのみ作成している
+    return bind.dialect.name == "sqlite"
+
+
+def split_keyword(keyword: str | None) -> list[str]:
+    return (keyword or "").split()
+
+
+def fts_query(terms: list[str]) -> str:
+    # 各語をフレーズとして引用し、演算子として解釈されないようにする（語同士は AND）
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def apply_keyword_filter(statement, terms: list[str], use_fts: bool):
+    """キーワード条件を付ける。FTS で絞った場合は True を併せて返す
+
+    FTS の場合の並び順は呼び出し側で event_fts.c.rank を使って付ける
+    """
+    if not terms:
+        return statement, False
+    if use_fts and all(len(term) >= MIN_FTS_TERM_LENGTH for term in terms):
+        statement = statement.join(event_fts, event_fts.c.rowid == Event.id).where(
+            literal_column("event_fts").match(fts_query(terms))
+        )
+        return statement, True
+    for term in terms:
+        statement = statement.where(
+            or_(
+                *(
+                    getattr(Event, name).contains(term, autoescape=True)
+                    for name in EVENT_SEARCH_FIELDS
+                )
+            )
+        )
+    return statement, False
+
+
+@on_event_flush
+def _index_event_text(session: Session, changes: list[EventChange]) -> None:
+    # 検索対象の列が変わったイベントだけを同じトランザクションで索引し直す
+    changes = [
+        change
+        for change in changes
+        if change.deleted or change.changed_fields & set(EVENT_SEARCH_FIELDS)
+    ]
+    if not changes or not fts_available(session.get_bind()):
+        return
+    connection = session.connection()
+    ids = [change.event_id for change in changes]
+    connection.execute(delete(event_fts).where(event_fts.c.rowid.in_(ids)))
+    rows = [
+        {"rowid": change.event_id, **{name: change.after[name] for name in EVENT_SEARCH_FIELDS}}
+        for change in changes
+        if not change.deleted
+    ]
+    if rows:
+        connection.execute(insert(event_fts), rows)
@@ -0,0 +1,89 @@
+from collections import Counter
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import EventFacet
+from app.repositories.event_changes import EventChange, on_event_flush
+
+FACETS = ("region", "genre")
+
+_UPSERT_FACET = text(
+    "INSERT INTO event_facet (facet, value, open_count) VALUES (:facet, :value, :delta) "
+    "ON CONFLICT (facet, value) DO UPDATE SET open_count = event_facet.open_count + :delta"
+)
+
+
+def facet_deltas(changes: list[EventChange]) -> Counter:
+    deltas: Counter = Counter()
+    for change in changes:
+        for snapshot, sign in ((change.before, -1), (change.after, 1)):
+            if not snapshot or snapshot["status"] != "open":
+                continue
+            for facet in FACETS:
+                if snapshot[facet]:
+                    deltas[(facet, snapshot[facet])] += sign
+    return deltas
+
+
+@on_event_flush
+def _apply_facet_deltas(session: Session, changes: list[EventChange]) -> None:
+    # 状態・地域・ジャンルの変更前後の差分だけを同じトランザクションで加減算する
+    rows = [
+        {"facet": facet, "value": value, "delta": delta}
+        for (facet, value), delta in facet_deltas(changes).items()
+        if delta
+    ]
+    if rows:
+        session.connection().execute(_UPSERT_FACET, rows)
+
+
+def _facet_statement():
+    return (
+        select(EventFacet)
+        .where(EventFacet.open_count > 0)
+        .order_by(EventFacet.facet, EventFacet.value)
+    )
+
+
+def _group(rows: list[EventFacet]) -> dict[str, list[tuple[str, int]]]:
+    grouped: dict[str, list[tuple[str, int]]] = {facet: [] for facet in FACETS}
+    for row in rows:
+        grouped.setdefault(row.facet, []).append((row.value, row.open_count))
+    return grouped
+
+
+def list_open_event_facets(session: Session) -> dict[str, list[tuple[str, int]]]:
+    return _group(list(session.exec(_facet_statement()).all()))
+
+
+async def list_open_event_facets_async(
+    session: AsyncSession,
+) -> dict[str, list[tuple[str, int]]]:
+    return _group(list((await session.exec(_facet_statement())).all()))
+
+
+def _suggest_statement(facet: str, prefix: str, limit: int):
+    # 主キー (facet, value) の範囲で前方一致を引き、件数順に並べる（大文字小文字は区別する）
+    statement = select(EventFacet.value, EventFacet.open_count).where(
+        EventFacet.facet == facet, EventFacet.open_count > 0
+    )
+    if prefix:
+        statement = statement.where(
+            EventFacet.value >= prefix, EventFacet.value < prefix + "\U0010ffff"
+        )
+    return statement.order_by(EventFacet.open_count.desc(), EventFacet.value).limit(limit)
+
+
+def suggest_facet_values(
+    session: Session, facet: str, prefix: str, limit: int
+) -> list[tuple[str, int]]:
+    return [tuple(row) for row in session.exec(_suggest_statement(facet, prefix, limit)).all()]
+
+
+async def suggest_facet_values_async(
+    session: AsyncSession, facet: str, prefix: str, limit: int
+) -> list[tuple[str, int]]:
+    rows = (await session.exec(_suggest_statement(facet, prefix, limit))).all()
+    return [tuple(row) for row in rows]
@@ -0,0 +1,201 @@
+"""出店者ごとのおすすめイベント（event_feed）
+
+スコアは出店者 × 募集中イベントの組を 1 本の INSERT ... SELECT で集合としてまとめて計算し、
+出店者ごとに上位 FEED_SIZE 件だけを保存する。
+- 全件の作り直し: rebuild_feeds（移行）。定期バッチは出店者を分けて refresh_stallholder_feeds で行う
+- イベントの公開・終了・地域などの変更: 同じトランザクションでそのイベントの行だけを差し替える
+- プロフィールのジャンル変更・応募の承認: その出店者の行だけを作り直す
+主催者の評価は差分では追わず、定期バッチで反映する。
+"""
+
+from collections.abc import Sequence
+
+from sqlalchemy import Connection, bindparam, text
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Event, EventFeed
+from app.repositories.event_changes import EventChange, on_event_flush
+
+FEED_SIZE = 50
+# スコアに効くイベントの列
+FEED_FIELDS = frozenset({"status", "region", "genre", "organizer_id"})
+
+# 配点（最大 100 点）
+GENRE_POINTS = 40  # プロフィールのジャンルと一致
+REGION_POINTS = 30  # 承認された応募のうち、その地域の割合に比例
+ORGANIZER_POINTS = 15  # 同じ主催者のイベントで承認されたことがある
+RATING_POINTS = 3  # 主催者の平均評価（5 段階）1 あたり
+
+_SCORE_SQL = """
+INSERT INTO event_feed (stallholder_id, event_id, score)
+WITH profile AS (
+    SELECT user_id AS stallholder_id, genre FROM stallholder_profile WHERE {profile_filter}
+),
+history AS (
+    SELECT a.stallholder_id, e.region, e.organizer_id, COUNT(*) AS approved
+    FROM application a JOIN event e ON e.id = a.event_id
+    WHERE a.status = 'approved' AND a.stallholder_id IN (SELECT stallholder_id FROM profile)
+    GROUP BY a.stallholder_id, e.region, e.organizer_id
+),
+approved_total AS (
+    SELECT stallholder_id, SUM(approved) AS total FROM history GROUP BY stallholder_id
+),
+region_share AS (
+    SELECT h.stallholder_id, h.region, SUM(h.approved) * 1.0 / t.total AS share
+    FROM history h JOIN approved_total t ON t.stallholder_id = h.stallholder_id
+    GROUP BY h.stallholder_id, h.region, t.total
+),
+organizer_seen AS (SELECT DISTINCT stallholder_id, organizer_id FROM history),
+rating AS (
+    SELECT target_id AS organizer_id, AVG(score) AS stars FROM review
+    WHERE NOT is_hidden GROUP BY target_id
+),
+-- 出店者によらない点（主催者の評価）はイベントごとに 1 回だけ計算する
+candidate AS (
+    SELECT e.id, e.region, e.genre, e.organizer_id,
+        CAST(:rating_points * COALESCE(r.stars, 0) AS INTEGER) AS base_score
+    FROM event e LEFT JOIN rating r ON r.organizer_id = e.organizer_id
+    WHERE e.status = 'open' AND {event_filter}
+),
+scored AS (
+    SELECT p.stallholder_id, c.id AS event_id,
+        CASE WHEN c.genre = p.genre THEN :genre_points ELSE 0 END
+        + CAST(:region_points * COALESCE(rs.share, 0) AS INTEGER)
+        + CASE WHEN os.organizer_id IS NULL THEN 0 ELSE :organizer_points END
+        + c.base_score AS score
+    FROM profile p CROSS JOIN candidate c
+    LEFT JOIN region_share rs ON rs.stallholder_id = p.stallholder_id AND rs.region = c.region
+    LEFT JOIN organizer_seen os
+        ON os.stallholder_id = p.stallholder_id AND os.organizer_id = c.organizer_id
+    -- 応募済みのイベントは勧めない
+    WHERE NOT EXISTS (
+        SELECT 1 FROM application a
+        WHERE a.event_id = c.id AND a.stallholder_id = p.stallholder_id
+    )
+)
+SELECT stallholder_id, event_id, score FROM (
+    SELECT stallholder_id, event_id, score, ROW_NUMBER() OVER (
+        PARTITION BY stallholder_id ORDER BY score DESC, event_id DESC
+    ) AS feed_rank
+    FROM scored WHERE score > 0
+) ranked
+WHERE feed_rank <= :feed_size
+"""
+
+# 差分で追加した出店者のフィードを上位 FEED_SIZE 件に切り詰める
+_TRIM_SQL = text(
+    """
+    DELETE FROM event_feed WHERE (stallholder_id, event_id) IN (
+        SELECT stallholder_id, event_id FROM (
+            SELECT stallholder_id, event_id, ROW_NUMBER() OVER (
+                PARTITION BY stallholder_id ORDER BY score DESC, event_id DESC
+            ) AS feed_rank
+            FROM event_feed
+            WHERE stallholder_id IN (
+                SELECT stallholder_id FROM event_feed WHERE event_id IN :event_ids
+            )
+        ) ranked
+        WHERE feed_rank > :feed_size
+    )
+    """
+).bindparams(bindparam("event_ids", expanding=True))
+
+_SCORE_PARAMS = {
+    "genre_points": GENRE_POINTS,
+    "region_points": REGION_POINTS,
+    "organizer_points": ORGANIZER_POINTS,
+    "rating_points": RATING_POINTS,
+}
+
+
+def _score(connection: Connection, stallholder_ids=None, event_ids=None) -> None:
+    statement = text(
+        _SCORE_SQL.format(
+            profile_filter="1 = 1" if stallholder_ids is None else "user_id IN :stallholder_ids",
+            event_filter="1 = 1" if event_ids is None else "e.id IN :event_ids",
+        )
+    )
+    params = {**_SCORE_PARAMS, "feed_size": FEED_SIZE}
+    if stallholder_ids is not None:
+        statement = statement.bindparams(bindparam("stallholder_ids", expanding=True))
+        params["stallholder_ids"] = list(stallholder_ids)
+    if event_ids is not None:
+        statement = statement.bindparams(bindparam("event_ids", expanding=True))
+        params["event_ids"] = list(event_ids)
+    connection.execute(statement, params)
+
+
+def rebuild_feeds(connection: Connection) -> None:
+    connection.execute(text("DELETE FROM event_feed"))
+    _score(connection)
+
+
+def refresh_stallholder_feeds(connection: Connection, stallholder_ids: Sequence[int]) -> None:
+    if not stallholder_ids:
+        return
+    connection.execute(
+        text("DELETE FROM event_feed WHERE stallholder_id IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        ),
+        {"ids": list(stallholder_ids)},
+    )
+    _score(connection, stallholder_ids=stallholder_ids)
+
+
+def refresh_event_feeds(connection: Connection, event_ids: Sequence[int]) -> None:
+    if not event_ids:
+        return
+    connection.execute(
+        text("DELETE FROM event_feed WHERE event_id IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        ),
+        {"ids": list(event_ids)},
+    )
+    _score(connection, event_ids=event_ids)
+    connection.execute(_TRIM_SQL, {"event_ids": list(event_ids), "feed_size": FEED_SIZE})
+
+
+def remove_feed_entry(connection: Connection, stallholder_id: int, event_id: int) -> None:
+    connection.execute(
+        text(
+            "DELETE FROM event_feed "
+            "WHERE stallholder_id = :stallholder_id AND event_id = :event_id"
+        ),
+        {"stallholder_id": stallholder_id, "event_id": event_id},
+    )
+
+
+@on_event_flush
+def _refresh_event_feeds(session: Session, changes: list[EventChange]) -> None:
+    # 募集中だった・募集中になったイベントのうち、スコアに効く列が変わったものだけ
+    event_ids = [
+        change.event_id
+        for change in changes
+        if change.changed_fields & FEED_FIELDS
+        and any(
+            snapshot and snapshot["status"] == "open" for snapshot in (change.before, change.after)
+        )
+    ]
+    if event_ids:
+        refresh_event_feeds(session.connection(), event_ids)
+
+
+def _feed_statement(stallholder_id: int, limit: int):
+    return (
+        select(Event)
+        .join(EventFeed, EventFeed.event_id == Event.id)
+        .where(EventFeed.stallholder_id == stallholder_id, Event.status == "open")
+        .order_by(EventFeed.score.desc(), EventFeed.event_id.desc())
+        .limit(limit)
+    )
+
+
+def list_feed_events(session: Session, stallholder_id: int, limit: int) -> list[Event]:
+    return list(session.exec(_feed_statement(stallholder_id, limit)).all())
+
+
+async def list_feed_events_async(
+    session: AsyncSession, stallholder_id: int, limit: int
+) -> list[Event]:
+    return list((await session.exec(_feed_statement(stallholder_id, limit))).all())
@@ -1,15 +1,55 @@
+from datetime import datetime
+
+from sqlalchemy import update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import Message
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate, paginate_async
+from app.repositories.unit_of_work import persist
+
+
+def list_messages_for_application(
+    session: Session,
+    application_id: int,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Message]:
+    # 新しい順にページングする（表示側で古い順に並べ直す）
+    statement = select(Message).where(Message.application_id == application_id)
+    return paginate(session, statement, Message.created_at, Message.id, after, before, limit)
 
 
-def list_messages_for_application(session: Session, application_id: int) -> list[Message]:
+async def list_messages_for_application_async(
+    session: AsyncSession,
+    application_id: int,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Message]:
     statement = select(Message).where(Message.application_id == application_id)
-    return list(session.exec(statement).all())
+    return await paginate_async(
+        session, statement, Message.created_at, Message.id, after, before, limit
+    )
 
 
 def save_message(session: Session, message: Message) -> Message:
-    session.add(message)
-    session.commit()
-    session.refresh(message)
-    return message
+    return persist(session, message)
+
+
+def mark_received_messages_read(
+    session: Session, application_id: int, reader_id: int, read_at: datetime
+) -> int:
+    """相手から届いた未読メッセージを 1 回の UPDATE で既読にし、件数を返す"""
+    result = session.execute(
+        update(Message)
+        .where(
+            Message.application_id == application_id,
+            Message.sender_id != reader_id,
+            Message.is_read.is_(False),
+        )
+        .values(is_read=True, read_at=read_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
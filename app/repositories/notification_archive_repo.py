@@ -0,0 +1,82 @@
+"""既読通知のアーカイブ（notification → notification_archive）"""
+
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import Connection, DateTime, delete, insert, literal, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from app.models import Notification, NotificationArchive
+
+_ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "event_type",
+    "title",
+    "body",
+    "related_type",
+    "related_id",
+    "created_at",
+    "read_at",
+)
+
+
+def _archivable(cutoff: datetime):
+    # 配信の終わっていない通知はワーカーが扱うため移さない。
+    # NOT IN にして ix_notification_delivery_due を使わせず、主キー順の走査にする
+    return (
+        Notification.is_read.is_(True),
+        Notification.created_at < cutoff,
+        Notification.delivery_status.not_in(("queued", "sending")),
+    )
+
+
+def list_archivable_ids(session: Session, cutoff: datetime, after: int, limit: int) -> list[int]:
+    """主キー順に after より後ろを読み、移せる通知の ID を返す（全体を 1 回だけ走査する）"""
+    statement = (
+        select(Notification.id)
+        .where(Notification.id > after, *_archivable(cutoff))
+        .order_by(Notification.id)
+        .limit(limit)
+    )
+    return list(session.exec(statement).all())
+
+
+def archive_notifications(
+    connection: Connection, ids: Sequence[int], cutoff: datetime, archived_at: datetime
+) -> int:
+    """ID の通知をアーカイブへ写して消し、移した件数を返す（同じトランザクションで呼ぶ）"""
+    # ID を読んだ後に未読へ戻された通知などは条件を付け直して除く
+    condition = (Notification.id.in_(ids), *_archivable(cutoff))
+    source = select(
+        *(getattr(Notification, name) for name in _ARCHIVED_COLUMNS),
+        literal(archived_at, DateTime()),
+    ).where(*condition)
+    connection.execute(
+        insert(NotificationArchive).from_select([*_ARCHIVED_COLUMNS, "archived_at"], source)
+    )
+    return connection.execute(delete(Notification).where(*condition)).rowcount
+
+
+def notification_storage_bytes(connection: Connection) -> dict[str, int] | None:
+    """notification の表とインデックスごとの使用バイト数（SQLite の dbstat。使えなければ None）"""
+    if connection.dialect.name != "sqlite":
+        return None
+    names = connection.execute(
+        text(
+            "SELECT name FROM sqlite_master "
+            "WHERE tbl_name = 'notification' AND type IN ('table', 'index')"
+        )
+    ).scalars().all()
+    try:
+        return {
+            name: connection.execute(
+                text("SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name = :name"),
+                {"name": name},
+            ).scalar_one()
+            for name in names
+        }
+    except OperationalError:
+        # dbstat を組み込んでいない SQLite
+        return None
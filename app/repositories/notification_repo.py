@@ -1,15 +1,214 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import and_, bindparam, func, insert, or_, update
+from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import Notification
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate, paginate_async
+from app.repositories.unit_of_work import persist
+
+
+def list_notifications_for_user(
+    session: Session,
+    user_id: int,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Notification]:
+    statement = select(Notification).where(Notification.user_id == user_id)
+    return paginate(
+        session, statement, Notification.created_at, Notification.id, after, before, limit
+    )
 
 
-def list_notifications_for_user(session: Session, user_id: int) -> list[Notification]:
+async def list_notifications_for_user_async(
+    session: AsyncSession,
+    user_id: int,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Notification]:
     statement = select(Notification).where(Notification.user_id == user_id)
-    return list(session.exec(statement).all())
+    return await paginate_async(
+        session, statement, Notification.created_at, Notification.id, after, before, limit
+    )
 
 
 def save_notification(session: Session, notification: Notification) -> Notification:
-    session.add(notification)
-    session.commit()
-    session.refresh(notification)
-    return notification
+    return persist(session, notification)
+
+
+def insert_notifications(session: Session, rows: list[dict]) -> list[int]:
+    """通知をまとめて INSERT し、rows の順に ID を返す（COMMIT は呼び出し側の unit of work）"""
+    if not rows:
+        return []
+    statement = insert(Notification).returning(Notification.id, sort_by_parameter_order=True)
+    return list(session.scalars(statement, rows))
+
+
+def mark_user_notifications_read(
+    session: Session,
+    user_id: int,
+    read_at: datetime,
+    ids: Sequence[int] | None = None,
+    through: tuple[datetime, int] | None = None,
+) -> list[int]:
+    """そのユーザーの未読通知を 1 回の UPDATE で既読にし、既読にした ID を返す
+
+    ids: この ID の通知だけ。through: 一覧のカーソル（created_at, id）以前の通知すべて
+    """
+    statement = update(Notification).where(
+        Notification.user_id == user_id, Notification.is_read.is_(False)
+    )
+    if ids is not None:
+        statement = statement.where(Notification.id.in_(ids))
+    if through is not None:
+        # created_at の上限を単独の条件にも置き、ix_notification_user_created の範囲で読む
+        created_at, row_id = through
+        statement = statement.where(
+            Notification.created_at <= created_at,
+            or_(
+                Notification.created_at < created_at,
+                and_(Notification.created_at == created_at, Notification.id <= row_id),
+            ),
+        )
+    statement = (
+        statement.values(is_read=True, read_at=read_at)
+        .returning(Notification.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(session.scalars(statement))
+
+
+async def latest_notification_id_async(session: AsyncSession, user_id: int) -> int:
+    """そのユーザーの最も新しい通知の ID（なければ 0）"""
+    statement = (
+        select(Notification.id)
+        .where(Notification.user_id == user_id)
+        .order_by(Notification.created_at.desc(), Notification.id.desc())
+        .limit(1)
+    )
+    return (await session.exec(statement)).first() or 0
+
+
+@dataclass(frozen=True)
+class OutboxItem:
+    """配信ワーカーが取り出した通知（ORM オブジェクトは作らない）"""
+
+    id: int
+    user_id: int
+    channel: str
+    event_type: str
+    title: str
+    body: str
+    related_type: str | None
+    related_id: int | None
+    attempts: int
+    created_at: datetime
+
+
+_OUTBOX_COLUMNS = (
+    Notification.id,
+    Notification.user_id,
+    Notification.channel,
+    Notification.event_type,
+    Notification.title,
+    Notification.body,
+    Notification.related_type,
+    Notification.related_id,
+    Notification.attempts,
+    Notification.created_at,
+)
+
+
+async def requeue_expired_async(connection: AsyncConnection, now: datetime) -> int:
+    """配信中のまま期限（next_attempt_at）を過ぎた通知をキューに戻す（ワーカーの異常終了など）"""
+    result = await connection.execute(
+        update(Notification)
+        .where(Notification.delivery_status == "sending", Notification.next_attempt_at <= now)
+        .values(delivery_status="queued")
+    )
+    return result.rowcount
+
+
+async def claim_notifications_async(
+    connection: AsyncConnection, now: datetime, lease_until: datetime, limit: int
+) -> list[OutboxItem]:
+    """期限の来た queued を古い順に最大 limit 件、1 回の UPDATE ... RETURNING で配信中にする
+
+    複数のワーカーが同時に取り出しても同じ行は 1 つのワーカーにしか渡らない
+    （SQLite は書き込みの直列化、PostgreSQL は SKIP LOCKED による）。
+    """
+    due = (
+        select(Notification.id)
+        .where(Notification.delivery_status == "queued", Notification.next_attempt_at <= now)
+        .order_by(Notification.next_attempt_at, Notification.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await connection.execute(
+        update(Notification)
+        .where(Notification.id.in_(due.scalar_subquery()))
+        .values(
+            delivery_status="sending",
+            next_attempt_at=lease_until,
+            attempts=Notification.attempts + 1,
+        )
+        .returning(*_OUTBOX_COLUMNS)
+    )
+    items = [OutboxItem(*row) for row in result.all()]
+    items.sort(key=lambda item: item.id)
+    return items
+
+
+async def mark_sent_async(
+    connection: AsyncConnection, notification_ids: Sequence[int], sent_at: datetime
+) -> None:
+    if not notification_ids:
+        return
+    await connection.execute(
+        update(Notification)
+        .where(Notification.id.in_(notification_ids), Notification.delivery_status == "sending")
+        .values(delivery_status="sent", sent_at=sent_at, next_attempt_at=None, last_error=None)
+    )
+
+
+async def mark_retry_async(connection: AsyncConnection, rows: list[dict]) -> None:
+    """失敗した通知を executemany でまとめて更新する
+
+    rows: {"notification_id", "new_status"（queued / failed）, "retry_at", "error"}
+    """
+    if not rows:
+        return
+    await connection.execute(
+        update(Notification)
+        .where(
+            Notification.id == bindparam("notification_id"),
+            Notification.delivery_status == "sending",
+        )
+        .values(
+            delivery_status=bindparam("new_status"),
+            next_attempt_at=bindparam("retry_at"),
+            last_error=bindparam("error"),
+        ),
+        rows,
+    )
+
+
+async def outbox_backlog_async(
+    connection: AsyncConnection, now: datetime
+) -> tuple[int, datetime | None]:
+    """未配信（再試行待ち・配信中を含む）の件数と、期限が来ているうち最も古い予定時刻"""
+    depth = await connection.scalar(
+        select(func.count()).where(Notification.delivery_status.in_(("queued", "sending")))
+    )
+    oldest_due = await connection.scalar(
+        select(func.min(Notification.next_attempt_at)).where(
+            Notification.delivery_status == "queued", Notification.next_attempt_at <= now
+        )
+    )
+    return depth or 0, oldest_due
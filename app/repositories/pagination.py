@@ -0,0 +1,249 @@
+import base64
+import binascii
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import and_, or_
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def encode_cursor(value: datetime, row_id: int) -> str:
+    raw = f"{value.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    """カーソルを (並び替え列の値, id) に戻す。不正な値は None（先頭ページ扱い）"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        value, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(value), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def encode_id_cursor(row_id: int) -> str:
+    return base64.urlsafe_b64encode(str(row_id).encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_id_cursor(cursor: str | None) -> int | None:
+    if not cursor:
+        return None
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def encode_rank_cursor(rank: float, row_id: int) -> str:
+    raw = f"{rank!r}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_rank_cursor(cursor: str | None) -> tuple[float, int] | None:
+    """関連度順のカーソルを (rank, id) に戻す。不正な値は None（先頭ページ扱い）"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        rank, row_id = raw.rsplit("|", 1)
+        return float(rank), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def clamp_limit(limit: int | None) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def _keyset_statement(
+    statement,
+    sort_column,
+    id_column,
+    after: tuple[datetime, int] | None,
+    before: tuple[datetime, int] | None,
+    limit: int,
+    descending: bool,
+):
+    # before（前のページ）へ戻るときは逆順に読んでから並べ直す
+    forward = before is None
+    newest_first = descending if forward else not descending
+    key = after if forward else before
+    if key is not None:
+        value, row_id = key
+        if newest_first:
+            condition = or_(sort_column < value, and_(sort_column == value, id_column < row_id))
+        else:
+            condition = or_(sort_column > value, and_(sort_column == value, id_column > row_id))
+        statement = statement.where(condition)
+    if newest_first:
+        statement = statement.order_by(sort_column.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(sort_column.asc(), id_column.asc())
+    return statement.limit(limit + 1)
+
+
+def build_page(
+    rows: list[Any],
+    cursor_for: Callable[[Any], str],
+    limit: int,
+    after: Any,
+    before: Any,
+) -> Page:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if before is not None:
+        rows.reverse()
+    page = Page(items=rows)
+    if not rows:
+        return page
+    if before is not None:
+        page.next_cursor = cursor_for(rows[-1])
+        page.prev_cursor = cursor_for(rows[0]) if has_more else None
+    else:
+        page.next_cursor = cursor_for(rows[-1]) if has_more else None
+        page.prev_cursor = cursor_for(rows[0]) if after is not None else None
+    return page
+
+
+def _sort_cursor(sort_column) -> Callable[[Any], str]:
+    return lambda row: encode_cursor(getattr(row, sort_column.key), row.id)
+
+
+def paginate(
+    session: Session,
+    statement,
+    sort_column,
+    id_column,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int | None = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+) -> Page:
+    """(sort_column, id) のキーセットでページングする。既定は新しい順"""
+    after_key, before_key = decode_cursor(after), decode_cursor(before)
+    if after_key is not None:
+        before_key = None
+    limit = clamp_limit(limit)
+    statement = _keyset_statement(
+        statement, sort_column, id_column, after_key, before_key, limit, descending
+    )
+    rows = list(session.exec(statement).all())
+    return build_page(rows, _sort_cursor(sort_column), limit, after_key, before_key)
+
+
+async def paginate_async(
+    session: AsyncSession,
+    statement,
+    sort_column,
+    id_column,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int | None = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+) -> Page:
+    after_key, before_key = decode_cursor(after), decode_cursor(before)
+    if after_key is not None:
+        before_key = None
+    limit = clamp_limit(limit)
+    statement = _keyset_statement(
+        statement, sort_column, id_column, after_key, before_key, limit, descending
+    )
+    rows = list((await session.exec(statement)).all())
+    return build_page(rows, _sort_cursor(sort_column), limit, after_key, before_key)
+
+
+def _id_keyset_statement(statement, id_column, after: int | None, before: int | None, limit: int):
+    # id 列だけの条件にすると、全文検索テーブルの rowid 順の読み出しにそのまま渡せる
+    if before is None:
+        if after is not None:
+            statement = statement.where(id_column < after)
+        return statement.order_by(id_column.desc()).limit(limit + 1)
+    return statement.where(id_column > before).order_by(id_column.asc()).limit(limit + 1)
+
+
+def paginate_by_id(
+    session: Session,
+    statement,
+    id_column,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int | None = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """id の降順（≒新しい順）だけでページングする"""
+    after_key, before_key = decode_id_cursor(after), decode_id_cursor(before)
+    if after_key is not None:
+        before_key = None
+    limit = clamp_limit(limit)
+    statement = _id_keyset_statement(statement, id_column, after_key, before_key, limit)
+    rows = list(session.exec(statement).all())
+    return build_page(rows, lambda row: encode_id_cursor(row.id), limit, after_key, before_key)
+
+
+def _ranked_statement(statement, rank_column, id_column, after, before, limit: int):
+    # rank は小さいほど関連度が高い。(rank, id) の昇順をキーセットにする
+    statement = statement.add_columns(rank_column)
+    return _keyset_statement(statement, rank_column, id_column, after, before, limit, False)
+
+
+def _ranked_page(rows: list[Any], limit: int, after, before) -> Page:
+    page = build_page(rows, lambda row: encode_rank_cursor(row[1], row[0].id), limit, after, before)
+    page.items = [item for item, _ in page.items]
+    return page
+
+
+def paginate_ranked(
+    session: Session,
+    statement,
+    rank_column,
+    id_column,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int | None = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """全文検索の関連度順（rank, id）でページングする"""
+    after_key, before_key = decode_rank_cursor(after), decode_rank_cursor(before)
+    if after_key is not None:
+        before_key = None
+    limit = clamp_limit(limit)
+    statement = _ranked_statement(statement, rank_column, id_column, after_key, before_key, limit)
+    # exec() は先頭の実体だけを返すため、rank を含む行は execute() で読む
+    rows = list(session.execute(statement).all())
+    return _ranked_page(rows, limit, after_key, before_key)
+
+
+async def paginate_ranked_async(
+    session: AsyncSession,
+    statement,
+    rank_column,
+    id_column,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int | None = DEFAULT_PAGE_SIZE,
+) -> Page:
+    after_key, before_key = decode_rank_cursor(after), decode_rank_cursor(before)
+    if after_key is not None:
+        before_key = None
+    limit = clamp_limit(limit)
+    statement = _ranked_statement(statement, rank_column, id_column, after_key, before_key, limit)
+    rows = list((await session.execute(statement)).all())
+    return _ranked_page(rows, limit, after_key, before_key)
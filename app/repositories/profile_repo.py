@@ -1,6 +1,8 @@
 from sqlmodel import Session, select
 
 from app.models import OrganizerProfile, StallholderProfile
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from app.repositories.unit_of_work import persist
 
 
 def get_stallholder_profile(session: Session, user_id: int) -> StallholderProfile | None:
@@ -13,19 +15,34 @@ def get_organizer_profile(session: Session, user_id: int) -> OrganizerProfile |
     return session.exec(statement).first()
 
 
+def list_stallholder_profiles_by_review_status(
+    session: Session,
+    review_status: str,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[StallholderProfile]:
+    statement = select(StallholderProfile).where(
+        StallholderProfile.review_status == review_status
+    )
+    return paginate(
+        session,
+        statement,
+        StallholderProfile.created_at,
+        StallholderProfile.id,
+        after,
+        before,
+        limit,
+    )
+
+
 def save_stallholder_profile(
     session: Session, profile: StallholderProfile
 ) -> StallholderProfile:
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+    return persist(session, profile)
 
 
 def save_organizer_profile(
     session: Session, profile: OrganizerProfile
 ) -> OrganizerProfile:
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+    return persist(session, profile)
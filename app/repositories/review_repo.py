@@ -1,6 +1,7 @@
 from sqlmodel import Session, select
 
 from app.models import Review
+from app.repositories.unit_of_work import persist
 
 
 def find_review(
@@ -14,7 +15,4 @@ def find_review(
 
 
 def save_review(session: Session, review: Review) -> Review:
-    session.add(review)
-    session.commit()
-    session.refresh(review)
-    return review
+    return persist(session, review)
@@ -0,0 +1,56 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import ParamSpec, TypeVar
+
+from sqlmodel import Session
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work(session: Session) -> bool:
+    return session.info.get(_DEPTH_KEY, 0) > 0
+
+
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    """ブロック内の変更をまとめて 1 回だけ COMMIT する。入れ子は最も外側で確定する"""
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+    except BaseException:
+        session.info[_DEPTH_KEY] = depth
+        if depth == 0:
+            session.rollback()
+        raise
+    session.info[_DEPTH_KEY] = depth
+    if depth == 0:
+        session.commit()
+
+
+def transactional(func: Callable[P, R]) -> Callable[P, R]:
+    """第 1 引数のセッションでサービス関数全体を unit_of_work として実行する"""
+
+    @wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        session = args[0] if args else kwargs["session"]
+        with unit_of_work(session):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def persist(session: Session, instance: R) -> R:
+    session.add(instance)
+    if in_unit_of_work(session):
+        # 主キーは INSERT の結果から取得されるため refresh の往復は不要
+        session.flush()
+    else:
+        session.commit()
+        session.refresh(instance)
+    return instance
+
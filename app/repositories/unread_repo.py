@@ -0,0 +1,158 @@
+"""ユーザーごとの未読件数（unread_counter）
+
+通知・メッセージの作成と既読と同じトランザクションで加減算し、
+画面表示では 1 行を主キーで読むだけにする。
+件数がずれた場合（直接の SQL 更新など）は reconcile_unread_counters で実際の件数から直す。
+COMMIT 後に件数の変わったユーザーを on_unread_commit の購読者へ渡す（プロセス内キャッシュの破棄）。
+"""
+
+from collections.abc import Callable, Mapping, Sequence
+
+from sqlalchemy import Connection, bindparam, event, text
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import UnreadCounter, User
+
+UNREAD_KINDS = ("notifications", "messages")
+
+_CHANGED_KEY = "unread_changed_users"
+
+# 負にはしない（ずれは reconcile で直す）
+_UPSERT = {
+    kind: text(
+        "INSERT INTO unread_counter (user_id, notifications, messages) VALUES (:user_id, "
+        + ", ".join(":initial" if other == kind else "0" for other in UNREAD_KINDS)
+        + ") "
+        f"ON CONFLICT (user_id) DO UPDATE SET {kind} = CASE "
+        f"WHEN unread_counter.{kind} + :delta > 0 THEN unread_counter.{kind} + :delta ELSE 0 END"
+    )
+    for kind in UNREAD_KINDS
+}
+
+# 実際の未読件数。メッセージは応募の出店者とイベントの主催者のうち、送信者でない側の未読
+_ACTUAL_SQL = """
+WITH target AS (SELECT id AS user_id FROM "user" WHERE {user_filter}),
+notification_unread AS (
+    SELECT user_id, COUNT(*) AS unread FROM notification
+    WHERE NOT is_read AND user_id IN (SELECT user_id FROM target)
+    GROUP BY user_id
+),
+participant AS (
+    SELECT a.stallholder_id AS user_id, a.id AS application_id
+    FROM application a
+    WHERE a.stallholder_id IN (SELECT user_id FROM target)
+    UNION ALL
+    SELECT e.organizer_id, a.id
+    FROM event e JOIN application a ON a.event_id = e.id
+    WHERE e.organizer_id IN (SELECT user_id FROM target)
+),
+message_unread AS (
+    SELECT p.user_id, COUNT(*) AS unread
+    FROM participant p JOIN message m ON m.application_id = p.application_id
+    WHERE NOT m.is_read AND m.sender_id != p.user_id
+    GROUP BY p.user_id
+),
+actual AS (
+    SELECT t.user_id,
+        COALESCE(n.unread, 0) AS notifications,
+        COALESCE(mu.unread, 0) AS messages
+    FROM target t
+    LEFT JOIN notification_unread n ON n.user_id = t.user_id
+    LEFT JOIN message_unread mu ON mu.user_id = t.user_id
+)
+"""
+
+_RECONCILE_SQL = (
+    _ACTUAL_SQL
+    + """
+INSERT INTO unread_counter (user_id, notifications, messages)
+SELECT a.user_id, a.notifications, a.messages
+FROM actual a LEFT JOIN unread_counter c ON c.user_id = a.user_id
+WHERE COALESCE(c.notifications, 0) != a.notifications OR COALESCE(c.messages, 0) != a.messages
+ON CONFLICT (user_id) DO UPDATE SET
+    notifications = excluded.notifications, messages = excluded.messages
+RETURNING user_id
+"""
+)
+
+UnreadCommitSubscriber = Callable[[set[int]], None]
+
+_commit_subscribers: list[UnreadCommitSubscriber] = []
+
+
+def on_unread_commit(func: UnreadCommitSubscriber) -> UnreadCommitSubscriber:
+    _commit_subscribers.append(func)
+    return func
+
+
+def mark_unread_changed(session: Session, user_ids: Sequence[int]) -> None:
+    session.info.setdefault(_CHANGED_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_unread_changes(session: Session) -> None:
+    user_ids = session.info.pop(_CHANGED_KEY, None)
+    if not user_ids:
+        return
+    for subscriber in _commit_subscribers:
+        subscriber(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_unread_changes(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def add_unread(session: Session, kind: str, deltas: Mapping[int, int]) -> None:
+    """ユーザー ID → 増減 をまとめて加減算する（executemany の UPSERT）"""
+    rows = [
+        {"user_id": user_id, "delta": delta, "initial": max(delta, 0)}
+        for user_id, delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    session.connection().execute(_UPSERT[kind], rows)
+    mark_unread_changed(session, list(deltas))
+
+
+def _counts_statement(user_id: int):
+    # ORM オブジェクトにすると UPSERT 後も同じセッションでは古い値が返るため列で読む
+    return select(UnreadCounter.notifications, UnreadCounter.messages).where(
+        UnreadCounter.user_id == user_id
+    )
+
+
+def get_unread_counts(session: Session, user_id: int) -> dict[str, int]:
+    return _as_counts(session.exec(_counts_statement(user_id)).first())
+
+
+async def get_unread_counts_async(session: AsyncSession, user_id: int) -> dict[str, int]:
+    return _as_counts((await session.exec(_counts_statement(user_id))).first())
+
+
+def _as_counts(row) -> dict[str, int]:
+    if row is None:
+        return dict.fromkeys(UNREAD_KINDS, 0)
+    return dict(zip(UNREAD_KINDS, row))
+
+
+def reconcile_unread_counters(
+    connection: Connection, user_ids: Sequence[int] | None = None
+) -> list[int]:
+    """実際の未読件数と違うユーザーの行だけを直し、そのユーザー ID を返す"""
+    statement = text(
+        _RECONCILE_SQL.format(user_filter="1 = 1" if user_ids is None else "id IN :user_ids")
+    )
+    params = {}
+    if user_ids is not None:
+        statement = statement.bindparams(bindparam("user_ids", expanding=True))
+        params["user_ids"] = list(user_ids)
+    return list(connection.execute(statement, params).scalars())
+
+
+def list_user_ids(session: Session, after: int, limit: int) -> list[int]:
+    statement = select(User.id).where(User.id > after).order_by(User.id).limit(limit)
+    return list(session.exec(statement).all())
@@ -1,6 +1,8 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import User
+from app.repositories.unit_of_work import persist
 
 
 def get_user_by_email(session: Session, email: str) -> User | None:
@@ -12,8 +14,9 @@ def get_user(session: Session, user_id: int) -> User | None:
     return session.get(User, user_id)
 
 
+async def get_user_async(session: AsyncSession, user_id: int) -> User | None:
+    return await session.get(User, user_id)
+
+
 def save_user(session: Session, user: User) -> User:
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-    return user
+    return persist(session, user)
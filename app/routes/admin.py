@@ -1,12 +1,30 @@
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlmodel import Session, select
+from sqlmodel import Session
 
+from app.db import (
+    get_async_engine,
+    get_async_replica_engine,
+    get_pool_stats,
+    replica_engine,
+)
 from app.errors import ValidationError
-from app.models import AdminNote, Application, Event, Guide, Report, Review, StallholderProfile, User
-from app.repositories.admin_repo import list_admin_notes
-from app.routes.deps import require_role, session_dependency
+from app.models import AdminNote, Event
+from app.repositories.admin_repo import list_admin_notes, list_guides, list_reports
+from app.repositories.admin_search_repo import search_reviews_by_comment, search_users_by_email
+from app.repositories.application_repo import search_applications
+from app.repositories.event_repo import list_events_by_status
+from app.repositories.pagination import Page
+from app.repositories.profile_repo import list_stallholder_profiles_by_review_status
+from app.routes.deps import (
+    cursor_params,
+    load_unread_counts,
+    read_session_dependency,
+    require_role,
+    session_dependency,
+    unread_context,
+)
 from app.services.admin_service import (
     approve_event,
     create_admin_note,
@@ -17,6 +35,13 @@ from app.services.admin_service import (
     update_guide,
     update_report_status,
 )
+from app.services.calendar_cache import calendar_cache
+from app.services.event_catalog import catalogs
+from app.services.event_service import search_all_events_by_keyword
+from app.services.notification_hub import notification_hub
+from app.services.notification_worker import notification_worker
+from app.services.search_cache import search_cache
+from app.services.unread_service import unread_cache
 from app.utils import (
     APPLICATION_STATUS_LABELS,
     EVENT_STATUS_LABELS,
@@ -24,72 +49,126 @@ from app.utils import (
     REPORT_STATUS_LABELS,
 )
 
-router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+router = APIRouter(dependencies=[Depends(load_unread_counts)])
+templates = Jinja2Templates(directory="app/templates", context_processors=[unread_context])
 templates.env.globals["event_status_labels"] = EVENT_STATUS_LABELS
 templates.env.globals["app_status_labels"] = APPLICATION_STATUS_LABELS
 templates.env.globals["report_status_labels"] = REPORT_STATUS_LABELS
 templates.env.globals["profile_review_status_labels"] = PROFILE_REVIEW_STATUS_LABELS
 
 
+APPLICATION_FILTER_PARAMS = ("application_id", "event_id", "stallholder", "status")
+
+
+# 主キーは 64 ビット整数（これを超える値は DB に渡せない）
+MAX_ID = 2**63 - 1
+
+
+def _parse_id(value: str | None) -> int | None:
+    value = (value or "").strip()
+    # isdigit は "²" などにも真を返すため ASCII に限る
+    if not (value.isascii() and value.isdigit()) or int(value) > MAX_ID:
+        return None
+    return int(value)
+
+
+def _application_filters(request: Request) -> dict | None:
+    """応募検索の条件。解釈できない値があれば None（何も一致させない）"""
+    params = request.query_params
+    stallholder = (params.get("stallholder") or "").strip()
+    status = params.get("status") or None
+    ids = [params.get("application_id"), params.get("event_id")]
+    if "@" not in stallholder:
+        ids.append(stallholder)
+    if any((value or "").strip() and _parse_id(value) is None for value in ids):
+        return None
+    if status is not None and status not in APPLICATION_STATUS_LABELS:
+        return None
+    return {
+        "application_id": _parse_id(params.get("application_id")),
+        "event_id": _parse_id(params.get("event_id")),
+        "stallholder_id": _parse_id(stallholder),
+        "stallholder_email": stallholder if "@" in stallholder else None,
+        "status": status,
+    }
+
+
 @router.get("")
 def admin_dashboard(
     request: Request,
-    session: Session = Depends(session_dependency),
+    session: Session = Depends(read_session_dependency),
     user=Depends(require_role("admin")),
 ):
-    pending_events = list(
-        session.exec(select(Event).where(Event.status == "pending_review")).all()
+    pending_events_page = list_events_by_status(
+        session, "pending_review", **cursor_params(request, "events_")
     )
-    reports = list(session.exec(select(Report)).all())
-    pending_profiles = list(
-        session.exec(select(StallholderProfile).where(StallholderProfile.review_status == "pending")).all()
+    reports_page = list_reports(session, **cursor_params(request, "reports_"))
+    pending_profiles_page = list_stallholder_profiles_by_review_status(
+        session, "pending", **cursor_params(request, "profiles_")
     )
-    guides = list(session.exec(select(Guide)).all())
+    guides_page = list_guides(session, **cursor_params(request, "guides_"))
     admin_notes = list_admin_notes(session)
     search_type = request.query_params.get("search_type", "")
     search_query = request.query_params.get("q", "")
-    search_results = []
-    if search_type and search_query:
+    search_page = Page()
+    application_filters = _application_filters(request)
+    results_cursor = cursor_params(request, "results_")
+    if search_type == "application" and application_filters is not None:
+        # 条件なしの場合は新しい応募から 1 ページ分を表示する
+        search_page = search_applications(session, **application_filters, **results_cursor)
+    elif search_type and search_query:
         if search_type == "user":
-            search_results = list(
-                session.exec(
-                    select(User).where(User.email.contains(search_query))
-                ).all()
-            )
+            search_page = search_users_by_email(session, search_query, **results_cursor)
         elif search_type == "event":
-            search_results = list(
-                session.exec(
-                    select(Event).where(Event.title.contains(search_query))
-                ).all()
-            )
-        elif search_type == "application":
-            search_results = list(
-                session.exec(select(Application)).all()
-            )
+            search_page = search_all_events_by_keyword(session, search_query, **results_cursor)
         elif search_type == "review":
-            search_results = list(
-                session.exec(
-                    select(Review).where(Review.comment.contains(search_query))
-                ).all()
-            )
+            search_page = search_reviews_by_comment(session, search_query, **results_cursor)
     return templates.TemplateResponse(
         "admin/dashboard.html",
         {
             "request": request,
-            "pending_events": pending_events,
-            "reports": reports,
-            "pending_profiles": pending_profiles,
-            "guides": guides,
+            "pending_events": pending_events_page.items,
+            "pending_events_page": pending_events_page,
+            "reports": reports_page.items,
+            "reports_page": reports_page,
+            "pending_profiles": pending_profiles_page.items,
+            "pending_profiles_page": pending_profiles_page,
+            "guides": guides_page.items,
+            "guides_page": guides_page,
             "admin_notes": admin_notes,
             "user": user,
             "search_type": search_type,
             "search_query": search_query,
-            "search_results": search_results,
+            "application_filters": {
+                name: request.query_params.get(name, "") for name in APPLICATION_FILTER_PARAMS
+            },
+            "application_filters_invalid": application_filters is None,
+            "search_results": search_page.items,
+            "search_page": search_page,
         },
     )
 
 
+@router.get("/metrics")
+def admin_metrics(user=Depends(require_role("admin"))):
+    metrics = {"pool": get_pool_stats()}
+    if replica_engine is not None:
+        metrics["replica_pool"] = get_pool_stats(replica_engine)
+    # 読み込み中心のページと通知ワーカーは非同期エンジンのプールを使う
+    metrics["async_pool"] = get_pool_stats(get_async_engine())
+    async_replica_engine = get_async_replica_engine()
+    if async_replica_engine is not None:
+        metrics["async_replica_pool"] = get_pool_stats(async_replica_engine)
+    metrics["search_cache"] = search_cache.stats()
+    metrics["calendar_cache"] = calendar_cache.stats()
+    metrics["event_catalog"] = [catalog.stats() for catalog in catalogs()]
+    worker = notification_worker()
+    metrics["notification_worker"] = worker.stats() if worker else {"running": False}
+    metrics["notification_streams"] = notification_hub.stats()
+    metrics["unread_cache"] = unread_cache.stats()
+    return metrics
+
+
 @router.post("/events/{event_id}/approve")
 def approve_event_action(
     event_id: int,
@@ -0,0 +1,71 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.repositories.event_geo_repo import MAX_RADIUS_KM, GeoRadius
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.routes.deps import async_read_session_dependency, get_current_user_async
+from app.services.event_service import (
+    MAX_SUGGEST_LIMIT,
+    SUGGEST_LIMIT,
+    search_event_summaries_async,
+    suggest_facet_async,
+)
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+@router.get("/events/search")
+async def search_events_api(
+    region: list[str] = Query(default=[]),
+    genre: list[str] = Query(default=[]),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    lng: float | None = Query(default=None, ge=-180, le=180),
+    radius_km: float = Query(default=30, gt=0, le=MAX_RADIUS_KM),
+    sort: Literal["created_at", "start_date", "deadline"] = "created_at",
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(async_read_session_dependency),
+    user=Depends(get_current_user_async),
+):
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=422, detail="lat_and_lng_required")
+    near = GeoRadius(lat, lng, radius_km) if lat is not None else None
+    page = await search_event_summaries_async(
+        session,
+        regions=region,
+        genres=genre,
+        date_value=date_from,
+        date_until=date_to,
+        sort=sort,
+        after=after,
+        before=before,
+        limit=limit,
+        near=near,
+    )
+    # 行をそのまま dict にして orjson で直列化する（jsonable_encoder を通さない）
+    return ORJSONResponse(
+        {
+            "items": [dict(row._mapping) for row in page.items],
+            "next_cursor": page.next_cursor,
+            "prev_cursor": page.prev_cursor,
+        }
+    )
+
+
+@router.get("/facets/{facet}/suggest")
+async def suggest_facet_api(
+    facet: Literal["region", "genre"],
+    q: str = "",
+    limit: int = Query(default=SUGGEST_LIMIT, ge=1, le=MAX_SUGGEST_LIMIT),
+    session: AsyncSession = Depends(async_read_session_dependency),
+    user=Depends(get_current_user_async),
+):
+    options = await suggest_facet_async(session, facet, q, limit)
+    return ORJSONResponse({"items": [{"value": value, "count": count} for value, count in options]})
@@ -1,12 +1,20 @@
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlmodel import Session, select
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.errors import AuthenticationError, ValidationError
-from app.models import Event, User
-from app.repositories.user_repo import get_user
-from app.routes.deps import session_dependency
+from app.models import User
+from app.repositories.event_repo import list_open_events_async
+from app.repositories.user_repo import get_user, get_user_async
+from app.routes.deps import (
+    async_read_session_dependency,
+    cursor_params,
+    load_unread_counts,
+    session_dependency,
+    unread_context,
+)
 from app.services.auth_service import authenticate_user, register_user
 from app.utils import (
     APPLICATION_STATUS_LABELS,
@@ -15,8 +23,8 @@ from app.utils import (
     REPORT_STATUS_LABELS,
 )
 
-router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+router = APIRouter(dependencies=[Depends(load_unread_counts)])
+templates = Jinja2Templates(directory="app/templates", context_processors=[unread_context])
 
 # グローバル変数として辞書を追加
 templates.env.globals["event_status_labels"] = EVENT_STATUS_LABELS
@@ -33,13 +41,23 @@ def get_user_from_session(request: Request, session: Session) -> User | None:
     return get_user(session, user_id)
 
 
+async def get_user_from_session_async(request: Request, session: AsyncSession) -> User | None:
+    """セッションからユーザー情報を取得（非同期・オプショナル）"""
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return None
+    return await get_user_async(session, user_id)
+
+
 @router.get("/")
-def index(request: Request, session: Session = Depends(session_dependency)):
+async def index(request: Request, session: AsyncSession = Depends(async_read_session_dependency)):
     # 募集中のイベントを取得
-    events = list(session.exec(select(Event).where(Event.status == "open")).all())
+    page = await list_open_events_async(session, **cursor_params(request))
     # ユーザー情報を取得（ログイン済みの場合）
-    user = get_user_from_session(request, session)
-    return templates.TemplateResponse("auth/index.html", {"request": request, "events": events, "user": user})
+    user = await get_user_from_session_async(request, session)
+    return templates.TemplateResponse(
+        "auth/index.html", {"request": request, "events": page.items, "page": page, "user": user}
+    )
 
 
 @router.get("/register")
@@ -1,8 +1,19 @@
+import time
+from collections.abc import AsyncIterator
+
 from fastapi import Depends, HTTPException, Request
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.db import get_session
-from app.repositories.user_repo import get_user
+from app.db import (
+    READ_YOUR_WRITES_SECONDS,
+    get_async_read_session,
+    get_async_session,
+    get_read_session,
+    get_session,
+)
+from app.repositories.user_repo import get_user, get_user_async
+from app.services.unread_service import cached_unread_counts_async
 
 
 def session_dependency() -> Session:
@@ -13,6 +24,47 @@ def session_dependency() -> Session:
         session.close()
 
 
+async def async_session_dependency() -> AsyncIterator[AsyncSession]:
+    session = get_async_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def stick_to_primary(request: Request) -> None:
+    """書き込み直後の読み込みをプライマリに固定する（read-your-writes）"""
+    request.session["read_primary_until"] = time.time() + READ_YOUR_WRITES_SECONDS
+
+
+def _prefers_primary(request: Request) -> bool:
+    return request.session.get("read_primary_until", 0) > time.time()
+
+
+def read_session_dependency(request: Request) -> Session:
+    session = get_read_session(use_primary=_prefers_primary(request))
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+async def async_read_session_dependency(request: Request) -> AsyncIterator[AsyncSession]:
+    session = get_async_read_session(use_primary=_prefers_primary(request))
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def cursor_params(request: Request, prefix: str = "") -> dict:
+    """一覧ページのカーソル（?after= / ?before=）をクエリから取り出す"""
+    return {
+        "after": request.query_params.get(f"{prefix}after") or None,
+        "before": request.query_params.get(f"{prefix}before") or None,
+    }
+
+
 def get_current_user(
     request: Request, session: Session = Depends(session_dependency)
 ):
@@ -25,6 +77,18 @@ def get_current_user(
     return user
 
 
+async def get_current_user_async(
+    request: Request, session: AsyncSession = Depends(async_session_dependency)
+):
+    user_id = request.session.get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="login_required")
+    user = await get_user_async(session, user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="user_not_found")
+    return user
+
+
 def require_role(required_role: str):
     def _checker(user=Depends(get_current_user)):
         if user.role != required_role:
@@ -32,3 +96,29 @@ def require_role(required_role: str):
         return user
 
     return _checker
+
+
+def require_role_async(required_role: str):
+    async def _checker(user=Depends(get_current_user_async)):
+        if user.role != required_role:
+            raise HTTPException(status_code=403, detail="forbidden")
+        return user
+
+    return _checker
+
+
+async def load_unread_counts(
+    request: Request, session: AsyncSession = Depends(async_session_dependency)
+) -> None:
+    """ヘッダーの未読件数をプライマリから読み、request.state に置く（画面のルーターの依存関係）"""
+    user_id = request.session.get("user_id") if "session" in request.scope else None
+    if not user_id:
+        return
+    request.state.unread_counts = await cached_unread_counts_async(session, user_id)
+    # 読み込みのトランザクションをすぐ終え、応答（SSE を含む）の終わりまで接続を持たない
+    await session.commit()
+
+
+def unread_context(request: Request) -> dict:
+    """テンプレートの共通コンテキスト（描画中に DB を読まず、読み込み済みの件数を渡すだけ）"""
+    return {"unread_counts": getattr(request.state, "unread_counts", None)}
@@ -1,15 +1,31 @@
-from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response
 from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.errors import ValidationError
 from app.models import Application, Event
-from app.repositories.message_repo import list_messages_for_application
-from app.routes.deps import get_current_user, session_dependency
-from app.services.message_service import send_message
+from app.repositories.message_repo import (
+    list_messages_for_application,
+    list_messages_for_application_async,
+)
+from app.routes.deps import (
+    async_read_session_dependency,
+    cursor_params,
+    get_current_user,
+    get_current_user_async,
+    load_unread_counts,
+    session_dependency,
+    unread_context,
+)
+from app.services.message_service import mark_messages_read, send_message
 
-router = APIRouter(prefix="/messages", tags=["messages"])
-templates = Jinja2Templates(directory="app/templates")
+router = APIRouter(
+    prefix="/messages",
+    tags=["messages"],
+    dependencies=[Depends(load_unread_counts)],
+)
+templates = Jinja2Templates(directory="app/templates", context_processors=[unread_context])
 
 
 def _load_application(session: Session, application_id: int) -> Application:
@@ -19,8 +35,26 @@ def _load_application(session: Session, application_id: int) -> Application:
     return application
 
 
+async def _load_application_async(session: AsyncSession, application_id: int) -> Application:
+    application = await session.get(Application, application_id)
+    if not application:
+        raise HTTPException(status_code=404, detail="application_not_found")
+    return application
+
+
 def _authorize(session: Session, user, application: Application) -> Event:
     event = session.get(Event, application.event_id)
+    _check_access(user, application, event)
+    return event
+
+
+async def _authorize_async(session: AsyncSession, user, application: Application) -> Event:
+    event = await session.get(Event, application.event_id)
+    _check_access(user, application, event)
+    return event
+
+
+def _check_access(user, application: Application, event: Event | None) -> None:
     if not event:
         raise HTTPException(status_code=404, detail="event_not_found")
     if user.role == "stallholder" and application.stallholder_id != user.id:
@@ -31,26 +65,28 @@ def _authorize(session: Session, user, application: Application) -> Event:
         raise HTTPException(status_code=403, detail="forbidden")
     if application.status != "approved":
         raise HTTPException(status_code=400, detail="application_not_approved")
-    return event
 
 
 @router.get("/{application_id}")
-def message_room(
+async def message_room(
     request: Request,
     application_id: int,
-    session: Session = Depends(session_dependency),
-    user=Depends(get_current_user),
+    session: AsyncSession = Depends(async_read_session_dependency),
+    user=Depends(get_current_user_async),
 ):
-    application = _load_application(session, application_id)
-    event = _authorize(session, user, application)
-    messages = list_messages_for_application(session, application.id)
+    application = await _load_application_async(session, application_id)
+    event = await _authorize_async(session, user, application)
+    page = await list_messages_for_application_async(
+        session, application.id, **cursor_params(request)
+    )
     return templates.TemplateResponse(
         "messages/room.html",
         {
             "request": request,
             "application": application,
             "event": event,
-            "messages": messages,
+            "messages": list(reversed(page.items)),
+            "page": page,
             "user": user,
         },
     )
@@ -69,14 +105,32 @@ def post_message(
     try:
         send_message(session, application, user, content=content)
     except ValidationError as exc:
-        messages = list_messages_for_application(session, application.id)
+        page = list_messages_for_application(session, application.id)
         return templates.TemplateResponse(
             "messages/thread.html",
-            {"request": request, "messages": messages, "error": str(exc)},
+            {
+                "request": request,
+                "messages": list(reversed(page.items)),
+                "page": page,
+                "error": str(exc),
+            },
             status_code=400,
         )
-    messages = list_messages_for_application(session, application.id)
+    page = list_messages_for_application(session, application.id)
     return templates.TemplateResponse(
         "messages/thread.html",
-        {"request": request, "messages": messages},
+        {"request": request, "messages": list(reversed(page.items)), "page": page},
     )
+
+
+@router.post("/{application_id}/read", status_code=204)
+def read_messages(
+    application_id: int,
+    session: Session = Depends(session_dependency),
+    user=Depends(get_current_user),
+):
+    """メッセージ画面の表示後に htmx から呼ぶ（GET は読み込みレプリカで処理するため分ける）"""
+    application = _load_application(session, application_id)
+    _authorize(session, user, application)
+    mark_messages_read(session, application, user)
+    return Response(status_code=204)
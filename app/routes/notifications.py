@@ -1,38 +1,148 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from fastapi.responses import RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import Notification
-from app.repositories.notification_repo import list_notifications_for_user
-from app.routes.deps import get_current_user, session_dependency
-from app.services.notification_service import mark_notification_read
+from app.db import get_async_read_session
+from app.errors import TooManyStreamsError
+from app.repositories.notification_repo import (
+    latest_notification_id_async,
+    list_notifications_for_user_async,
+)
+from app.repositories.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.repositories.unread_repo import get_unread_counts_async
+from app.repositories.user_repo import get_user_async
+from app.routes.deps import (
+    async_read_session_dependency,
+    cursor_params,
+    get_current_user,
+    get_current_user_async,
+    load_unread_counts,
+    session_dependency,
+    unread_context,
+)
+from app.services.notification_hub import notification_hub, stream_notifications
+from app.services.notification_service import mark_notifications_read
+from app.services.unread_service import cached_unread_counts
 
-router = APIRouter(prefix="/notifications", tags=["notifications"])
-templates = Jinja2Templates(directory="app/templates")
+router = APIRouter(
+    prefix="/notifications",
+    tags=["notifications"],
+    dependencies=[Depends(load_unread_counts)],
+)
+templates = Jinja2Templates(directory="app/templates", context_processors=[unread_context])
 
 
 @router.get("")
-def notifications_list(
+async def notifications_list(
     request: Request,
-    session: Session = Depends(session_dependency),
-    user=Depends(get_current_user),
+    session: AsyncSession = Depends(async_read_session_dependency),
+    user=Depends(get_current_user_async),
 ):
-    notifications = list_notifications_for_user(session, user.id)
+    page = await list_notifications_for_user_async(session, user.id, **cursor_params(request))
+    # 「すべて既読にする」はこのページの先頭以前が対象（表示後に届いた通知は含めない）
+    read_through = (
+        encode_cursor(page.items[0].created_at, page.items[0].id) if page.items else None
+    )
     return templates.TemplateResponse(
         "notifications/index.html",
-        {"request": request, "notifications": notifications, "user": user},
+        {
+            "request": request,
+            "notifications": page.items,
+            "page": page,
+            "read_through": read_through,
+            "user": user,
+        },
+    )
+
+
+async def _unread_for_stream(user_id: int) -> tuple[int, int]:
+    # 依存関係のセッションは応答の終わりまで閉じないため、接続中に DB 接続を持たないよう個別に開く
+    session = get_async_read_session(use_primary=True)
+    try:
+        user = await get_user_async(session, user_id)
+        if not user:
+            raise HTTPException(status_code=401, detail="user_not_found")
+        counted_through = await latest_notification_id_async(session, user.id)
+        unread = await get_unread_counts_async(session, user.id)
+        return unread["notifications"], counted_through
+    finally:
+        await session.close()
+
+
+@router.get("/stream")
+async def notifications_stream(request: Request):
+    """新しい通知と未読件数を Server-Sent Events で送る"""
+    user_id = request.session.get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="login_required")
+    try:
+        # 数える前に購読し、その間に作られた通知を取りこぼさない
+        subscription = notification_hub.subscribe(user_id)
+    except TooManyStreamsError:
+        raise HTTPException(status_code=503, detail="too_many_streams")
+    try:
+        unread, counted_through = await _unread_for_stream(user_id)
+    except BaseException:
+        notification_hub.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        stream_notifications(subscription, unread, counted_through),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _read_result(
+    request: Request, session: Session, user, read_ids: list[int], shown_ids: list[int]
+):
+    """既読にした件数と、画面の行の状態を差し替える htmx の部分テンプレート"""
+    if request.headers.get("HX-Request") != "true":
+        # JavaScript なしのフォーム送信は一覧へ戻す
+        return RedirectResponse(url="/notifications", status_code=303)
+    # 依存関係で読んだ件数は既読にする前の値のため、COMMIT 後に読み直す
+    request.state.unread_counts = cached_unread_counts(session, user.id)
+    return templates.TemplateResponse(
+        "notifications/_read_result.html",
+        {"request": request, "read_count": len(read_ids), "shown_ids": shown_ids},
     )
 
 
+@router.post("/read")
+def mark_selected_read(
+    request: Request,
+    ids: list[int] = Form(default=[]),
+    session: Session = Depends(session_dependency),
+    user=Depends(get_current_user),
+):
+    if len(ids) > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail="too_many_ids")
+    read_ids = mark_notifications_read(session, user, ids=ids) if ids else []
+    return _read_result(request, session, user, read_ids, ids)
+
+
+@router.post("/read-all")
+def mark_all_read(
+    request: Request,
+    through: str = Form(...),
+    shown: list[int] = Form(default=[]),
+    session: Session = Depends(session_dependency),
+    user=Depends(get_current_user),
+):
+    cursor = decode_cursor(through)
+    if cursor is None:
+        raise HTTPException(status_code=400, detail="invalid_cursor")
+    read_ids = mark_notifications_read(session, user, through=cursor)
+    return _read_result(request, session, user, read_ids, shown[:MAX_PAGE_SIZE])
+
+
 @router.post("/{notification_id}/read")
 def mark_read(
+    request: Request,
     notification_id: int,
     session: Session = Depends(session_dependency),
     user=Depends(get_current_user),
 ):
-    notification = session.get(Notification, notification_id)
-    if not notification or notification.user_id != user.id:
-        raise HTTPException(status_code=404, detail="notification_not_found")
-    mark_notification_read(session, notification)
-    return RedirectResponse(url="/notifications", status_code=303)
+    read_ids = mark_notifications_read(session, user, ids=[notification_id])
+    return _read_result(request, session, user, read_ids, [notification_id])
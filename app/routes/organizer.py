@@ -8,7 +8,19 @@ from sqlmodel import Session, select
 
 from app.errors import AuthorizationError, ValidationError
 from app.models import Application, Event
-from app.routes.deps import require_role, session_dependency
+from app.repositories.application_repo import list_applications_for_event
+from app.repositories.event_repo import (
+    count_events_by_status_for_organizer,
+    list_events_for_organizer,
+)
+from app.routes.deps import (
+    cursor_params,
+    load_unread_counts,
+    read_session_dependency,
+    require_role,
+    session_dependency,
+    unread_context,
+)
 from app.services.application_service import decide_application
 from app.services.review_service import create_review
 from app.services.event_service import (
@@ -24,8 +36,8 @@ from app.utils import (
     REPORT_STATUS_LABELS,
 )
 
-router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+router = APIRouter(dependencies=[Depends(load_unread_counts)])
+templates = Jinja2Templates(directory="app/templates", context_processors=[unread_context])
 templates.env.globals["event_status_labels"] = EVENT_STATUS_LABELS
 templates.env.globals["app_status_labels"] = APPLICATION_STATUS_LABELS
 templates.env.globals["report_status_labels"] = REPORT_STATUS_LABELS
@@ -36,18 +48,25 @@ def _to_datetime_local(value: datetime) -> str:
     return value.replace(tzinfo=None).strftime("%Y-%m-%dT%H:%M")
 
 
+def _parse_coordinate(value: str) -> float | None:
+    if not value.strip():
+        return None
+    try:
+        return float(value)
+    except ValueError as exc:
+        raise ValidationError("location_invalid") from exc
+
+
 @router.get("")
 def dashboard(
     request: Request,
-    session: Session = Depends(session_dependency),
+    session: Session = Depends(read_session_dependency),
     user=Depends(require_role("organizer")),
 ):
-    statement = select(Event).where(Event.organizer_id == user.id)
-    events = list(session.exec(statement).all())
+    page = list_events_for_organizer(session, user.id, **cursor_params(request))
+    events = page.items
     counts: dict[int, int] = {}
-    status_counts: dict[str, int] = {}
-    for event in events:
-        status_counts[event.status] = status_counts.get(event.status, 0) + 1
+    status_counts = count_events_by_status_for_organizer(session, user.id)
     if events:
         ids = [event.id for event in events if event.id is not None]
         if ids:
@@ -62,6 +81,7 @@ def dashboard(
         {
             "request": request,
             "events": events,
+            "page": page,
             "user": user,
             "application_counts": counts,
             "status_counts": status_counts,
@@ -91,6 +111,8 @@ def create_event_action(
     end_date: str = Form(...),
     application_deadline: str = Form(...),
     capacity: int = Form(...),
+    latitude: str = Form(""),
+    longitude: str = Form(""),
     session: Session = Depends(session_dependency),
     user=Depends(require_role("organizer")),
 ):
@@ -107,6 +129,8 @@ def create_event_action(
             end_date=datetime.fromisoformat(end_date),
             application_deadline=datetime.fromisoformat(application_deadline),
             capacity=capacity,
+            latitude=_parse_coordinate(latitude),
+            longitude=_parse_coordinate(longitude),
         )
     except ValidationError as exc:
         return templates.TemplateResponse(
@@ -121,7 +145,7 @@ def create_event_action(
 def event_detail(
     request: Request,
     event_id: int,
-    session: Session = Depends(session_dependency),
+    session: Session = Depends(read_session_dependency),
     user=Depends(require_role("organizer")),
 ):
     try:
@@ -171,6 +195,8 @@ def edit_event_action(
     end_date: str = Form(...),
     application_deadline: str = Form(...),
     capacity: int = Form(...),
+    latitude: str = Form(""),
+    longitude: str = Form(""),
     session: Session = Depends(session_dependency),
     user=Depends(require_role("organizer")),
 ):
@@ -188,6 +214,8 @@ def edit_event_action(
             end_date=datetime.fromisoformat(end_date),
             application_deadline=datetime.fromisoformat(application_deadline),
             capacity=capacity,
+            latitude=_parse_coordinate(latitude),
+            longitude=_parse_coordinate(longitude),
         )
     except (AuthorizationError, ValidationError) as exc:
         return templates.TemplateResponse(
@@ -206,6 +234,8 @@ def edit_event_action(
                 "end_date_value": end_date,
                 "deadline_value": application_deadline,
                 "capacity": capacity,
+                "latitude": latitude,
+                "longitude": longitude,
             },
             status_code=400,
         )
@@ -229,20 +259,20 @@ def submit_for_review(
 def list_applications(
     request: Request,
     event_id: int,
-    session: Session = Depends(session_dependency),
+    session: Session = Depends(read_session_dependency),
     user=Depends(require_role("organizer")),
 ):
     try:
         event = get_event_for_organizer(session, user, event_id)
     except (AuthorizationError, ValidationError):
         return RedirectResponse(url="/organizer", status_code=303)
-    statement = select(Application).where(Application.event_id == event.id)
-    apps = list(session.exec(statement).all())
+    page = list_applications_for_event(session, event.id, **cursor_params(request))
     return templates.TemplateResponse(
         "organizer/applications.html",
         {
             "request": request,
-            "applications": apps,
+            "applications": page.items,
+            "page": page,
             "user": user,
             "event": event,
         },
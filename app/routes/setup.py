@@ -7,11 +7,11 @@ from sqlmodel import Session, select
 
 from app.errors import ValidationError
 from app.models import User
-from app.routes.deps import session_dependency
+from app.routes.deps import load_unread_counts, session_dependency, unread_context
 from app.services.auth_service import register_user
 
-router = APIRouter(prefix="/setup", tags=["setup"])
-templates = Jinja2Templates(directory="app/templates")
+router = APIRouter(prefix="/setup", tags=["setup"], dependencies=[Depends(load_unread_counts)])
+templates = Jinja2Templates(directory="app/templates", context_processors=[unread_context])
 
 
 def _get_setup_token() -> str | None:
@@ -4,12 +4,28 @@ from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.errors import AuthorizationError, ValidationError
 from app.models import Application, Event, StallholderProfile
-from app.routes.deps import require_role, session_dependency
+from app.repositories.application_repo import list_applications_for_stallholder
+from app.routes.deps import (
+    async_read_session_dependency,
+    cursor_params,
+    load_unread_counts,
+    read_session_dependency,
+    require_role,
+    require_role_async,
+    session_dependency,
+    unread_context,
+)
 from app.services.application_service import apply_to_event, cancel_application
-from app.services.event_service import search_events
+from app.services.event_service import (
+    event_calendar_async,
+    search_events_page_cached_async,
+    suggest_facet_async,
+)
+from app.services.feed_service import recommended_events_async
 from app.services.profile_service import update_stallholder_profile
 from app.services.review_service import create_review
 from app.utils import (
@@ -19,60 +35,120 @@ from app.utils import (
     REPORT_STATUS_LABELS,
 )
 
-router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+router = APIRouter(dependencies=[Depends(load_unread_counts)])
+templates = Jinja2Templates(directory="app/templates", context_processors=[unread_context])
 templates.env.globals["event_status_labels"] = EVENT_STATUS_LABELS
 templates.env.globals["app_status_labels"] = APPLICATION_STATUS_LABELS
 templates.env.globals["report_status_labels"] = REPORT_STATUS_LABELS
 templates.env.globals["profile_review_status_labels"] = PROFILE_REVIEW_STATUS_LABELS
 
 
+def _parse_date(value: str | None) -> date | None:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _parse_month(value: str | None, default: date) -> date:
+    # "2026-10" 形式。不正な値は default の月にする
+    try:
+        return date.fromisoformat(f"{value}-01") if value else default.replace(day=1)
+    except ValueError:
+        return default.replace(day=1)
+
+
 @router.get("")
-def dashboard(
+async def dashboard(
     request: Request,
-    session: Session = Depends(session_dependency),
-    user=Depends(require_role("stallholder")),
+    session: AsyncSession = Depends(async_read_session_dependency),
+    user=Depends(require_role_async("stallholder")),
 ):
     region = request.query_params.get("region") or None
     genre = request.query_params.get("genre") or None
     date_str = request.query_params.get("date") or None
-    date_value: date | None = None
-    if date_str:
-        try:
-            date_value = date.fromisoformat(date_str)
-        except ValueError:
-            date_value = None
-
-    events = search_events(session, region=region, genre=genre, date_value=date_value)
-    regions = list(
-        {
-            value
-            for value in session.exec(
-                select(Event.region).where(Event.status == "open").distinct()
-            ).all()
-            if value
-        }
+    date_to_str = request.query_params.get("date_to") or None
+    keyword = (request.query_params.get("q") or "").strip() or None
+    date_value = _parse_date(date_str)
+    date_until = _parse_date(date_to_str)
+
+    page = await search_events_page_cached_async(
+        session,
+        region=region,
+        genre=genre,
+        date_value=date_value,
+        date_until=date_until,
+        keyword=keyword,
+        **cursor_params(request),
     )
-    genres = list(
-        {
-            value
-            for value in session.exec(
-                select(Event.genre).where(Event.status == "open").distinct()
-            ).all()
-            if value
-        }
+    # 候補は件数の多い上位だけを埋め込み、入力に応じて /stallholder/suggest から差し替える
+    regions = await suggest_facet_async(session, "region", "")
+    genres = await suggest_facet_async(session, "genre", "")
+    month_calendar = await event_calendar_async(
+        session, date_value or date_until or date.today(), region, genre
     )
+    # おすすめは絞り込みのない最初のページにだけ出す（保存済みの上位を読むだけ）
+    filtered = region or genre or date_value or date_until or keyword
+    recommended = []
+    if not filtered and page.prev_cursor is None:
+        recommended = await recommended_events_async(session, user)
     return templates.TemplateResponse(
         "stallholder/dashboard.html",
         {
             "request": request,
-            "events": events,
+            "events": page.items,
+            "page": page,
             "user": user,
-            "regions": sorted(regions),
-            "genres": sorted(genres),
+            "regions": regions,
+            "genres": genres,
+            "calendar": month_calendar,
+            "recommended": recommended,
             "selected_region": region or "",
             "selected_genre": genre or "",
             "selected_date": date_str or "",
+            "selected_date_to": date_to_str or "",
+            "keyword": keyword or "",
+        },
+    )
+
+
+@router.get("/suggest/{facet}")
+async def suggest(
+    request: Request,
+    facet: str,
+    session: AsyncSession = Depends(async_read_session_dependency),
+    user=Depends(require_role_async("stallholder")),
+):
+    # htmx は入力欄の name（region / genre）で値を送ってくる
+    prefix = request.query_params.get(facet) or ""
+    try:
+        options = await suggest_facet_async(session, facet, prefix)
+    except ValidationError:
+        options = []
+    return templates.TemplateResponse(
+        "stallholder/_suggestions.html", {"request": request, "options": options}
+    )
+
+
+@router.get("/calendar")
+async def calendar(
+    request: Request,
+    session: AsyncSession = Depends(async_read_session_dependency),
+    user=Depends(require_role_async("stallholder")),
+):
+    region = request.query_params.get("region") or None
+    genre = request.query_params.get("genre") or None
+    month = _parse_month(request.query_params.get("month"), date.today())
+    month_calendar = await event_calendar_async(session, month, region, genre)
+    return templates.TemplateResponse(
+        "stallholder/_calendar.html",
+        {
+            "request": request,
+            "calendar": month_calendar,
+            "selected_region": region or "",
+            "selected_genre": genre or "",
         },
     )
 
@@ -81,7 +157,7 @@ def dashboard(
 def event_detail(
     request: Request,
     event_id: int,
-    session: Session = Depends(session_dependency),
+    session: Session = Depends(read_session_dependency),
     user=Depends(require_role("stallholder")),
 ):
     event = session.get(Event, event_id)
@@ -139,14 +215,13 @@ def apply_event(
 @router.get("/applications")
 def applications(
     request: Request,
-    session: Session = Depends(session_dependency),
+    session: Session = Depends(read_session_dependency),
     user=Depends(require_role("stallholder")),
 ):
-    statement = select(Application).where(Application.stallholder_id == user.id)
-    apps = list(session.exec(statement).all())
+    page = list_applications_for_stallholder(session, user.id, **cursor_params(request))
     return templates.TemplateResponse(
         "stallholder/applications.html",
-        {"request": request, "applications": apps, "user": user},
+        {"request": request, "applications": page.items, "page": page, "user": user},
     )
 
 
@@ -166,7 +241,7 @@ def cancel_application_action(
 @router.get("/profile")
 def profile_page(
     request: Request,
-    session: Session = Depends(session_dependency),
+    session: Session = Depends(read_session_dependency),
     user=Depends(require_role("stallholder")),
 ):
     profile = session.exec(
@@ -6,9 +6,11 @@ from app.errors import AuthorizationError, ValidationError
 from app.models import AdminNote, Event, Guide, Report, StallholderProfile, User
 from app.repositories.admin_repo import save_admin_note, save_guide, save_report
 from app.repositories.event_repo import save_event
+from app.repositories.unit_of_work import persist, transactional
 from app.services.notification_service import create_notification
 
 
+@transactional
 def approve_event(session: Session, admin: User, event: Event, approve: bool) -> Event:
     if admin.role != "admin":
         raise AuthorizationError("role_required_admin")
@@ -33,6 +35,7 @@ def approve_event(session: Session, admin: User, event: Event, approve: bool) ->
     return event
 
 
+@transactional
 def review_stallholder_profile(
     session: Session,
     admin: User,
@@ -51,9 +54,7 @@ def review_stallholder_profile(
     profile.reviewed_at = datetime.now(timezone.utc)
     profile.review_note = review_note
     profile.updated_at = datetime.now(timezone.utc)
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
+    persist(session, profile)
 
     target = session.get(User, profile.user_id)
     if target:
@@ -69,6 +70,7 @@ def review_stallholder_profile(
     return profile
 
 
+@transactional
 def update_report_status(
     session: Session,
     admin: User,
@@ -91,6 +93,7 @@ def update_report_status(
     return save_report(session, report)
 
 
+@transactional
 def create_admin_note(
     session: Session,
     admin: User,
@@ -113,6 +116,7 @@ def create_admin_note(
     return save_admin_note(session, admin_note)
 
 
+@transactional
 def create_guide(
     session: Session,
     admin: User,
@@ -137,6 +141,7 @@ def create_guide(
     return save_guide(session, guide)
 
 
+@transactional
 def toggle_user_active(session: Session, admin: User, user_id: int, is_active: bool) -> User:
     if admin.role != "admin":
         raise AuthorizationError("role_required_admin")
@@ -145,12 +150,10 @@ def toggle_user_active(session: Session, admin: User, user_id: int, is_active: b
         raise ValidationError("user_not_found")
     target.is_active = is_active
     target.updated_at = datetime.now(timezone.utc)
-    session.add(target)
-    session.commit()
-    session.refresh(target)
-    return target
+    return persist(session, target)
 
 
+@transactional
 def update_guide(
     session: Session,
     admin: User,
@@ -172,6 +175,7 @@ def update_guide(
     return save_guide(session, guide)
 
 
+@transactional
 def delete_guide(session: Session, admin: User, guide_id: int) -> None:
     if admin.role != "admin":
         raise AuthorizationError("role_required_admin")
@@ -179,4 +183,3 @@ def delete_guide(session: Session, admin: User, guide_id: int) -> None:
     if not guide:
         raise ValidationError("guide_not_found")
     session.delete(guide)
-    session.commit()
@@ -9,10 +9,13 @@ from app.repositories.application_repo import (
     get_application,
     save_application,
 )
+from app.repositories.unit_of_work import transactional
 from app.services.event_service import get_event_for_organizer
+from app.services.feed_service import drop_from_feed, refresh_feed_for_stallholder
 from app.services.notification_service import create_notification
 
 
+@transactional
 def apply_to_event(
     session: Session, event: Event, stallholder: User, memo: str | None
 ) -> Application:
@@ -34,6 +37,7 @@ def apply_to_event(
         updated_at=datetime.now(timezone.utc),
     )
     application = save_application(session, application)
+    drop_from_feed(session, stallholder.id, event.id)
 
     organizer = session.get(User, event.organizer_id)
     if organizer:
@@ -49,6 +53,7 @@ def apply_to_event(
     return application
 
 
+@transactional
 def decide_application(
     session: Session, organizer: User, application_id: int, approved: bool
 ) -> Application:
@@ -65,6 +70,9 @@ def decide_application(
     application.decided_at = datetime.now(timezone.utc)
     application.updated_at = datetime.now(timezone.utc)
     application = save_application(session, application)
+    if approved:
+        # 承認履歴（地域・主催者）がスコアに効く
+        refresh_feed_for_stallholder(session, application.stallholder_id)
 
     stallholder = session.get(User, application.stallholder_id)
     if stallholder:
@@ -80,6 +88,7 @@ def decide_application(
     return application
 
 
+@transactional
 def cancel_application(
     session: Session, stallholder: User, application_id: int
 ) -> Application:
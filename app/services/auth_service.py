@@ -8,12 +8,14 @@ from app.repositories.profile_repo import (
     save_organizer_profile,
     save_stallholder_profile,
 )
+from app.repositories.unit_of_work import transactional
 from app.repositories.user_repo import get_user_by_email, save_user
 from app.security import hash_password, verify_password
 
 ALLOWED_ROLES = {"stallholder", "organizer", "admin"}
 
 
+@transactional
 def register_user(
     session: Session, email: str | None, password: str, role: str, allow_admin: bool = False
 ) -> User:
@@ -66,6 +68,7 @@ def register_user(
     return user
 
 
+@transactional
 def authenticate_user(session: Session, email: str, password: str) -> User:
     user = get_user_by_email(session, email)
     if not user or not verify_password(password, user.hashed_password):
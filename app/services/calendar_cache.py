@@ -0,0 +1,95 @@
+"""出店者ダッシュボードの月間カレンダー（日ごとの募集中イベント件数）のキャッシュ
+
+(月, 地域, ジャンル) ごとに日別件数を LRU + TTL で保持する。
+イベントの変更が COMMIT されたら、変更前または変更後の開催期間がその月に掛かり、
+地域・ジャンルが一致するエントリだけを破棄する。
+他のワーカーでの変更は TTL が経過するまで反映されない。
+"""
+
+import calendar
+from dataclasses import dataclass, field
+from datetime import MAXYEAR, MINYEAR, date, timedelta
+
+from sqlmodel import Session
+
+from app.db import env_int
+from app.repositories.event_changes import EventChange, matches_any_change, on_event_commit
+from app.services.ttl_cache import TTLCache
+
+# 週は日曜始まり
+_CALENDAR = calendar.Calendar(firstweekday=calendar.SUNDAY)
+
+# 前後の月と週の端の日を date で表せるよう、範囲の両端の年は表示しない
+FIRST_MONTH = date(MINYEAR + 1, 1, 1)
+LAST_MONTH = date(MAXYEAR - 1, 12, 1)
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def month_end(value: date) -> date:
+    return value.replace(day=calendar.monthrange(value.year, value.month)[1])
+
+
+@dataclass(frozen=True)
+class MonthKey:
+    month: date
+    region: str | None = None
+    genre: str | None = None
+
+    @classmethod
+    def build(cls, month: date, region: str | None, genre: str | None) -> "MonthKey":
+        return cls(
+            month=min(max(month_start(month), FIRST_MONTH), LAST_MONTH),
+            region=(region or "").strip() or None,
+            genre=(genre or "").strip() or None,
+        )
+
+    def matches(self, snapshot: dict | None) -> bool:
+        """イベントの状態がこの月の件数に数えられ得るか"""
+        if not snapshot or snapshot["status"] != "open":
+            return False
+        if self.region and snapshot["region"] != self.region:
+            return False
+        if self.genre and snapshot["genre"] != self.genre:
+            return False
+        start, end = snapshot["start_date"].date(), snapshot["end_date"].date()
+        return start <= month_end(self.month) and end >= self.month
+
+
+@dataclass(frozen=True)
+class MonthCalendar:
+    month: date
+    counts: dict[date, int] = field(default_factory=dict)
+
+    @property
+    def previous_month(self) -> date:
+        return month_start(self.month - timedelta(days=1))
+
+    @property
+    def next_month(self) -> date:
+        return month_end(self.month) + timedelta(days=1)
+
+    def weeks(self) -> list[list[date | None]]:
+        """日曜始まりの週ごとの日付（前後の月の日は None）"""
+        return [
+            [day if day.month == self.month.month else None for day in week]
+            for week in _CALENDAR.monthdatescalendar(self.month.year, self.month.month)
+        ]
+
+
+class CalendarCache(TTLCache[MonthKey, MonthCalendar]):
+    def invalidate(self, changes: list[EventChange]) -> int:
+        return self.invalidate_where(matches_any_change(changes))
+
+
+calendar_cache = CalendarCache(
+    max_entries=env_int("CALENDAR_CACHE_SIZE", 128),
+    ttl_seconds=env_int("CALENDAR_CACHE_TTL_SECONDS", 60),
+)
+
+
+@on_event_commit
+def _invalidate_calendar_cache(session: Session, changes: list[EventChange]) -> None:
+    calendar_cache.invalidate(changes)
@@ -0,0 +1,421 @@
+"""公開中イベントのプロセス内カタログ（転置索引）
+
+公開中（open）のイベントだけを保持し、地域・ジャンル・開催日ごとの転置リストを
+スロット番号のビット集合（int）で持つ。検索はビット集合の AND / OR で絞り込み、
+(created_at, id) 昇順に並べたスロットの配列（array）から新しい順に取り出す。
+地域・ジャンルの語彙は件数付きの前方一致索引（PrefixIndex）でも持ち、オートコンプリートに使う。
+
+COMMIT されたイベントの変更で差分更新し、他のワーカーでの変更に追従するため
+EVENT_CATALOG_REFRESH_SECONDS ごとにプライマリから作り直す。
+カタログはアプリのエンジンに attach_event_catalog で紐付けたときだけ使われる。
+"""
+
+import asyncio
+import bisect
+import heapq
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Engine
+from sqlmodel import Session, select
+
+from app.db import env_int
+from app.models import Event
+from app.repositories.event_changes import EventChange, on_event_commit
+from app.repositories.event_day_repo import event_days
+from app.repositories.facet_repo import FACETS
+from app.repositories.pagination import (
+    DEFAULT_PAGE_SIZE,
+    Page,
+    build_page,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+)
+from app.services.prefix_index import PrefixIndex
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEvent:
+    id: int
+    title: str
+    region: str
+    genre: str
+    venue_address: str
+    start_date: datetime
+    end_date: datetime
+    application_deadline: datetime
+    capacity: int
+    created_at: datetime
+    status: str = "open"
+
+    @classmethod
+    def from_values(cls, event_id: int, values) -> "CatalogEvent":
+        if isinstance(values, dict):
+            data = {name: values[name] for name in CATALOG_FIELDS}
+        else:
+            data = {name: getattr(values, name) for name in CATALOG_FIELDS}
+        for name in ("start_date", "end_date", "application_deadline", "created_at"):
+            data[name] = _naive(data[name])
+        # 地域・ジャンルは値の種類が少ないため、行ごとに別の文字列を持たない
+        data["region"], data["genre"] = sys.intern(data["region"]), sys.intern(data["genre"])
+        return cls(id=event_id, **data)
+
+    @property
+    def sort_key(self) -> tuple[datetime, int]:
+        return self.created_at, self.id
+
+
+CATALOG_FIELDS = tuple(
+    field.name for field in fields(CatalogEvent) if field.name not in ("id", "status")
+)
+
+
+def _naive(value: datetime) -> datetime:
+    # SQLite と同じくタイムゾーンを落とし、DB から読んだ値と flush 直後の値を比較できるようにする
+    return value.replace(tzinfo=None)
+
+
+def _sort_key(event: CatalogEvent) -> tuple[datetime, int]:
+    return event.sort_key
+
+
+def _cursor_key(cursor: str | None) -> tuple[datetime, int] | None:
+    key = decode_cursor(cursor)
+    return None if key is None else (_naive(key[0]), key[1])
+
+
+def _keys(event: CatalogEvent) -> list[tuple[str, object]]:
+    return [("region", event.region), ("genre", event.genre)] + [
+        ("day", day) for day in event_days(event.start_date, event.end_date)
+    ]
+
+
+def _values(values: str | Sequence[str] | None) -> list[str]:
+    if isinstance(values, str) or values is None:
+        values = [values]
+    return list(dict.fromkeys(value for value in values if value))
+
+
+class EventCatalog:
+    def __init__(
+        self,
+        bind: Engine,
+        refresh_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.bind = bind
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._loaded_at: float | None = None
+        self._replay: list[EventChange] | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._slots: dict[int, int] = {}
+        self._entries: list[CatalogEvent | None] = []
+        self._free: list[int] = []
+        self._postings: dict[tuple[str, object], int] = {}
+        self._all = 0
+        # (created_at, id) の昇順に並べたスロット番号
+        self._order = array("q")
+        # 地域・ジャンルの語彙と公開中の件数（オートコンプリート用）
+        self._vocabularies = {facet: PrefixIndex() for facet in FACETS}
+
+    # --- 更新 ---
+
+    def _order_key(self, slot: int) -> tuple[datetime, int]:
+        return self._entries[slot].sort_key
+
+    def _add(self, event: CatalogEvent) -> None:
+        if event.id in self._slots:
+            self._remove(event.id)
+        slot = self._free.pop() if self._free else len(self._entries)
+        if slot == len(self._entries):
+            self._entries.append(event)
+        else:
+            self._entries[slot] = event
+        self._slots[event.id] = slot
+        bit = 1 << slot
+        self._all |= bit
+        for key in _keys(event):
+            self._postings[key] = self._postings.get(key, 0) | bit
+        self._count_facets(event, 1)
+        position = bisect.bisect_left(self._order, event.sort_key, key=self._order_key)
+        self._order.insert(position, slot)
+
+    def _remove(self, event_id: int) -> None:
+        slot = self._slots.pop(event_id, None)
+        if slot is None:
+            return
+        event = self._entries[slot]
+        position = bisect.bisect_left(self._order, event.sort_key, key=self._order_key)
+        del self._order[position]
+        bit = 1 << slot
+        self._all &= ~bit
+        for key in _keys(event):
+            remaining = self._postings[key] & ~bit
+            if remaining:
+                self._postings[key] = remaining
+            else:
+                del self._postings[key]
+        self._count_facets(event, -1)
+        self._entries[slot] = None
+        self._free.append(slot)
+
+    def _count_facets(self, event: CatalogEvent, delta: int) -> None:
+        for facet, vocabulary in self._vocabularies.items():
+            value = getattr(event, facet)
+            if value:
+                vocabulary.add(value, delta)
+
+    def _apply(self, change: EventChange) -> None:
+        if change.after is not None and change.after["status"] == "open":
+            self._add(CatalogEvent.from_values(change.event_id, change.after))
+        else:
+            self._remove(change.event_id)
+
+    def apply(self, changes: list[EventChange]) -> None:
+        with self._lock:
+            if self._replay is not None:
+                self._replay.extend(changes)
+            if self._loaded_at is None:
+                return
+            for change in changes:
+                self._apply(change)
+
+    def load(self, events: Iterable[CatalogEvent]) -> None:
+        with self._lock:
+            self._reset()
+            for event in sorted(events, key=lambda event: event.sort_key):
+                self._add(event)
+            self._loaded_at = self._clock()
+
+    def _read_open_events(self) -> list[CatalogEvent]:
+        columns = [Event.id, *(getattr(Event, name) for name in CATALOG_FIELDS)]
+        with Session(self.bind) as session:
+            rows = session.exec(select(*columns).where(Event.status == "open")).all()
+        return [CatalogEvent.from_values(row.id, row) for row in rows]
+
+    def refresh(self) -> None:
+        """プライマリから作り直す。読み込み中に届いた変更は作り直した後に当て直す"""
+        with self._refresh_lock:
+            with self._lock:
+                self._replay = []
+            try:
+                events = self._read_open_events()
+            except Exception:
+                with self._lock:
+                    self._replay = None
+                raise
+            self.load(events)
+            with self._lock:
+                replay, self._replay = self._replay, None
+                for change in replay:
+                    self._apply(change)
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or self._clock() - self._loaded_at >= self.refresh_seconds
+
+    def ensure_fresh(self) -> None:
+        if not self.is_stale():
+            return
+        # 作り直し中は（読み込み済みなら）古いカタログで応答する
+        if self._loaded_at is not None and self._refresh_lock.locked():
+            return
+        self.refresh()
+
+    async def ensure_fresh_async(self) -> None:
+        if self.is_stale():
+            await asyncio.to_thread(self.ensure_fresh)
+
+    # --- 検索 ---
+
+    def _any_of(self, facet: str, values: list) -> int:
+        bits = 0
+        for value in values:
+            bits |= self._postings.get((facet, value), 0)
+        return bits
+
+    def _matching(
+        self,
+        region: str | Sequence[str] | None,
+        genre: str | Sequence[str] | None,
+        date_value: date | None,
+        date_until: date | None,
+    ) -> int:
+        bits = self._all
+        regions, genres = _values(region), _values(genre)
+        if regions:
+            bits &= self._any_of("region", regions)
+        if genres:
+            bits &= self._any_of("genre", genres)
+        if bits and (date_value or date_until):
+            start, end = date_value or date_until, date_until or date_value
+            if end < start:
+                start, end = end, start
+            days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+            bits &= self._any_of("day", days)
+        return bits
+
+    def _collect(
+        self,
+        bits: int,
+        count: int | None = None,
+        after_key: tuple[datetime, int] | None = None,
+        before_key: tuple[datetime, int] | None = None,
+    ) -> list[CatalogEvent]:
+        """一致するイベントを取り出す。before_key があればその直後から古い順、なければ新しい順"""
+        hits = bits.bit_count()
+        if not hits:
+            return []
+        total = len(self._order)
+        newest = before_key is None
+        if newest:
+            end = total
+            if after_key is not None:
+                end = bisect.bisect_left(self._order, after_key, key=self._order_key)
+            positions = range(end - 1, -1, -1)
+        else:
+            start = bisect.bisect_right(self._order, before_key, key=self._order_key)
+            positions = range(start, total)
+        # 並び順の配列を読む件数の見積もり（一致が一様に散らばっているとみなす）
+        scan = len(positions) if count is None else min(len(positions), count * total // hits)
+        if hits * 4 < scan:
+            return self._extract(bits, count, after_key, before_key)
+        # 大きな int のシフトは桁数に比例するため、1 ビットずつの判定はバイト列で行う
+        mask = bits.to_bytes((len(self._entries) + 7) // 8, "little")
+        rows = []
+        for position in positions:
+            slot = self._order[position]
+            if mask[slot >> 3] >> (slot & 7) & 1:
+                rows.append(self._entries[slot])
+                if len(rows) == count:
+                    break
+        return rows
+
+    def _extract(self, bits: int, count: int | None, after_key, before_key) -> list[CatalogEvent]:
+        # 一致が少ないときは立っているビットの位置から直接取り出して並べる
+        digits = bin(bits)[:1:-1]
+        found = []
+        slot = digits.find("1")
+        while slot >= 0:
+            event = self._entries[slot]
+            if (after_key is None or event.sort_key < after_key) and (
+                before_key is None or event.sort_key > before_key
+            ):
+                found.append(event)
+            slot = digits.find("1", slot + 1)
+        newest = before_key is None
+        if count is None:
+            return sorted(found, key=_sort_key, reverse=newest)
+        select_rows = heapq.nlargest if newest else heapq.nsmallest
+        return select_rows(count, found, key=_sort_key)
+
+    def search(
+        self,
+        region: str | Sequence[str] | None,
+        genre: str | Sequence[str] | None,
+        date_value: date | None,
+        date_until: date | None = None,
+    ) -> list[CatalogEvent]:
+        with self._lock:
+            bits = self._matching(region, genre, date_value, date_until)
+            return self._collect(bits)
+
+    def page(
+        self,
+        region: str | Sequence[str] | None,
+        genre: str | Sequence[str] | None,
+        date_value: date | None,
+        date_until: date | None = None,
+        after: str | None = None,
+        before: str | None = None,
+        limit: int | None = DEFAULT_PAGE_SIZE,
+    ) -> Page[CatalogEvent]:
+        """search_events_page と同じ (created_at, id) のキーセットでページングする"""
+        after_key, before_key = _cursor_key(after), _cursor_key(before)
+        if after_key is not None:
+            before_key = None
+        limit = clamp_limit(limit)
+        with self._lock:
+            bits = self._matching(region, genre, date_value, date_until)
+            rows = self._collect(bits, limit + 1, after_key, before_key)
+        return build_page(
+            rows,
+            lambda event: encode_cursor(event.created_at, event.id),
+            limit,
+            after_key,
+            before_key,
+        )
+
+    def suggest(self, facet: str, prefix: str, limit: int) -> list[tuple[str, int]]:
+        with self._lock:
+            return self._vocabularies[facet].suggest(prefix, limit)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entry_bytes = sum(
+                sys.getsizeof(event)
+                + sum(sys.getsizeof(getattr(event, name)) for name in CATALOG_FIELDS)
+                for event in self._entries
+                if event is not None
+            )
+            posting_bytes = sum(
+                sys.getsizeof(key) + sys.getsizeof(bits) for key, bits in self._postings.items()
+            )
+            index_bytes = (
+                sys.getsizeof(self._postings)
+                + sys.getsizeof(self._slots)
+                + sys.getsizeof(self._entries)
+                + sys.getsizeof(self._order)
+            )
+            return {
+                "events": len(self._slots),
+                "postings": len(self._postings),
+                "entry_bytes": entry_bytes,
+                "index_bytes": posting_bytes + index_bytes,
+                "age_seconds": None
+                if self._loaded_at is None
+                else round(self._clock() - self._loaded_at, 1),
+            }
+
+
+_catalogs: dict[Engine, EventCatalog] = {}
+
+
+def attach_event_catalog(primary: Engine, *aliases: Engine | None) -> EventCatalog:
+    """primary とその別名（非同期エンジンの同期側・レプリカなど）で検索するときにカタログを使う"""
+    catalog = _catalogs.get(primary) or EventCatalog(
+        primary, env_int("EVENT_CATALOG_REFRESH_SECONDS", 60)
+    )
+    for bind in (primary, *aliases):
+        if bind is not None:
+            _catalogs[bind] = catalog
+    return catalog
+
+
+def detach_event_catalogs() -> None:
+    _catalogs.clear()
+
+
+def catalog_for(bind) -> EventCatalog | None:
+    return _catalogs.get(bind)
+
+
+def catalogs() -> list[EventCatalog]:
+    return list(dict.fromkeys(_catalogs.values()))
+
+
+@on_event_commit
+def _update_event_catalog(session: Session, changes: list[EventChange]) -> None:
+    catalog = catalog_for(session.get_bind())
+    if catalog is not None:
+        catalog.apply(changes)
@@ -1,12 +1,70 @@
+from collections.abc import Sequence
 from datetime import date, datetime, timezone
 
-from sqlalchemy import func
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.errors import AuthorizationError, ValidationError
 from app.models import Event, User
-from app.repositories.event_repo import save_event
-from app.services.notification_service import create_notification
+from app.repositories.event_day_repo import (
+    count_open_events_by_day,
+    count_open_events_by_day_async,
+    running_on,
+    status_hint,
+)
+from app.repositories.event_geo_repo import GeoRadius, geo_index_available, within_radius
+from app.repositories.event_repo import (
+    list_events_by_ids,
+    list_events_by_ids_async,
+    save_event,
+)
+from app.repositories.event_search_repo import (
+    apply_keyword_filter,
+    event_fts,
+    fts_available,
+    split_keyword,
+)
+from app.repositories.facet_repo import FACETS, suggest_facet_values, suggest_facet_values_async
+from app.repositories.pagination import (
+    DEFAULT_PAGE_SIZE,
+    Page,
+    paginate,
+    paginate_async,
+    paginate_ranked,
+    paginate_ranked_async,
+)
+from app.repositories.unit_of_work import transactional
+from app.services.calendar_cache import (
+    MonthCalendar,
+    MonthKey,
+    calendar_cache,
+    month_end,
+)
+from app.services.event_catalog import CatalogEvent, catalog_for
+from app.services.notification_service import create_notifications_bulk
+from app.services.search_cache import SearchKey, search_cache
+
+# JSON API の並び順: キー → (並び替え列, 新しい順か)
+EVENT_SORTS = {
+    "created_at": (Event.created_at, True),
+    "start_date": (Event.start_date, False),
+    "deadline": (Event.application_deadline, False),
+}
+
+EVENT_SUMMARY_COLUMNS = (
+    Event.id,
+    Event.title,
+    Event.region,
+    Event.genre,
+    Event.venue_address,
+    Event.start_date,
+    Event.end_date,
+    Event.application_deadline,
+    Event.capacity,
+    Event.latitude,
+    Event.longitude,
+    Event.created_at,
+)
 
 
 def _validate_event_fields(
@@ -26,6 +84,13 @@ def _validate_event_fields(
         raise ValidationError("deadline_invalid")
 
 
+def _validate_location(latitude: float | None, longitude: float | None) -> None:
+    if (latitude is None) != (longitude is None):
+        raise ValidationError("location_incomplete")
+    if latitude is not None and not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValidationError("location_invalid")
+
+
 def get_event_for_organizer(session: Session, organizer: User, event_id: int) -> Event:
     if organizer.role != "organizer":
         raise AuthorizationError("role_required_organizer")
@@ -37,6 +102,7 @@ def get_event_for_organizer(session: Session, organizer: User, event_id: int) ->
     return event
 
 
+@transactional
 def create_event(
     session: Session,
     organizer: User,
@@ -49,10 +115,13 @@ def create_event(
     end_date: datetime,
     application_deadline: datetime,
     capacity: int,
+    latitude: float | None = None,
+    longitude: float | None = None,
 ) -> Event:
     if organizer.role != "organizer":
         raise AuthorizationError("role_required_organizer")
     _validate_event_fields(title, capacity, start_date, end_date, application_deadline)
+    _validate_location(latitude, longitude)
 
     event = Event(
         organizer_id=organizer.id,
@@ -65,6 +134,8 @@ def create_event(
         end_date=end_date,
         application_deadline=application_deadline,
         capacity=capacity,
+        latitude=latitude,
+        longitude=longitude,
         status="draft",
         created_at=datetime.now(timezone.utc),
         updated_at=datetime.now(timezone.utc),
@@ -72,6 +143,7 @@ def create_event(
     return save_event(session, event)
 
 
+@transactional
 def update_event(
     session: Session,
     organizer: User,
@@ -85,12 +157,15 @@ def update_event(
     end_date: datetime,
     application_deadline: datetime,
     capacity: int,
+    latitude: float | None = None,
+    longitude: float | None = None,
 ) -> Event:
     event = get_event_for_organizer(session, organizer, event_id)
     if event.status != "draft":
         raise ValidationError("event_not_editable")
 
     _validate_event_fields(title, capacity, start_date, end_date, application_deadline)
+    _validate_location(latitude, longitude)
 
     event.title = title
     event.description = description
@@ -101,34 +176,32 @@ def update_event(
     event.end_date = end_date
     event.application_deadline = application_deadline
     event.capacity = capacity
+    event.latitude = latitude
+    event.longitude = longitude
     event.updated_at = datetime.now(timezone.utc)
     event = save_event(session, event)
 
     if event.status == "open":
         from app.models import Application
 
-        applications = list(
-            session.exec(
-                select(Application).where(
-                    Application.event_id == event.id, Application.status == "approved"
-                )
-            ).all()
+        stallholder_ids = session.exec(
+            select(Application.stallholder_id)
+            .join(User, User.id == Application.stallholder_id)
+            .where(Application.event_id == event.id, Application.status == "approved")
+        ).all()
+        create_notifications_bulk(
+            session,
+            stallholder_ids,
+            event_type="event_updated",
+            title="イベント情報が更新されました",
+            body=f"イベント「{event.title}」の情報が更新されました。",
+            related_type="event",
+            related_id=event.id,
         )
-        for app in applications:
-            stallholder = session.get(User, app.stallholder_id)
-            if stallholder:
-                create_notification(
-                    session,
-                    stallholder,
-                    event_type="event_updated",
-                    title="イベント情報が更新されました",
-                    body=f"イベント「{event.title}」の情報が更新されました。",
-                    related_type="event",
-                    related_id=event.id,
-                )
     return event
 
 
+@transactional
 def submit_event_for_review(
     session: Session, organizer: User, event_id: int
 ) -> Event:
@@ -140,16 +213,323 @@ def submit_event_for_review(
     return save_event(session, event)
 
 
+def _matches_any(column, values: str | Sequence[str] | None):
+    if isinstance(values, str) or values is None:
+        values = [values]
+    values = list(dict.fromkeys(value for value in values if value))
+    if not values:
+        return None
+    return column == values[0] if len(values) == 1 else column.in_(values)
+
+
+def _search_conditions(
+    region: str | Sequence[str] | None,
+    genre: str | Sequence[str] | None,
+    date_value: date | None,
+    date_until: date | None = None,
+    near: GeoRadius | None = None,
+    use_geo_index: bool = True,
+) -> list:
+    if date_value or date_until or near:
+        conditions = [status_hint(Event.status == "open")]
+        if date_value or date_until:
+            conditions.append(running_on(date_value or date_until, date_until))
+        if near:
+            conditions.extend(within_radius(near, use_geo_index))
+    else:
+        conditions = [Event.status == "open"]
+    for column, values in ((Event.region, region), (Event.genre, genre)):
+        condition = _matches_any(column, values)
+        if condition is not None:
+            conditions.append(condition)
+    return conditions
+
+
+def _search_statement(
+    region: str | Sequence[str] | None,
+    genre: str | Sequence[str] | None,
+    date_value: date | None,
+    date_until: date | None = None,
+    near: GeoRadius | None = None,
+    use_geo_index: bool = True,
+):
+    conditions = _search_conditions(region, genre, date_value, date_until, near, use_geo_index)
+    return select(Event).where(*conditions)
+
+
+def _event_ids(events: list[CatalogEvent]) -> list[int]:
+    return [event.id for event in events]
+
+
+def _with_items(page: Page, items: list[Event]) -> Page[Event]:
+    return Page(items=items, next_cursor=page.next_cursor, prev_cursor=page.prev_cursor)
+
+
 def search_events(
-    session: Session, region: str | None, genre: str | None, date_value: date | None
+    session: Session,
+    region: str | None,
+    genre: str | None,
+    date_value: date | None,
+    date_until: date | None = None,
+    near: GeoRadius | None = None,
 ) -> list[Event]:
-    statement = select(Event).where(Event.status == "open")
-    if region:
-        statement = statement.where(Event.region == region)
-    if genre:
-        statement = statement.where(Event.genre == genre)
-    if date_value:
-        statement = statement.where(func.date(Event.start_date) <= date_value).where(
-            func.date(Event.end_date) >= date_value
-        )
+    catalog = catalog_for(session.get_bind())
+    if catalog is not None and near is None:
+        # 絞り込みはカタログで行い、一致したイベントは主キーで読み直す
+        catalog.ensure_fresh()
+        matched = catalog.search(region, genre, date_value, date_until)
+        return list_events_by_ids(session, _event_ids(matched))
+    statement = _search_statement(
+        region, genre, date_value, date_until, near, geo_index_available(session.get_bind())
+    )
     return list(session.exec(statement).all())
+
+
+async def search_events_async(
+    session: AsyncSession,
+    region: str | None,
+    genre: str | None,
+    date_value: date | None,
+    date_until: date | None = None,
+    near: GeoRadius | None = None,
+) -> list[Event]:
+    catalog = catalog_for(session.get_bind())
+    if catalog is not None and near is None:
+        await catalog.ensure_fresh_async()
+        matched = catalog.search(region, genre, date_value, date_until)
+        return await list_events_by_ids_async(session, _event_ids(matched))
+    statement = _search_statement(
+        region, genre, date_value, date_until, near, geo_index_available(session.get_bind())
+    )
+    return list((await session.exec(statement)).all())
+
+
+def _keyword_search_page(
+    session: Session,
+    statement,
+    keyword: str | None,
+    after: str | None,
+    before: str | None,
+    limit: int,
+) -> Page[Event]:
+    statement, ranked = apply_keyword_filter(
+        statement, split_keyword(keyword), fts_available(session.get_bind())
+    )
+    if ranked:
+        return paginate_ranked(session, statement, event_fts.c.rank, Event.id, after, before, limit)
+    return paginate(session, statement, Event.created_at, Event.id, after, before, limit)
+
+
+async def _keyword_search_page_async(
+    session: AsyncSession,
+    statement,
+    keyword: str | None,
+    after: str | None,
+    before: str | None,
+    limit: int,
+) -> Page[Event]:
+    statement, ranked = apply_keyword_filter(
+        statement, split_keyword(keyword), fts_available(session.get_bind())
+    )
+    if ranked:
+        return await paginate_ranked_async(
+            session, statement, event_fts.c.rank, Event.id, after, before, limit
+        )
+    return await paginate_async(
+        session, statement, Event.created_at, Event.id, after, before, limit
+    )
+
+
+def search_events_page(
+    session: Session,
+    region: str | None,
+    genre: str | None,
+    date_value: date | None,
+    date_until: date | None = None,
+    keyword: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    near: GeoRadius | None = None,
+) -> Page[Event]:
+    catalog = catalog_for(session.get_bind())
+    if catalog is not None and near is None and not split_keyword(keyword):
+        catalog.ensure_fresh()
+        page = catalog.page(region, genre, date_value, date_until, after, before, limit)
+        return _with_items(page, list_events_by_ids(session, _event_ids(page.items)))
+    statement = _search_statement(
+        region, genre, date_value, date_until, near, geo_index_available(session.get_bind())
+    )
+    return _keyword_search_page(session, statement, keyword, after, before, limit)
+
+
+async def search_events_page_async(
+    session: AsyncSession,
+    region: str | None,
+    genre: str | None,
+    date_value: date | None,
+    date_until: date | None = None,
+    keyword: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    near: GeoRadius | None = None,
+) -> Page[Event]:
+    catalog = catalog_for(session.get_bind())
+    if catalog is not None and near is None and not split_keyword(keyword):
+        await catalog.ensure_fresh_async()
+        page = catalog.page(region, genre, date_value, date_until, after, before, limit)
+        return _with_items(page, await list_events_by_ids_async(session, _event_ids(page.items)))
+    statement = _search_statement(
+        region, genre, date_value, date_until, near, geo_index_available(session.get_bind())
+    )
+    return await _keyword_search_page_async(session, statement, keyword, after, before, limit)
+
+
+async def search_events_page_cached_async(
+    session: AsyncSession,
+    region: str | None,
+    genre: str | None,
+    date_value: date | None,
+    date_until: date | None = None,
+    keyword: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Event]:
+    """出店者ダッシュボード用: 検索結果の ID 列をキャッシュし、ヒット時は主キーで読み直す
+
+    キーワードなしの検索はイベントカタログが使えればそちらで答える（キャッシュ不要）
+    """
+    key = SearchKey.build(region, genre, date_value, date_until, keyword, after, before, limit)
+    if key.keyword is None and catalog_for(session.get_bind()) is not None:
+        return await search_events_page_async(
+            session,
+            region=key.region,
+            genre=key.genre,
+            date_value=key.date_from,
+            date_until=key.date_until,
+            after=key.after,
+            before=key.before,
+            limit=key.limit,
+        )
+    cached = search_cache.get(key)
+    if cached is not None:
+        events = await list_events_by_ids_async(session, cached.ids)
+        return Page(items=events, next_cursor=cached.next_cursor, prev_cursor=cached.prev_cursor)
+    generation = search_cache.generation()
+    page = await search_events_page_async(
+        session,
+        region=key.region,
+        genre=key.genre,
+        date_value=key.date_from,
+        date_until=key.date_until,
+        keyword=key.keyword,
+        after=key.after,
+        before=key.before,
+        limit=key.limit,
+    )
+    search_cache.put(key, page, generation)
+    return page
+
+
+def event_calendar(
+    session: Session, month: date, region: str | None = None, genre: str | None = None
+) -> MonthCalendar:
+    """月間カレンダー: 月内の各日に開催している募集中イベントの件数を 1 回の集計で求める"""
+    key = MonthKey.build(month, region, genre)
+    cached = calendar_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = calendar_cache.generation()
+    counts = count_open_events_by_day(
+        session, key.month, month_end(key.month), key.region, key.genre
+    )
+    result = MonthCalendar(key.month, counts)
+    calendar_cache.put(key, result, generation)
+    return result
+
+
+async def event_calendar_async(
+    session: AsyncSession, month: date, region: str | None = None, genre: str | None = None
+) -> MonthCalendar:
+    key = MonthKey.build(month, region, genre)
+    cached = calendar_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = calendar_cache.generation()
+    counts = await count_open_events_by_day_async(
+        session, key.month, month_end(key.month), key.region, key.genre
+    )
+    result = MonthCalendar(key.month, counts)
+    calendar_cache.put(key, result, generation)
+    return result
+
+
+SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+
+
+def _check_facet(facet: str, limit: int) -> int:
+    if facet not in FACETS:
+        raise ValidationError("invalid_facet")
+    return max(1, min(limit, MAX_SUGGEST_LIMIT))
+
+
+def suggest_facet(
+    session: Session, facet: str, prefix: str, limit: int = SUGGEST_LIMIT
+) -> list[tuple[str, int]]:
+    """公開中イベントの地域・ジャンルを前方一致で、件数の多い順に返す"""
+    limit = _check_facet(facet, limit)
+    catalog = catalog_for(session.get_bind())
+    if catalog is not None:
+        catalog.ensure_fresh()
+        return catalog.suggest(facet, prefix.strip(), limit)
+    return suggest_facet_values(session, facet, prefix.strip(), limit)
+
+
+async def suggest_facet_async(
+    session: AsyncSession, facet: str, prefix: str, limit: int = SUGGEST_LIMIT
+) -> list[tuple[str, int]]:
+    limit = _check_facet(facet, limit)
+    catalog = catalog_for(session.get_bind())
+    if catalog is not None:
+        await catalog.ensure_fresh_async()
+        return catalog.suggest(facet, prefix.strip(), limit)
+    return await suggest_facet_values_async(session, facet, prefix.strip(), limit)
+
+
+async def search_event_summaries_async(
+    session: AsyncSession,
+    regions: Sequence[str] | None = None,
+    genres: Sequence[str] | None = None,
+    date_value: date | None = None,
+    date_until: date | None = None,
+    sort: str = "created_at",
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    near: GeoRadius | None = None,
+) -> Page:
+    """JSON API 用: ORM オブジェクトを作らず、一覧に必要な列だけを指定の並び順で読む"""
+    if sort not in EVENT_SORTS:
+        raise ValidationError("invalid_sort")
+    sort_column, descending = EVENT_SORTS[sort]
+    conditions = _search_conditions(
+        regions, genres, date_value, date_until, near, geo_index_available(session.get_bind())
+    )
+    statement = select(*EVENT_SUMMARY_COLUMNS).where(*conditions)
+    return await paginate_async(
+        session, statement, sort_column, Event.id, after, before, limit, descending=descending
+    )
+
+
+def search_all_events_by_keyword(
+    session: Session,
+    keyword: str,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Event]:
+    """管理画面用: 状態を問わずキーワードでイベントを探す"""
+    return _keyword_search_page(session, select(Event), keyword, after, before, limit)
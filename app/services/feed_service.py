@@ -0,0 +1,49 @@
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Event, StallholderProfile, User
+from app.repositories.feed_repo import (
+    FEED_SIZE,
+    list_feed_events,
+    list_feed_events_async,
+    refresh_stallholder_feeds,
+    remove_feed_entry,
+)
+from app.repositories.unit_of_work import unit_of_work
+
+RECOMMENDED_LIMIT = 6
+# 定期バッチで 1 トランザクションに含める出店者数（書き込みロックを長く持たない）
+REBUILD_CHUNK_SIZE = 20
+
+
+def rebuild_event_feed(session: Session, chunk_size: int = REBUILD_CHUNK_SIZE) -> int:
+    """全出店者のおすすめを作り直し、出店者数を返す（主催者の評価の反映など、定期バッチ用）"""
+    statement = select(StallholderProfile.user_id).order_by(StallholderProfile.user_id)
+    stallholder_ids = list(session.exec(statement).all())
+    for start in range(0, len(stallholder_ids), chunk_size):
+        with unit_of_work(session):
+            refresh_stallholder_feeds(
+                session.connection(), stallholder_ids[start : start + chunk_size]
+            )
+    return len(stallholder_ids)
+
+
+def refresh_feed_for_stallholder(session: Session, stallholder_id: int) -> None:
+    refresh_stallholder_feeds(session.connection(), [stallholder_id])
+
+
+def drop_from_feed(session: Session, stallholder_id: int, event_id: int) -> None:
+    remove_feed_entry(session.connection(), stallholder_id, event_id)
+
+
+def recommended_events(
+    session: Session, stallholder: User, limit: int = RECOMMENDED_LIMIT
+) -> list[Event]:
+    """保存済みのおすすめ上位を読むだけで、リクエストごとにスコアは計算しない"""
+    return list_feed_events(session, stallholder.id, max(1, min(limit, FEED_SIZE)))
+
+
+async def recommended_events_async(
+    session: AsyncSession, stallholder: User, limit: int = RECOMMENDED_LIMIT
+) -> list[Event]:
+    return await list_feed_events_async(session, stallholder.id, max(1, min(limit, FEED_SIZE)))
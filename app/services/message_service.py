@@ -4,10 +4,13 @@ from sqlmodel import Session
 
 from app.errors import ValidationError
 from app.models import Application, Event, Message, User
-from app.repositories.message_repo import save_message
+from app.repositories.message_repo import mark_received_messages_read, save_message
+from app.repositories.unit_of_work import transactional
+from app.repositories.unread_repo import add_unread
 from app.services.notification_service import create_notification
 
 
+@transactional
 def send_message(
     session: Session, application: Application, sender: User, content: str
 ) -> Message:
@@ -33,6 +36,7 @@ def send_message(
     if recipient_id:
         recipient = session.get(User, recipient_id)
         if recipient:
+            add_unread(session, "messages", {recipient.id: 1})
             create_notification(
                 session,
                 recipient,
@@ -43,3 +47,13 @@ def send_message(
                 related_id=message.id,
             )
     return message
+
+
+@transactional
+def mark_messages_read(session: Session, application: Application, reader: User) -> int:
+    """メッセージ画面を開いたユーザーが受け取った未読をまとめて既読にする"""
+    count = mark_received_messages_read(
+        session, application.id, reader.id, datetime.now(timezone.utc)
+    )
+    add_unread(session, "messages", {reader.id: -count})
+    return count
@@ -0,0 +1,229 @@
+"""通知のライブ配信（Server-Sent Events）用のプロセス内 pub/sub
+
+通知の作成・既読は COMMIT 後にこのプロセスの hub へ publish され、
+同じユーザーの接続中のストリームへ届く。
+待機中のストリームはイベントを待つだけで、データベースにもスレッドにも触れない。
+- 受け取りが追いつかない接続は保留を捨てて resync を送って切断し、再接続時の件数で数え直させる
+- 接続数はプロセス全体とユーザーごとに上限を設ける
+- 他のワーカー（プロセス）で作られた通知は届かない（再接続または一覧の再読み込みで反映）
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db import env_int
+from app.errors import TooManyStreamsError
+
+KEEPALIVE_SECONDS = 15
+# 接続を定期的に張り直させ、ログアウトなどの認証の変化を反映する
+STREAM_MAX_SECONDS = 1800
+RETRY_MILLISECONDS = 3000
+
+_PENDING_KEY = "notification_hub_pending"
+
+
+@dataclass(frozen=True)
+class HubMessage:
+    event: str  # notification / read
+    data: dict
+
+
+class Subscription:
+    """1 本のストリーム。publish はどのスレッドからでもよく、受け取りはイベントループ上で行う"""
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, queue_size: int) -> None:
+        self.user_id = user_id
+        self.queue_size = queue_size
+        self.overflowed = False
+        self.closed = False
+        self._loop = loop
+        self._pending: deque[HubMessage] = deque()
+        self._wakeup = asyncio.Event()
+
+    def _deliver(self, message: HubMessage) -> None:
+        if self.overflowed:
+            return
+        if len(self._pending) >= self.queue_size:
+            self._pending.clear()
+            self.overflowed = True
+        else:
+            self._pending.append(message)
+        self._wakeup.set()
+
+    def _close(self) -> None:
+        self.closed = True
+        self._wakeup.set()
+
+    async def next_messages(self, timeout: float) -> list[HubMessage] | None:
+        """届いた通知をまとめて返す。timeout までに何もなければ None"""
+        if not self._pending and not self.overflowed and not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                return None
+        self._wakeup.clear()
+        messages = list(self._pending)
+        self._pending.clear()
+        return messages
+
+
+@dataclass
+class HubStats:
+    published: int = 0
+    delivered: int = 0
+    overflows: int = 0
+    rejected: int = 0
+
+
+class NotificationHub:
+    def __init__(self, max_connections: int, max_per_user: int, queue_size: int) -> None:
+        self.max_connections = max_connections
+        self.max_per_user = max_per_user
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._connections = 0
+        self._stats = HubStats()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """イベントループ上で呼ぶ。上限を超える場合は TooManyStreamsError"""
+        subscription = Subscription(user_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            subscribers = self._subscribers.setdefault(user_id, set())
+            if self._connections >= self.max_connections or len(subscribers) >= self.max_per_user:
+                self._stats.rejected += 1
+                if not subscribers:
+                    del self._subscribers[user_id]
+                raise TooManyStreamsError("too_many_streams")
+            subscribers.add(subscription)
+            self._connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if not subscribers or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+            self._connections -= 1
+        subscription.closed = True
+
+    def publish(self, user_id: int, event_name: str, data: dict) -> int:
+        """接続中のストリームへ渡し、渡した本数を返す（接続がなければ何もしない）"""
+        with self._lock:
+            self._stats.published += 1
+            subscribers = list(self._subscribers.get(user_id, ()))
+        message = HubMessage(event_name, data)
+        delivered = 0
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._deliver, message)
+                delivered += 1
+            except RuntimeError:
+                # イベントループが終了している
+                self.unsubscribe(subscription)
+        with self._lock:
+            self._stats.delivered += delivered
+        return delivered
+
+    def close_all(self) -> None:
+        """シャットダウン時に全ストリームを終わらせる"""
+        with self._lock:
+            subscribers = [sub for subs in self._subscribers.values() for sub in subs]
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._close)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections": self._connections,
+                "users": len(self._subscribers),
+                "max_connections": self.max_connections,
+                "max_per_user": self.max_per_user,
+                "published": self._stats.published,
+                "delivered": self._stats.delivered,
+                "overflows": self._stats.overflows,
+                "rejected": self._stats.rejected,
+            }
+
+    def _record_overflow(self) -> None:
+        with self._lock:
+            self._stats.overflows += 1
+
+
+notification_hub = NotificationHub(
+    max_connections=env_int("NOTIFICATION_STREAM_MAX_CONNECTIONS", 5000),
+    max_per_user=env_int("NOTIFICATION_STREAM_MAX_PER_USER", 5),
+    queue_size=env_int("NOTIFICATION_STREAM_QUEUE_SIZE", 100),
+)
+
+
+def publish_after_commit(session: Session, user_id: int, event_name: str, data: dict) -> None:
+    """COMMIT されたら hub へ publish する（ロールバックされたら捨てる）"""
+    session.info.setdefault(_PENDING_KEY, []).append((user_id, event_name, data))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for user_id, event_name, data in session.info.pop(_PENDING_KEY, ()):
+        notification_hub.publish(user_id, event_name, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _format(event_name: str, data: dict) -> str:
+    return f"event: {event_name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_notifications(
+    subscription: Subscription,
+    unread: int,
+    counted_through: int = 0,
+    hub: NotificationHub = notification_hub,
+    keepalive_seconds: float = KEEPALIVE_SECONDS,
+    max_seconds: float = STREAM_MAX_SECONDS,
+) -> AsyncIterator[str]:
+    """SSE の本文。接続時の未読件数から、届いた通知と既読で件数を数え進める
+
+    counted_through: 未読件数を数えた時点で最も新しい通知の ID（それ以前の通知は数え済み）
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        yield _format("unread", {"unread": unread})
+        while loop.time() < deadline:
+            messages = await subscription.next_messages(keepalive_seconds)
+            if subscription.overflowed:
+                hub._record_overflow()
+                yield _format("resync", {})
+                return
+            if subscription.closed:
+                return
+            if messages is None:
+                yield ": keepalive\n\n"
+                continue
+            for message in messages:
+                if message.event == "notification":
+                    unread += message.data["id"] > counted_through
+                elif message.event == "read":
+                    unread = max(0, unread - len(message.data["ids"]))
+                yield _format(message.event, message.data)
+            yield _format("unread", {"unread": unread})
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,79 @@
+"""保存期間を過ぎた既読通知を notification_archive へ移す定期バッチ
+
+notification は一覧のインデックスごと増え続けるため、既読で配信の終わった古い通知を
+配信の管理列を落としたアーカイブへ移す。小さな単位で COMMIT し、書き込みを長く止めない。
+"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.db import env_int
+from app.repositories.notification_archive_repo import (
+    archive_notifications,
+    list_archivable_ids,
+    notification_storage_bytes,
+)
+from app.repositories.unit_of_work import unit_of_work
+
+NOTIFICATION_RETENTION_DAYS = env_int("NOTIFICATION_RETENTION_DAYS", 90)
+# 1 トランザクションで移す件数（書き込みロックを長く持たない）
+ARCHIVE_CHUNK_SIZE = 500
+
+
+@dataclass
+class CompactionReport:
+    cutoff: datetime
+    moved: int = 0
+    chunks: int = 0
+    max_chunk_ms: float = 0.0
+    # notification の表・インデックスごとの使用バイト数（dbstat が使えなければ None）
+    bytes_before: dict[str, int] | None = None
+    bytes_after: dict[str, int] | None = None
+    elapsed_seconds: float = 0.0
+    saved_bytes: dict[str, int] = field(default_factory=dict)
+
+
+def compact_notifications(
+    session: Session,
+    older_than: timedelta | None = None,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    pause_seconds: float = 0.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> CompactionReport:
+    """older_than（既定は NOTIFICATION_RETENTION_DAYS 日）より古い既読通知をアーカイブへ移す
+
+    pause_seconds: 単位ごとの COMMIT の後に待つ秒数（他の書き込みを先に通す）
+    """
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    if older_than is None:
+        older_than = timedelta(days=NOTIFICATION_RETENTION_DAYS)
+    cutoff = now - older_than
+    report = CompactionReport(cutoff=cutoff)
+    report.bytes_before = notification_storage_bytes(session.connection())
+    session.commit()
+    last_id = 0
+    while ids := list_archivable_ids(session, cutoff, last_id, chunk_size):
+        chunk_started = time.perf_counter()
+        with unit_of_work(session):
+            report.moved += archive_notifications(session.connection(), ids, cutoff, now)
+        report.chunks += 1
+        report.max_chunk_ms = max(
+            report.max_chunk_ms, (time.perf_counter() - chunk_started) * 1000
+        )
+        last_id = ids[-1]
+        if pause_seconds:
+            sleep(pause_seconds)
+    report.bytes_after = notification_storage_bytes(session.connection())
+    session.commit()
+    if report.bytes_before is not None and report.bytes_after is not None:
+        report.saved_bytes = {
+            name: size - report.bytes_after.get(name, 0)
+            for name, size in report.bytes_before.items()
+        }
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
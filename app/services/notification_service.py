@@ -1,11 +1,20 @@
+from collections.abc import Iterable, Sequence
 from datetime import datetime, timezone
 
 from sqlmodel import Session
 
 from app.models import Notification, User
-from app.repositories.notification_repo import save_notification
+from app.repositories.notification_repo import (
+    insert_notifications,
+    mark_user_notifications_read,
+    save_notification,
+)
+from app.repositories.unit_of_work import transactional
+from app.repositories.unread_repo import add_unread
+from app.services.notification_hub import publish_after_commit
 
 
+@transactional
 def create_notification(
     session: Session,
     user: User,
@@ -16,6 +25,7 @@ def create_notification(
     related_type: str | None = None,
     related_id: int | None = None,
 ) -> Notification:
+    now = datetime.now(timezone.utc)
     notification = Notification(
         user_id=user.id,
         event_type=event_type,
@@ -25,12 +35,89 @@ def create_notification(
         related_type=related_type,
         related_id=related_id,
         delivery_status="queued",
-        created_at=datetime.now(timezone.utc),
+        created_at=now,
+        next_attempt_at=now,
     )
-    return save_notification(session, notification)
+    save_notification(session, notification)
+    add_unread(session, "notifications", {user.id: 1})
+    payload = _live_payload(notification.id, notification.model_dump())
+    publish_after_commit(session, user.id, "notification", payload)
+    return notification
+
 
+@transactional
+def create_notifications_bulk(
+    session: Session,
+    user_ids: Iterable[int],
+    event_type: str,
+    title: str,
+    body: str,
+    channel: str = "in_app",
+    related_type: str | None = None,
+    related_id: int | None = None,
+) -> int:
+    created_at = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": user_id,
+            "event_type": event_type,
+            "channel": channel,
+            "title": title,
+            "body": body,
+            "related_type": related_type,
+            "related_id": related_id,
+            "delivery_status": "queued",
+            "next_attempt_at": created_at,
+            "is_read": False,
+            "created_at": created_at,
+        }
+        # 同じユーザーへの重複通知は送らない
+        for user_id in dict.fromkeys(user_ids)
+    ]
+    notification_ids = insert_notifications(session, rows)
+    add_unread(session, "notifications", {row["user_id"]: 1 for row in rows})
+    for notification_id, row in zip(notification_ids, rows):
+        publish_after_commit(
+            session, row["user_id"], "notification", _live_payload(notification_id, row)
+        )
+    return len(notification_ids)
 
+
+@transactional
 def mark_notification_read(session: Session, notification: Notification) -> Notification:
+    if not notification.is_read:
+        add_unread(session, "notifications", {notification.user_id: -1})
+        publish_after_commit(session, notification.user_id, "read", {"ids": [notification.id]})
     notification.is_read = True
     notification.read_at = datetime.now(timezone.utc)
     return save_notification(session, notification)
+
+
+@transactional
+def mark_notifications_read(
+    session: Session,
+    user: User,
+    ids: Sequence[int] | None = None,
+    through: tuple[datetime, int] | None = None,
+) -> list[int]:
+    """ID の一覧、または一覧のカーソル以前の未読通知をまとめて既読にする（行は読み込まない）"""
+    read_ids = mark_user_notifications_read(
+        session, user.id, datetime.now(timezone.utc), ids=ids, through=through
+    )
+    if read_ids:
+        add_unread(session, "notifications", {user.id: -len(read_ids)})
+        publish_after_commit(session, user.id, "read", {"ids": read_ids})
+    return read_ids
+
+
+def _live_payload(notification_id: int, values: dict) -> dict:
+    """ライブ配信（SSE）で送る通知の内容"""
+    return {
+        "id": notification_id,
+        "event_type": values["event_type"],
+        "title": values["title"],
+        "body": values["body"],
+        "related_type": values["related_type"],
+        "related_id": values["related_id"],
+        "created_at": values["created_at"].isoformat(),
+    }
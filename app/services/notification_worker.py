@@ -0,0 +1,276 @@
+"""通知の配信ワーカー（トランザクショナル・アウトボックス）
+
+通知は業務データと同じトランザクションで notification に queued として書かれる。
+ワーカーはリクエストの外（イベントループ上のタスク）で期限の来た行をまとめて取り出し、
+チャネルごとに並行して配信し、結果をまとめて書き戻す。
+失敗は指数バックオフで再試行し、MAX_ATTEMPTS 回目の失敗で failed にする。
+配信中のままワーカーが止まった行は LEASE_SECONDS 後に取り出し直す（少なくとも 1 回の配信）。
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db import env_int
+from app.repositories.notification_repo import (
+    OutboxItem,
+    claim_notifications_async,
+    mark_retry_async,
+    mark_sent_async,
+    outbox_backlog_async,
+    requeue_expired_async,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = env_int("NOTIFICATION_BATCH_SIZE", 100)
+POLL_SECONDS = env_int("NOTIFICATION_POLL_SECONDS", 1)
+LEASE_SECONDS = 60
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 3600
+# 処理件数/秒を求める時間幅と、キューの深さ・遅延を読み直す間隔
+THROUGHPUT_WINDOW_SECONDS = 60
+OBSERVE_SECONDS = 1.0
+
+# 配信先: 取り出した通知を受け取り、失敗した通知 ID → エラー内容を返す（全件成功なら空）
+ChannelSender = Callable[[list[OutboxItem]], Awaitable[dict[int, str]]]
+
+_channels: dict[str, ChannelSender] = {}
+
+
+def delivery_channel(name: str) -> Callable[[ChannelSender], ChannelSender]:
+    """Notification.channel の値ごとの配信処理を登録する
+
+    ブロッキングする送信（SMTP など）は asyncio.to_thread などでイベントループを止めないようにする。
+    """
+
+    def register(func: ChannelSender) -> ChannelSender:
+        _channels[name] = func
+        return func
+
+    return register
+
+
+@delivery_channel("in_app")
+async def _deliver_in_app(items: list[OutboxItem]) -> dict[int, str]:
+    # 画面の通知一覧は notification の行そのものを表示するため、配信済みにするだけ
+    return {}
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite のドライバは tzinfo を落として返す（値は UTC で保存している）
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class WorkerStats:
+    batches: int = 0
+    delivered: int = 0
+    retried: int = 0
+    failed: int = 0
+    errors: int = 0
+    queue_depth: int = 0
+    lag_seconds: float = 0.0
+    last_batch_ms: float = 0.0
+
+
+class NotificationWorker:
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        batch_size: int = BATCH_SIZE,
+        poll_seconds: float = POLL_SECONDS,
+        lease_seconds: float = LEASE_SECONDS,
+        channels: dict[str, ChannelSender] | None = None,
+        clock: Callable[[], datetime] = _utc_now,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self._channels = _channels if channels is None else channels
+        self._clock = clock
+        self._monotonic = monotonic
+        self._stats = WorkerStats()
+        self._processed: deque[tuple[float, int]] = deque()
+        self._started_at = monotonic()
+        self._observed_at: float | None = None
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """期限の来た通知を 1 バッチ配信し、取り出した件数を返す"""
+        started = self._monotonic()
+        now = self._clock()
+        async with self.engine.begin() as connection:
+            await requeue_expired_async(connection, now)
+            items = await claim_notifications_async(
+                connection, now, now + timedelta(seconds=self.lease_seconds), self.batch_size
+            )
+        if items:
+            errors = await self._dispatch(items)
+            await self._record(items, errors)
+            self._stats.batches += 1
+            self._stats.last_batch_ms = round((self._monotonic() - started) * 1000, 3)
+            self._processed.append((self._monotonic(), len(items)))
+        # キューを空にしたバッチの後は必ず読み直す（アイドル時の表示を 0 に戻す）
+        await self._observe(force=len(items) < self.batch_size)
+        return len(items)
+
+    async def drain(self) -> int:
+        """期限の来た通知がなくなるまで配信する"""
+        total = 0
+        while claimed := await self.run_once():
+            total += claimed
+        return total
+
+    async def _dispatch(self, items: list[OutboxItem]) -> dict[int, str]:
+        by_channel: dict[str, list[OutboxItem]] = {}
+        for item in items:
+            by_channel.setdefault(item.channel, []).append(item)
+        results = await asyncio.gather(
+            *(self._send(channel, batch) for channel, batch in by_channel.items())
+        )
+        return {item_id: error for errors in results for item_id, error in errors.items()}
+
+    async def _send(self, channel: str, items: list[OutboxItem]) -> dict[int, str]:
+        sender = self._channels.get(channel)
+        if sender is None:
+            return {item.id: f"unknown_channel: {channel}" for item in items}
+        try:
+            return await sender(items)
+        except Exception as exc:
+            logger.warning(f"Notification channel {channel} failed: {exc}")
+            return {item.id: f"{type(exc).__name__}: {exc}"[:500] for item in items}
+
+    async def _record(self, items: list[OutboxItem], errors: dict[int, str]) -> None:
+        now = self._clock()
+        sent = [item.id for item in items if item.id not in errors]
+        retries = []
+        for item in items:
+            if item.id not in errors:
+                continue
+            # attempts は取り出し時に加算済み
+            exhausted = item.attempts >= MAX_ATTEMPTS
+            retries.append(
+                {
+                    "notification_id": item.id,
+                    "new_status": "failed" if exhausted else "queued",
+                    "retry_at": None if exhausted else now + retry_delay(item.attempts),
+                    "error": errors[item.id],
+                }
+            )
+        async with self.engine.begin() as connection:
+            await mark_sent_async(connection, sent, now)
+            await mark_retry_async(connection, retries)
+        failed = sum(1 for row in retries if row["new_status"] == "failed")
+        self._stats.delivered += len(sent)
+        self._stats.retried += len(retries) - failed
+        self._stats.failed += failed
+
+    async def _observe(self, force: bool = False) -> None:
+        # キューの深さと遅延は毎バッチではなく OBSERVE_SECONDS ごとに読む
+        current = self._monotonic()
+        recent = self._observed_at is not None and current - self._observed_at < OBSERVE_SECONDS
+        if recent and not force:
+            return
+        self._observed_at = current
+        now = self._clock()
+        async with self.engine.connect() as connection:
+            depth, oldest_due = await outbox_backlog_async(connection, now)
+        self._stats.queue_depth = depth
+        lag = (now - _as_utc(oldest_due)).total_seconds() if oldest_due else 0.0
+        self._stats.lag_seconds = round(max(lag, 0.0), 3)
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception as exc:
+                logger.error(f"Notification delivery failed: {exc}", exc_info=True)
+                self._stats.errors += 1
+                claimed = 0
+            if claimed < self.batch_size:
+                # キューが空になったらポーリング間隔だけ待つ（停止要求があれば即座に抜ける）
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_seconds)
+                except TimeoutError:
+                    pass
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self.run(), name="notification-worker")
+        return self._task
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            self._stopping.set()
+            return
+        if task.get_loop() is not asyncio.get_running_loop():
+            # 別のイベントループからは停止を依頼するだけ（テストクライアントを入れ子にした場合など）
+            task.get_loop().call_soon_threadsafe(self._stopping.set)
+            return
+        self._stopping.set()
+        await task
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def rows_per_second(self) -> float:
+        current = self._monotonic()
+        while self._processed and current - self._processed[0][0] > THROUGHPUT_WINDOW_SECONDS:
+            self._processed.popleft()
+        window = min(THROUGHPUT_WINDOW_SECONDS, current - self._started_at)
+        if window <= 0:
+            return 0.0
+        return round(sum(count for _, count in self._processed) / window, 1)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "batch_size": self.batch_size,
+            "rows_per_sec": self.rows_per_second(),
+            **asdict(self._stats),
+        }
+
+
+_worker: NotificationWorker | None = None
+
+
+def start_notification_worker(engine: AsyncEngine) -> NotificationWorker:
+    """アプリの起動時に呼ぶ（実行中のイベントループ上にタスクを作る）"""
+    global _worker
+    if _worker is None or not _worker.running:
+        _worker = NotificationWorker(engine)
+        _worker.start()
+    return _worker
+
+
+async def stop_notification_worker() -> None:
+    global _worker
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
+
+
+def notification_worker() -> NotificationWorker | None:
+    return _worker
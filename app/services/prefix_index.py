@@ -0,0 +1,90 @@
+"""件数付きの語彙の前方一致索引（オートコンプリート用）
+
+語彙を正規化したキーの昇順に並べた配列で持ち、前方一致する範囲を二分探索で求める。
+範囲が狭ければ範囲内から件数の多い順に k 件を選び、広ければ（短い入力）件数の降順に
+並べた配列を先頭から読んで前方一致するものを k 件集める。
+どちらの配列も件数の増減のたびに二分探索で差分更新し、作り直さない。
+"""
+
+import bisect
+import heapq
+import unicodedata
+
+# 前方一致の範囲の上端（どのコードポイントよりも大きい）
+_HIGHEST = "\U0010ffff"
+
+
+def normalize(value: str) -> str:
+    # 全角英数字・大文字小文字の違いを無視して照合する
+    return unicodedata.normalize("NFKC", value).casefold()
+
+
+class PrefixIndex:
+    def __init__(self) -> None:
+        self._keys: list[str] = []
+        self._values: list[str] = []
+        self._counts: dict[str, int] = {}
+        # (-件数, 値, キー) の昇順 = 件数の多い順
+        self._by_count: list[tuple[int, str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _position(self, value: str) -> int:
+        key = normalize(value)
+        position = bisect.bisect_left(self._keys, key)
+        # 正規化すると同じになる値（Tokyo と tokyo など）は元の値の順に並べる
+        while position < len(self._keys) and self._keys[position] == key:
+            if self._values[position] >= value:
+                break
+            position += 1
+        return position
+
+    def add(self, value: str, delta: int) -> None:
+        previous = self._counts.get(value, 0)
+        count = previous + delta
+        key = normalize(value)
+        if previous:
+            del self._by_count[bisect.bisect_left(self._by_count, (-previous, value, key))]
+        if count > 0:
+            bisect.insort(self._by_count, (-count, value, key))
+        if count > 0 and not previous:
+            position = self._position(value)
+            self._keys.insert(position, key)
+            self._values.insert(position, value)
+        elif count <= 0 and previous:
+            position = self._position(value)
+            del self._keys[position]
+            del self._values[position]
+        if count > 0:
+            self._counts[value] = count
+        else:
+            self._counts.pop(value, None)
+
+    def count(self, value: str) -> int:
+        return self._counts.get(value, 0)
+
+    def _rank(self, value: str) -> tuple[int, str]:
+        return -self._counts[value], value
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[str, int]]:
+        """prefix で始まる値を件数の多い順（同数なら値の順）に最大 limit 件返す"""
+        if limit <= 0 or not self._values:
+            return []
+        key = normalize(prefix)
+        low = bisect.bisect_left(self._keys, key)
+        high = bisect.bisect_left(self._keys, key + _HIGHEST) if key else len(self._keys)
+        size = high - low
+        if not size:
+            return []
+        # 件数順の配列を読む件数は一致が一様に散らばっているとして limit * 全体 / 範囲
+        if size * size > limit * len(self._values):
+            found = []
+            for _, value, candidate in self._by_count:
+                if candidate.startswith(key):
+                    found.append(value)
+                    if len(found) == limit:
+                        break
+        else:
+            found = heapq.nsmallest(limit, self._values[low:high], key=self._rank)
+        return [(value, self._counts[value]) for value in found]
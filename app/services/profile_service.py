@@ -5,8 +5,11 @@ from sqlmodel import Session
 from app.errors import AuthorizationError, ValidationError
 from app.models import StallholderProfile, User
 from app.repositories.profile_repo import get_stallholder_profile, save_stallholder_profile
+from app.repositories.unit_of_work import transactional
+from app.services.feed_service import refresh_feed_for_stallholder
 
 
+@transactional
 def update_stallholder_profile(
     session: Session,
     user: User,
@@ -23,10 +26,14 @@ def update_stallholder_profile(
     if not profile:
         raise ValidationError("profile_not_found")
 
+    genre_changed = profile.genre != genre
     profile.business_name = business_name
     profile.genre = genre
     profile.bio = bio
     profile.website_url = website_url
     profile.past_achievements = past_achievements
     profile.updated_at = datetime.now(timezone.utc)
-    return save_stallholder_profile(session, profile)
+    profile = save_stallholder_profile(session, profile)
+    if genre_changed:
+        refresh_feed_for_stallholder(session, user.id)
+    return profile
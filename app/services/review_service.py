@@ -5,9 +5,11 @@ from sqlmodel import Session
 from app.errors import ValidationError
 from app.models import Application, Review, User
 from app.repositories.review_repo import find_review, save_review
+from app.repositories.unit_of_work import transactional
 from app.services.notification_service import create_notification
 
 
+@transactional
 def create_review(
     session: Session,
     application: Application,
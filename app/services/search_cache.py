@@ -0,0 +1,101 @@
+"""出店者ダッシュボードのイベント検索結果キャッシュ
+
+正規化した検索条件ごとにイベント ID の並びとカーソルを LRU + TTL で保持する。
+イベントの変更が COMMIT されたら、変更前または変更後の状態が条件に一致するエントリだけを破棄する。
+キャッシュはプロセス内のため、他のワーカーでの変更は TTL が経過するまで反映されない。
+"""
+
+from dataclasses import dataclass
+from datetime import date
+
+from sqlmodel import Session
+
+from app.db import env_int
+from app.repositories.event_changes import EventChange, matches_any_change, on_event_commit
+from app.repositories.pagination import Page, clamp_limit
+from app.services.ttl_cache import TTLCache
+
+
+@dataclass(frozen=True)
+class SearchKey:
+    region: str | None = None
+    genre: str | None = None
+    date_from: date | None = None
+    date_until: date | None = None
+    keyword: str | None = None
+    after: str | None = None
+    before: str | None = None
+    limit: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        region: str | None,
+        genre: str | None,
+        date_value: date | None,
+        date_until: date | None = None,
+        keyword: str | None = None,
+        after: str | None = None,
+        before: str | None = None,
+        limit: int | None = None,
+    ) -> "SearchKey":
+        date_from = date_value or date_until
+        date_until = date_until or date_value
+        if date_from and date_until and date_until < date_from:
+            date_from, date_until = date_until, date_from
+        return cls(
+            region=(region or "").strip() or None,
+            genre=(genre or "").strip() or None,
+            date_from=date_from,
+            date_until=date_until,
+            keyword=" ".join((keyword or "").split()) or None,
+            after=after or None,
+            before=None if after else before or None,
+            limit=clamp_limit(limit),
+        )
+
+    def matches(self, snapshot: dict | None) -> bool:
+        """イベントの状態がこの検索条件の結果に入り得るか"""
+        if not snapshot or snapshot["status"] != "open":
+            return False
+        if self.region and snapshot["region"] != self.region:
+            return False
+        if self.genre and snapshot["genre"] != self.genre:
+            return False
+        if self.date_from:
+            start, end = snapshot["start_date"].date(), snapshot["end_date"].date()
+            if end < self.date_from or start > self.date_until:
+                return False
+        # キーワードの一致は全文検索に任せるため、それ以外の条件が合えば一致とみなす
+        return True
+
+
+@dataclass
+class CachedPage:
+    ids: list[int]
+    next_cursor: str | None
+    prev_cursor: str | None
+
+    @classmethod
+    def of(cls, page: Page) -> "CachedPage":
+        return cls([item.id for item in page.items], page.next_cursor, page.prev_cursor)
+
+
+class SearchCache(TTLCache[SearchKey, CachedPage]):
+    def put(self, key: SearchKey, page: Page, generation: int) -> None:
+        # 行そのものではなく ID の並びだけを保持する（ヒット時は主キーで読み直す）
+        super().put(key, CachedPage.of(page), generation)
+
+    def invalidate(self, changes: list[EventChange]) -> int:
+        return self.invalidate_where(matches_any_change(changes))
+
+
+search_cache = SearchCache(
+    max_entries=env_int("SEARCH_CACHE_SIZE", 256),
+    ttl_seconds=env_int("SEARCH_CACHE_TTL_SECONDS", 30),
+)
+
+
+@on_event_commit
+def _invalidate_search_cache(session: Session, changes: list[EventChange]) -> None:
+    search_cache.invalidate(changes)
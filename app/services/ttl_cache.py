@@ -0,0 +1,123 @@
+"""プロセス内の LRU + TTL キャッシュ
+
+検索結果・月間カレンダー・未読件数のキャッシュが共通で使う。
+読み込みの前に generation() を取得して put に渡すと、読み込み中に無効化が起きた結果は保存しない。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    expires_at: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def generation(self) -> int:
+        """読み込みを始める前に取得し、put に渡す"""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: K) -> V | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.value
+
+    def put(self, key: K, value: V, generation: int) -> None:
+        if not self.enabled:
+            return
+        entry = _Entry(value, self._clock() + self.ttl_seconds)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        """predicate に一致するキーのエントリを破棄する"""
+        with self._lock:
+            self._generation += 1
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+            self._stats.invalidations += len(stale)
+            return len(stale)
+
+    def discard(self, keys: Iterable[K]) -> int:
+        """指定したキーのエントリを破棄する（全件を走査しない）"""
+        with self._lock:
+            self._generation += 1
+            removed = sum(self._entries.pop(key, None) is not None for key in keys)
+            self._stats.invalidations += removed
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats.hits + self._stats.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._stats.hits,
+                "misses": self._stats.misses,
+                "hit_ratio": round(self._stats.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._stats.evictions,
+                "expirations": self._stats.expirations,
+                "invalidations": self._stats.invalidations,
+            }
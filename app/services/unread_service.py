@@ -0,0 +1,74 @@
+"""画面のヘッダーに出す未読件数
+
+件数は unread_counter の 1 行を読むだけで、さらにユーザーごとに
+プロセス内の LRU + TTL キャッシュへ保持する。
+このプロセスで件数が変わった COMMIT の後はそのユーザーのエントリを破棄する。
+他のワーカーでの変更は TTL が経過するまで反映されない（ライブ配信の接続中は SSE で更新される）。
+"""
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import env_int
+from app.repositories.unit_of_work import unit_of_work
+from app.repositories.unread_repo import (
+    get_unread_counts,
+    get_unread_counts_async,
+    list_user_ids,
+    mark_unread_changed,
+    on_unread_commit,
+    reconcile_unread_counters,
+)
+from app.services.ttl_cache import TTLCache
+
+# 定期バッチで 1 トランザクションに含めるユーザー数（書き込みロックを長く持たない）
+RECONCILE_CHUNK_SIZE = 500
+
+
+class UnreadCache(TTLCache[int, dict[str, int]]):
+    def invalidate(self, user_ids: set[int]) -> int:
+        return self.discard(user_ids)
+
+
+unread_cache = UnreadCache(
+    max_entries=env_int("UNREAD_CACHE_SIZE", 10000),
+    ttl_seconds=env_int("UNREAD_CACHE_TTL_SECONDS", 30),
+)
+
+
+@on_unread_commit
+def _invalidate_unread_cache(user_ids: set[int]) -> None:
+    unread_cache.invalidate(user_ids)
+
+
+def cached_unread_counts(session: Session, user_id: int) -> dict[str, int]:
+    """キャッシュになければ session で unread_counter の 1 行を読む"""
+    generation = unread_cache.generation()
+    counts = unread_cache.get(user_id)
+    if counts is None:
+        counts = get_unread_counts(session, user_id)
+        unread_cache.put(user_id, counts, generation)
+    return counts
+
+
+async def cached_unread_counts_async(session: AsyncSession, user_id: int) -> dict[str, int]:
+    generation = unread_cache.generation()
+    counts = unread_cache.get(user_id)
+    if counts is None:
+        counts = await get_unread_counts_async(session, user_id)
+        unread_cache.put(user_id, counts, generation)
+    return counts
+
+
+def reconcile_unread(session: Session, chunk_size: int = RECONCILE_CHUNK_SIZE) -> tuple[int, int]:
+    """全ユーザーの未読件数を数え直し、(確認したユーザー数, 直したユーザー数) を返す"""
+    checked = repaired = 0
+    last_id = 0
+    while user_ids := list_user_ids(session, last_id, chunk_size):
+        with unit_of_work(session):
+            fixed = reconcile_unread_counters(session.connection(), user_ids)
+            mark_unread_changed(session, fixed)
+        checked += len(user_ids)
+        repaired += len(fixed)
+        last_id = user_ids[-1]
+    return checked, repaired
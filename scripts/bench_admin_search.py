@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""管理画面のユーザー検索ベンチマーク（LIKE 走査 vs FTS5 trigram）
+
+ファイル SQLite に指定件数のユーザーを投入し、メールアドレスの部分一致検索について
+旧実装（email LIKE '%q%' を created_at 順に 1 ページ）と trigram 索引のレイテンシを比較する。
+目標: 100 万件で trigram 経路の 1 ページ取得が 1 語あたり 10 ms 以下。
+
+使用方法:
+    uv run python scripts/bench_admin_search.py [--users 1000000] [--repeat 20]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
+
+from app.db import build_engine
+from app.migrations import run_migrations
+from app.models import User
+from app.repositories.admin_search_repo import search_users_by_email
+from app.repositories.pagination import paginate
+
+DOMAINS = ["example.com", "mail.example.jp", "shop.example.net", "market.example.org"]
+TARGET_MS = 10.0
+
+
+def _seed(engine, count: int) -> None:
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        batch = []
+        for index in range(count):
+            batch.append(
+                {
+                    "email": f"user{index:07d}@{DOMAINS[index % len(DOMAINS)]}",
+                    "hashed_password": "x",
+                    "role": "stallholder",
+                    "is_active": True,
+                    "created_at": now - timedelta(seconds=count - index),
+                    "updated_at": now,
+                }
+            )
+            if len(batch) == 50_000:
+                session.execute(insert(User), batch)
+                batch = []
+        if batch:
+            session.execute(insert(User), batch)
+        session.commit()
+
+
+def _time(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # 全件に一致・1/4 に一致・1 件だけ一致・一致なし
+    queries = ["example", "shop.example", f"user{args.users // 2:07d}", "nosuchuser"]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(f"sqlite:///{Path(workdir) / 'bench.db'}", sqlite_profile="")
+        SQLModel.metadata.create_all(engine)
+        _seed(engine, args.users)
+        # 既存 DB と同じく、移行の backfill で trigram 索引へ取り込む
+        run_migrations(engine)
+
+        print(f"{'query':<20}{'LIKE ms':>10}{'FTS5 ms':>10}{'rows':>6}  target")
+        with Session(engine) as session:
+            for query in queries:
+
+                def like_search() -> list:
+                    statement = select(User).where(User.email.contains(query))
+                    return paginate(session, statement, User.created_at, User.id).items
+
+                def fts_search() -> list:
+                    return search_users_by_email(session, query).items
+
+                like_ms = _time(like_search, args.repeat)
+                fts_ms = _time(fts_search, args.repeat)
+                verdict = "ok" if fts_ms <= TARGET_MS else "NG"
+                print(
+                    f"{query:<20}{like_ms:>10.2f}{fts_ms:>10.2f}{len(fts_search()):>6}  {verdict}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
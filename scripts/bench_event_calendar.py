@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""月間カレンダー（日ごとの募集中イベント件数）のベンチマーク
+
+ファイル SQLite に指定件数のイベント（1〜3 日開催、1 年に分散）を投入し、1 か月分の日別件数を
+- 日ごとに 1 クエリ（func.date で開催期間を判定 = 全件走査 × 31 回）
+- 日ごとに 1 クエリ（event_day の索引から）
+- event_day を月の範囲で読む 1 回の集計（GROUP BY）
+- 月単位キャッシュのヒット
+で求める時間を比較する。
+
+使用方法:
+    uv run python scripts/bench_event_calendar.py [--events 100000] [--repeat 10]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, select
+
+from app.db import build_engine
+from app.models import Event, EventDay, User
+from app.repositories.event_day_repo import count_open_events_by_day, event_days, running_on
+from app.services.calendar_cache import calendar_cache, month_end
+from app.services.event_service import event_calendar
+
+REGIONS = ["東京都", "神奈川県", "大阪府", "愛知県", "福岡県", "北海道"]
+STATUSES = ["open"] * 6 + ["draft", "closed", "pending_review", "rejected"]
+FIRST_DAY = datetime(2030, 1, 1, 10)
+MONTH = date(2030, 6, 1)
+
+
+def _seed(engine, count: int) -> None:
+    rng = random.Random(42)
+    with Session(engine) as session:
+        organizer = User(email="bench@example.com", hashed_password="x", role="organizer")
+        session.add(organizer)
+        session.commit()
+        events, days = [], []
+        for index in range(count):
+            start = FIRST_DAY + timedelta(days=rng.randrange(365))
+            end = start + timedelta(days=rng.randrange(3), hours=6)
+            events.append(
+                {
+                    "id": index + 1,
+                    "organizer_id": organizer.id,
+                    "title": f"イベント {index}",
+                    "description": "",
+                    "region": rng.choice(REGIONS),
+                    "venue_address": "",
+                    "genre": "food",
+                    "start_date": start,
+                    "end_date": end,
+                    "application_deadline": start - timedelta(days=7),
+                    "capacity": 10,
+                    "status": rng.choice(STATUSES),
+                    "created_at": FIRST_DAY,
+                    "updated_at": FIRST_DAY,
+                }
+            )
+            days.extend({"event_id": index + 1, "day": day} for day in event_days(start, end))
+        session.execute(insert(Event), events)
+        session.execute(insert(EventDay), days)
+        session.commit()
+
+
+def _time(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    month_days = [MONTH + timedelta(days=offset) for offset in range(month_end(MONTH).day)]
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(f"sqlite:///{Path(workdir) / 'bench.db'}", sqlite_profile="")
+        SQLModel.metadata.create_all(engine)
+        _seed(engine, args.events)
+
+        with Session(engine) as session:
+
+            def per_day_scan() -> dict:
+                counts = {}
+                for day in month_days:
+                    statement = select(func.count()).where(
+                        Event.status == "open",
+                        func.date(Event.start_date) <= day,
+                        func.date(Event.end_date) >= day,
+                    )
+                    counts[day] = session.exec(statement).one()
+                return {day: count for day, count in counts.items() if count}
+
+            def per_day_index() -> dict:
+                counts = {}
+                for day in month_days:
+                    statement = select(func.count()).where(
+                        Event.status == "open", running_on(day)
+                    )
+                    counts[day] = session.exec(statement).one()
+                return {day: count for day, count in counts.items() if count}
+
+            def grouped() -> dict:
+                return count_open_events_by_day(session, MONTH, month_end(MONTH))
+
+            def cached() -> dict:
+                return event_calendar(session, MONTH).counts
+
+            assert per_day_scan() == per_day_index() == grouped() == cached()
+            calendar_cache.clear()
+            event_calendar(session, MONTH)
+            print(f"{'method':<28}{'queries':>8}{'ms':>10}")
+            for label, queries, func_ in [
+                ("per day, func.date scan", len(month_days), per_day_scan),
+                ("per day, event_day index", len(month_days), per_day_index),
+                ("grouped (1 query)", 1, grouped),
+                ("month cache hit", 0, cached),
+            ]:
+                print(f"{label:<28}{queries:>8}{_time(func_, args.repeat):>10.3f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
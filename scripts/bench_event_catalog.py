@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""公開中イベントカタログのベンチマーク（メモリ量と検索レイテンシ）
+
+ファイル SQLite に指定件数のイベント（9 割が公開中）を投入し、
+- カタログが保持するメモリ（読み込み後に残った分を tracemalloc で計測、1 万件あたり）
+- 出店者ダッシュボードと同じ条件での 1 ページ目の取得（SQL vs カタログ）
+- 条件に一致する全件の取得（search_events 相当、SQL vs カタログ）
+を計測する。
+
+使用方法:
+    uv run python scripts/bench_event_catalog.py [--events 100000] [--repeat 20]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from app.db import build_engine
+from app.migrations import run_migrations
+from app.models import Event, User
+from app.services.event_catalog import attach_event_catalog
+from app.services.event_service import search_events, search_events_page
+
+REGIONS = ["東京都", "神奈川県", "大阪府", "愛知県", "福岡県", "北海道", "京都府", "兵庫県"]
+GENRES = ["food", "craft", "fashion", "art", "music"]
+
+
+def _seed(engine, count: int) -> None:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        organizer = User(email="bench@example.com", hashed_password="x", role="organizer")
+        session.add(organizer)
+        session.commit()
+        rows = []
+        for index in range(count):
+            starts_in = rng.randrange(180)
+            rows.append(
+                {
+                    "organizer_id": organizer.id,
+                    "title": f"イベント {index}",
+                    "description": "ベンチマーク用のイベントです。",
+                    "region": rng.choice(REGIONS),
+                    "venue_address": f"会場{index % 500}",
+                    "genre": rng.choice(GENRES),
+                    "start_date": now + timedelta(days=starts_in),
+                    "end_date": now + timedelta(days=starts_in + rng.randrange(3)),
+                    "application_deadline": now + timedelta(days=starts_in - 3),
+                    "capacity": 10,
+                    "status": "open" if index % 10 else "closed",
+                    "created_at": now - timedelta(seconds=count - index),
+                    "updated_at": now,
+                }
+            )
+        session.execute(insert(Event), rows)
+        session.commit()
+
+
+def _time(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    today = datetime.now(timezone.utc).date()
+    cases = {
+        "all": {},
+        "region": {"region": "東京都"},
+        "region+genre": {"region": "東京都", "genre": "craft"},
+        "2 regions x 2 genres": {"region": ["東京都", "大阪府"], "genre": ["food", "art"]},
+        "one day": {"date_value": today + timedelta(days=30)},
+        "7 days + region": {
+            "region": "福岡県",
+            "date_value": today + timedelta(days=60),
+            "date_until": today + timedelta(days=66),
+        },
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(f"sqlite:///{Path(workdir) / 'bench.db'}", sqlite_profile="")
+        SQLModel.metadata.create_all(engine)
+        _seed(engine, args.events)
+        # 既存 DB と同じく、移行の backfill で開催日テーブルを作る
+        run_migrations(engine)
+
+        catalog = attach_event_catalog(engine)
+        tracemalloc.start()
+        catalog.refresh()
+        loaded_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = catalog.stats()
+        print(f"open events: {stats['events']}  postings: {stats['postings']}")
+        per_10k = 10_000 / stats["events"]
+        print(
+            f"memory per 10k events: {loaded_bytes * per_10k / 1024 / 1024:.2f} MiB"
+            f" (index only: {stats['index_bytes'] * per_10k / 1024:.0f} KiB)"
+        )
+
+        print(f"{'case':<22}{'page SQL':>10}{'catalog':>9}{'all SQL':>10}{'catalog':>9}{'hits':>8}")
+        with Session(engine) as session:
+            for name, filters in cases.items():
+                filters = {"region": None, "genre": None, "date_value": None, **filters}
+
+                def page() -> list:
+                    return search_events_page(session, **filters).items
+
+                def everything() -> list:
+                    return search_events(session, **filters)
+
+                with patch("app.services.event_service.catalog_for", return_value=None):
+                    page_sql = _time(page, args.repeat)
+                    all_sql = _time(everything, max(1, args.repeat // 4))
+                page_catalog = _time(page, args.repeat)
+                all_catalog = _time(everything, max(1, args.repeat // 4))
+                print(
+                    f"{name:<22}{page_sql:>10.2f}{page_catalog:>9.2f}"
+                    f"{all_sql:>10.2f}{all_catalog:>9.2f}{len(everything()):>8}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""出店者ごとのおすすめイベント（event_feed）のベンチマーク
+
+出店者・募集中イベント・承認済みの応募・主催者の評価を投入し、
+- 全出店者の作り直し（出店者 20 人ずつ COMMIT する定期バッチ）
+- 出店者 1 人分の計算（リクエストごとに計算した場合に相当）
+- イベント 1 件の公開に伴う差分更新
+- ダッシュボードでの上位の読み出し
+の時間と event_feed の大きさを計測する。
+
+使用方法:
+    uv run python scripts/bench_event_feed.py [--stallholders 500] [--events 20000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func, insert, text
+from sqlmodel import Session, SQLModel, select
+
+from app.db import build_engine
+from app.models import Application, Event, EventFeed, Review, StallholderProfile, User
+from app.repositories.feed_repo import (
+    list_feed_events,
+    refresh_event_feeds,
+    refresh_stallholder_feeds,
+)
+from app.services.feed_service import rebuild_event_feed
+
+REGIONS = ["東京都", "神奈川県", "大阪府", "愛知県", "福岡県", "北海道", "京都府", "兵庫県"]
+GENRES = ["food", "craft", "fashion", "art", "music", "plant", "book", "vintage"]
+ORGANIZERS = 200
+NOW = datetime(2030, 1, 1)
+
+
+def _seed(engine, stallholders: int, events: int) -> None:
+    rng = random.Random(42)
+    with Session(engine) as session:
+        users = [
+            {"id": index + 1, "email": f"u{index}@example.com", "hashed_password": "x",
+             "role": "organizer" if index < ORGANIZERS else "stallholder"}
+            for index in range(ORGANIZERS + stallholders)
+        ]
+        session.execute(insert(User), users)
+        session.execute(
+            insert(StallholderProfile),
+            [
+                {"user_id": ORGANIZERS + index + 1, "business_name": "店", "bio": "",
+                 "genre": rng.choice(GENRES)}
+                for index in range(stallholders)
+            ],
+        )
+        session.execute(
+            insert(Event),
+            [
+                {"id": index + 1, "organizer_id": rng.randint(1, ORGANIZERS),
+                 "title": f"イベント {index}", "description": "", "venue_address": "",
+                 "region": rng.choice(REGIONS), "genre": rng.choice(GENRES),
+                 "start_date": NOW, "end_date": NOW, "application_deadline": NOW,
+                 "capacity": 10, "status": "open" if index % 4 else "closed"}
+                for index in range(events)
+            ],
+        )
+        # 出店者 1 人あたり平均 5 件の応募（8 割が承認）と、主催者への評価
+        applications = {
+            (rng.randint(1, events), ORGANIZERS + rng.randint(1, stallholders))
+            for _ in range(stallholders * 5)
+        }
+        session.execute(
+            insert(Application),
+            [
+                {"id": index + 1, "event_id": event_id, "stallholder_id": stallholder_id,
+                 "status": "approved" if rng.random() < 0.8 else "rejected"}
+                for index, (event_id, stallholder_id) in enumerate(sorted(applications))
+            ],
+        )
+        session.execute(
+            insert(Review),
+            [
+                {"application_id": index + 1, "author_id": ORGANIZERS + 1,
+                 "target_id": rng.randint(1, ORGANIZERS), "score": rng.randint(1, 5),
+                 "comment": ""}
+                for index in range(min(len(applications), ORGANIZERS * 5))
+            ],
+        )
+        session.commit()
+
+
+def _time(func_, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func_()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stallholders", type=int, default=500)
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(f"sqlite:///{Path(workdir) / 'bench.db'}", sqlite_profile="")
+        SQLModel.metadata.create_all(engine)
+        _seed(engine, args.stallholders, args.events)
+        stallholder_id = ORGANIZERS + 1
+
+        with Session(engine) as session:
+            rebuild_ms = _time(lambda: rebuild_event_feed(session))
+        with engine.begin() as connection:
+            stallholder_ms = _time(
+                lambda: refresh_stallholder_feeds(connection, [stallholder_id]), 10
+            )
+        with engine.begin() as connection:
+            event_ids = iter(range(args.events, 0, -1))
+            event_ms = _time(lambda: refresh_event_feeds(connection, [next(event_ids)]), 10)
+        with Session(engine) as session:
+            read_ms = _time(lambda: list_feed_events(session, stallholder_id, 6), 200)
+            rows = session.exec(select(func.count()).select_from(EventFeed)).one()
+            pages = session.exec(
+                text("SELECT SUM(pgsize) FROM dbstat WHERE name LIKE '%event_feed%'")
+            ).one()[0]
+
+        print(f"stallholders={args.stallholders} open events={args.events * 3 // 4}")
+        print(f"event_feed rows={rows} size={pages / 1024 / 1024:.2f} MiB")
+        print(f"{'operation':<36}{'ms':>10}")
+        print(f"{'rebuild all (batch)':<36}{rebuild_ms:>10.1f}")
+        print(f"{'score one stallholder':<36}{stallholder_ms:>10.2f}")
+        print(f"{'open one event (incremental)':<36}{event_ms:>10.2f}")
+        print(f"{'dashboard read top 6':<36}{read_ms:>10.3f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
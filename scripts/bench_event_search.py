@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""イベントのキーワード検索ベンチマーク（LIKE 全件走査 vs FTS5 trigram）
+
+ファイル SQLite に指定件数のイベントを投入し、管理画面の旧検索
+（title LIKE '%q%'）と FTS5 による関連度順検索のレイテンシを比較する。
+
+使用方法:
+    uv run python scripts/bench_event_search.py [--events 100000] [--repeat 20]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
+
+from app.db import build_engine
+from app.migrations import run_migrations
+from app.models import Event, User
+from app.services.event_service import search_all_events_by_keyword
+
+WORDS = [
+    "マルシェ", "フリーマーケット", "手作り", "クラフト", "古本", "キッチンカー", "夏祭り",
+    "ワークショップ", "雑貨", "パン", "コーヒー", "古着", "植物", "陶器", "音楽", "アート",
+]
+REGIONS = ["東京都", "神奈川県", "大阪府", "愛知県", "福岡県", "北海道"]
+GENRES = ["food", "craft", "fashion", "art", "music"]
+# 0.1% のイベントにだけ含まれる語
+RARE_WORD = "ランタン"
+# 約 25% に一致する語、0.1% に一致する語、一致しない語
+QUERIES = ["フリーマーケット", "手作り 雑貨", RARE_WORD, "存在しないキーワード"]
+
+
+def _seed(engine, count: int) -> None:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        organizer = User(email="bench@example.com", hashed_password="x", role="organizer")
+        session.add(organizer)
+        session.commit()
+        rows = []
+        for index in range(count):
+            words = rng.sample(WORDS, 4)
+            rows.append(
+                {
+                    "organizer_id": organizer.id,
+                    "title": f"{words[0]}{words[1]} {index}"
+                    + (f" {RARE_WORD}" if index % 1000 == 0 else ""),
+                    "description": f"{words[2]}と{words[3]}のイベントです。",
+                    "region": rng.choice(REGIONS),
+                    "venue_address": f"会場{index % 500}",
+                    "genre": rng.choice(GENRES),
+                    "start_date": now + timedelta(days=index % 90),
+                    "end_date": now + timedelta(days=index % 90 + 1),
+                    "application_deadline": now + timedelta(days=index % 90 - 3),
+                    "capacity": 10,
+                    "status": "open",
+                    "created_at": now - timedelta(seconds=index),
+                    "updated_at": now,
+                }
+            )
+        session.execute(insert(Event), rows)
+        session.commit()
+
+
+def _time(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(f"sqlite:///{Path(workdir) / 'bench.db'}", sqlite_profile="")
+        SQLModel.metadata.create_all(engine)
+        _seed(engine, args.events)
+        # 既存 DB と同じく、移行の backfill で全文検索テーブルへ取り込む
+        run_migrations(engine)
+
+        print(f"{'query':<20}{'LIKE ms':>10}{'FTS5 ms':>10}{'hits':>8}")
+        with Session(engine) as session:
+            for query in QUERIES:
+                terms = query.split()
+
+                def like_search() -> list:
+                    statement = select(Event)
+                    for term in terms:
+                        statement = statement.where(Event.title.contains(term))
+                    statement = statement.order_by(Event.created_at.desc()).limit(20)
+                    return list(session.exec(statement).all())
+
+                def fts_search() -> list:
+                    return search_all_events_by_keyword(session, query).items
+
+                like_ms = _time(like_search, args.repeat)
+                fts_ms = _time(fts_search, args.repeat)
+                print(f"{query:<20}{like_ms:>10.2f}{fts_ms:>10.2f}{len(fts_search()):>8}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""地域・ジャンルのオートコンプリートのベンチマーク（前方一致索引 vs event_facet の SQL）
+
+件数が偏った（Zipf 風の）地域名を指定個数つくり、入力の長さごとに上位 10 件を返す時間を
+プロセス内の前方一致索引と event_facet テーブルへの SQL で比較する。
+件数を 1 つ変更してから引く時間（差分更新を含む）も併せて計測する。
+目標: 索引経路で 1 回 1 ms 未満。
+
+使用方法:
+    uv run python scripts/bench_facet_suggest.py [--values 20000] [--repeat 200]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from app.db import build_engine
+from app.models import EventFacet
+from app.repositories.facet_repo import suggest_facet_values
+from app.services.prefix_index import PrefixIndex
+
+PREFECTURES = ["東京都", "神奈川県", "大阪府", "愛知県", "福岡県", "北海道", "京都府", "兵庫県"]
+LIMIT = 10
+TARGET_MS = 1.0
+
+
+def _vocabulary(count: int) -> dict[str, int]:
+    rng = random.Random(42)
+    values = {}
+    for index in range(count):
+        prefecture = PREFECTURES[index % len(PREFECTURES)]
+        values[f"{prefecture}{rng.choice('中東西南北')}{index:05d}区"] = max(1, 1000 // (index + 1))
+    return values
+
+
+def _time(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--values", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    vocabulary = _vocabulary(args.values)
+    index = PrefixIndex()
+    for value, count in vocabulary.items():
+        index.add(value, count)
+    prefixes = ["", "東", "東京都", "東京都中", "東京都中0001", "存在しない"]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(f"sqlite:///{Path(workdir) / 'bench.db'}", sqlite_profile="")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            rows = [
+                {"facet": "region", "value": value, "open_count": count}
+                for value, count in vocabulary.items()
+            ]
+            session.execute(insert(EventFacet), rows)
+            session.commit()
+
+            print(f"{'prefix':<16}{'SQL ms':>9}{'index ms':>10}{'after change':>14}  target")
+            for prefix in prefixes:
+
+                def changed_then_suggest() -> list:
+                    # 件数の差分更新を含めた 1 回
+                    index.add("東京都中00001区", 1)
+                    return index.suggest(prefix, LIMIT)
+
+                sql_ms = _time(
+                    lambda: suggest_facet_values(session, "region", prefix, LIMIT), args.repeat
+                )
+                index_ms = _time(lambda: index.suggest(prefix, LIMIT), args.repeat)
+                changed_ms = _time(changed_then_suggest, max(1, args.repeat // 10))
+                verdict = "ok" if max(index_ms, changed_ms) < TARGET_MS else "NG"
+                label = prefix or "(empty)"
+                print(f"{label:<16}{sql_ms:>9.3f}{index_ms:>10.3f}{changed_ms:>14.3f}  {verdict}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
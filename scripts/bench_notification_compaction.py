@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""既読通知のアーカイブ（compact_notifications）のベンチマーク
+
+ファイル SQLite に保存期間を過ぎた既読通知の多い notification を作り、
+- アーカイブにかかる時間と、1 回の COMMIT 単位の最長時間（他の書き込みを待たせる時間）
+- notification の表・インデックスの使用量
+- 通知一覧の最初のページの読み込み時間
+をアーカイブの前後で比較する。
+
+使用方法:
+    uv run python scripts/bench_notification_compaction.py [--users 200] [--per-user 1000]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from app.db import build_engine, create_schema
+from app.models import Notification, User
+from app.repositories.notification_repo import list_notifications_for_user
+from app.services.notification_retention import compact_notifications
+
+
+def _seed(engine, users: int, per_user: int) -> list[int]:
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        accounts = [
+            User(email=f"user{index}@example.com", hashed_password="x", role="stallholder")
+            for index in range(users)
+        ]
+        session.add_all(accounts)
+        session.commit()
+        user_ids = [account.id for account in accounts]
+        for user_id in user_ids:
+            # 1 日 1 件、直近 30 日分だけが保存期間内
+            session.execute(
+                insert(Notification),
+                [
+                    {
+                        "user_id": user_id,
+                        "event_type": "news",
+                        "channel": "in_app",
+                        "title": f"お知らせ {index}",
+                        "body": "イベントの内容が更新されました。",
+                        "delivery_status": "sent",
+                        "is_read": index >= 3,
+                        "created_at": now - timedelta(days=index),
+                    }
+                    for index in range(per_user)
+                ],
+            )
+        session.commit()
+        return user_ids
+
+
+def _list_ms(engine, user_ids: list[int], samples: int = 500) -> float:
+    timings = []
+    with Session(engine) as session:
+        for sample in range(samples):
+            started = time.perf_counter()
+            list_notifications_for_user(session, user_ids[sample % len(user_ids)])
+            timings.append((time.perf_counter() - started) * 1000)
+            session.rollback()
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--per-user", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_engine(f"sqlite:///{directory}/bench.db")
+        create_schema(engine)
+        user_ids = _seed(engine, args.users, args.per_user)
+        list_before = _list_ms(engine, user_ids)
+        with Session(engine) as session:
+            report = compact_notifications(
+                session, older_than=timedelta(days=args.days), chunk_size=args.chunk_size
+            )
+        list_after = _list_ms(engine, user_ids)
+        engine.dispose()
+
+    print(f"notifications {args.users * args.per_user}, moved {report.moved}")
+    print(
+        f"compaction {report.elapsed_seconds:.2f} s in {report.chunks} chunks, "
+        f"longest chunk {report.max_chunk_ms:.1f} ms"
+    )
+    for name, before in report.bytes_before.items():
+        after = report.bytes_after[name]
+        print(f"{name:<32} {before / 1024 / 1024:8.2f} MiB -> {after / 1024 / 1024:8.2f} MiB")
+    print(f"first page of the list (p50) {list_before:.3f} ms -> {list_after:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
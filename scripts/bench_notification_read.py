@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""通知の既読のベンチマーク
+
+ファイル SQLite に未読の通知の多いユーザーを作り、全件を既読にするまでの時間を
+- 1 件ずつ（行を読み込み、既読にして COMMIT）
+- 選択した ID をまとめて（1 ページ分ずつ 1 回の UPDATE）
+- 一覧のカーソル以前をすべて（1 回の UPDATE）
+で比較する。
+
+使用方法:
+    uv run python scripts/bench_notification_read.py [--notifications 2000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert, update
+from sqlmodel import Session, select
+
+from app.db import build_engine, create_schema
+from app.models import Notification, User
+from app.repositories.pagination import DEFAULT_PAGE_SIZE
+from app.repositories.unread_repo import get_unread_counts
+from app.services.notification_service import mark_notification_read, mark_notifications_read
+from app.services.unread_service import reconcile_unread
+
+
+def _seed(engine, count: int) -> int:
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        user = User(email="bench@example.com", hashed_password="x", role="stallholder")
+        session.add(user)
+        session.commit()
+        session.execute(
+            insert(Notification),
+            [
+                {
+                    "user_id": user.id,
+                    "event_type": "news",
+                    "channel": "in_app",
+                    "title": f"お知らせ {index}",
+                    "body": "",
+                    "created_at": now - timedelta(seconds=index),
+                }
+                for index in range(count)
+            ],
+        )
+        session.commit()
+        return user.id
+
+
+def _reset(engine) -> None:
+    with Session(engine) as session:
+        session.execute(update(Notification).values(is_read=False, read_at=None))
+        session.commit()
+        reconcile_unread(session)
+
+
+def _one_by_one(session: Session, user: User) -> None:
+    ids = session.exec(
+        select(Notification.id).where(Notification.user_id == user.id, ~Notification.is_read)
+    ).all()
+    for notification_id in ids:
+        mark_notification_read(session, session.get(Notification, notification_id))
+
+
+def _selected(session: Session, user: User) -> None:
+    ids = session.exec(
+        select(Notification.id).where(Notification.user_id == user.id, ~Notification.is_read)
+    ).all()
+    for start in range(0, len(ids), DEFAULT_PAGE_SIZE):
+        mark_notifications_read(session, user, ids=ids[start : start + DEFAULT_PAGE_SIZE])
+
+
+def _through(session: Session, user: User) -> None:
+    mark_notifications_read(session, user, through=(datetime.now(timezone.utc), 0))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notifications", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_engine(f"sqlite:///{directory}/bench.db")
+        create_schema(engine)
+        user_id = _seed(engine, args.notifications)
+        for name, func in [
+            ("one by one", _one_by_one),
+            (f"selected ({DEFAULT_PAGE_SIZE} ids)", _selected),
+            ("all before cursor", _through),
+        ]:
+            _reset(engine)
+            with Session(engine) as session:
+                user = session.get(User, user_id)
+                started = time.perf_counter()
+                func(session, user)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                unread = get_unread_counts(session, user_id)["notifications"]
+            print(f"{name:<20} {elapsed_ms:9.1f} ms  unread after {unread}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""通知のライブ配信（SSE）のベンチマーク
+
+1 つのイベントループに指定本数の待機中ストリーム（ユーザーごとに 1 本）を作り、
+- 待機中のストリーム 1 本あたりのメモリ
+- 別スレッド（同期ルート）からの publish が 1 人のストリームに届くまでの時間
+- 全ユーザーへ 1 件ずつ publish したときの処理時間
+を測る。HTTP の送信部分は含まない。
+
+使用方法:
+    uv run python scripts/bench_notification_stream.py [--streams 10000] [--samples 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.notification_hub import NotificationHub, stream_notifications
+
+
+async def _consume(stream, received: dict[int, asyncio.Event], user_id: int) -> None:
+    async for chunk in stream:
+        if chunk.startswith("event: notification"):
+            received[user_id].set()
+
+
+async def _run(streams: int, samples: int) -> None:
+    hub = NotificationHub(max_connections=streams, max_per_user=1, queue_size=100)
+    received = {user_id: asyncio.Event() for user_id in range(streams)}
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tasks = []
+    for user_id in range(streams):
+        stream = stream_notifications(hub.subscribe(user_id), 0, hub=hub)
+        tasks.append(asyncio.create_task(_consume(stream, received, user_id)))
+    await asyncio.sleep(0.5)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    latencies = []
+    for sample in range(samples):
+        user_id = sample % streams
+        received[user_id].clear()
+        started = time.perf_counter()
+        await asyncio.to_thread(hub.publish, user_id, "notification", {"id": sample})
+        await received[user_id].wait()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    for user_id in range(streams):
+        received[user_id].clear()
+        hub.publish(user_id, "notification", {"id": user_id})
+    for user_id in range(streams):
+        await received[user_id].wait()
+    broadcast_ms = (time.perf_counter() - started) * 1000
+
+    hub.close_all()
+    await asyncio.gather(*tasks)
+    print(f"streams                 {streams}")
+    print(f"memory per idle stream  {allocated / streams / 1024:.2f} KiB")
+    print(f"publish -> stream (p50) {statistics.median(latencies):.3f} ms")
+    print(f"publish -> stream (p99) {statistics.quantiles(latencies, n=100)[98]:.3f} ms")
+    print(f"one per user, all users {broadcast_ms:.1f} ms")
+    print(f"connections after close {hub.stats()['connections']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(_run(args.streams, args.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""通知配信ワーカーのベンチマーク
+
+ファイル SQLite に queued の通知を投入し、
+- 1 件ずつ（取り出し・配信・更新を 1 件ごとのトランザクションで）
+- バッチサイズごとのまとめ取り出し（UPDATE ... RETURNING と一括更新）
+- 複数ワーカーの並行実行
+で全件を配信し終えるまでの処理件数/秒を比較する。配信自体は待ち時間を模した sleep とする。
+
+使用方法:
+    uv run python scripts/bench_notification_worker.py [--rows 20000] [--send-ms 2]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert, update
+from sqlmodel import Session, SQLModel
+
+from app.db import build_async_engine, build_engine, to_async_url
+from app.models import Notification, User
+from app.services.notification_worker import NotificationWorker
+
+
+def _seed(engine, count: int) -> None:
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        user = User(email="bench@example.com", hashed_password="x", role="stallholder")
+        session.add(user)
+        session.commit()
+        session.execute(
+            insert(Notification),
+            [
+                {
+                    "user_id": user.id,
+                    "event_type": "news",
+                    "channel": "in_app",
+                    "title": f"お知らせ {index}",
+                    "body": "",
+                    "delivery_status": "queued",
+                    "next_attempt_at": now,
+                    "created_at": now,
+                }
+                for index in range(count)
+            ],
+        )
+        session.commit()
+
+
+def _requeue(engine) -> None:
+    with Session(engine) as session:
+        session.execute(
+            update(Notification).values(
+                delivery_status="queued",
+                attempts=0,
+                sent_at=None,
+                next_attempt_at=datetime.now(timezone.utc),
+            )
+        )
+        session.commit()
+
+
+async def _drain(url: str, batch_size: int, workers: int, send_ms: float) -> int:
+    async def send(items):
+        # 外部への送信 1 回分（バッチごとに 1 回）
+        await asyncio.sleep(send_ms / 1000)
+        return {}
+
+    engine = build_async_engine(to_async_url(url))
+    try:
+        pool = [
+            NotificationWorker(engine, batch_size=batch_size, channels={"in_app": send})
+            for _ in range(workers)
+        ]
+        return sum(await asyncio.gather(*(worker.drain() for worker in pool)))
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--send-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        url = f"sqlite:///{Path(workdir) / 'bench.db'}"
+        engine = build_engine(url, sqlite_profile="")
+        SQLModel.metadata.create_all(engine)
+        _seed(engine, args.rows)
+        print(f"{'method':<24}{'rows':>8}{'seconds':>10}{'rows/sec':>12}")
+        for label, batch_size, workers, rows in [
+            ("one by one", 1, 1, min(args.rows, 2_000)),
+            ("batch 10", 10, 1, args.rows),
+            ("batch 100", 100, 1, args.rows),
+            ("batch 500", 500, 1, args.rows),
+            ("batch 100 x 4 workers", 100, 4, args.rows),
+        ]:
+            _requeue(engine)
+            if rows < args.rows:
+                # 1 件ずつは遅いので件数を減らして測る
+                with Session(engine) as session:
+                    session.execute(
+                        update(Notification)
+                        .where(Notification.id > rows)
+                        .values(delivery_status="sent")
+                    )
+                    session.commit()
+            started = time.perf_counter()
+            delivered = asyncio.run(_drain(url, batch_size, workers, args.send_ms))
+            elapsed = time.perf_counter() - started
+            assert delivered == rows, (label, delivered)
+            print(f"{label:<24}{rows:>8}{elapsed:>10.2f}{rows / elapsed:>12.0f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
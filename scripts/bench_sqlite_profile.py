@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""SQLite PRAGMA プロファイルのベンチマーク
+
+既定のロールバックジャーナルと SQLITE_PROFILE=production（WAL など）で、
+読み込みと書き込みを並行実行したときのスループットとロックエラー数を比較する。
+
+使用方法:
+    uv run python scripts/bench_sqlite_profile.py [--seconds 5] [--readers 8] [--writers 4]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel
+
+from app.db import build_engine
+from app.models import Notification, User
+from app.repositories.notification_repo import list_notifications_for_user, save_notification
+
+
+def _seed(engine, users: int) -> list[int]:
+    with Session(engine) as session:
+        ids = []
+        for index in range(users):
+            user = User(email=f"bench{index}@example.com", hashed_password="x", role="stallholder")
+            session.add(user)
+            session.commit()
+            ids.append(user.id)
+        return ids
+
+
+def _run(profile: str, seconds: float, readers: int, writers: int) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(f"sqlite:///{Path(workdir) / 'bench.db'}", sqlite_profile=profile)
+        SQLModel.metadata.create_all(engine)
+        user_ids = _seed(engine, max(readers, writers))
+        counters = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def reader(user_id: int) -> None:
+            while time.perf_counter() < deadline:
+                try:
+                    with Session(engine) as session:
+                        list_notifications_for_user(session, user_id)
+                    key = "reads"
+                except OperationalError:
+                    key = "locked"
+                with lock:
+                    counters[key] += 1
+
+        def writer(user_id: int) -> None:
+            while time.perf_counter() < deadline:
+                try:
+                    with Session(engine) as session:
+                        save_notification(
+                            session,
+                            Notification(
+                                user_id=user_id,
+                                event_type="bench",
+                                channel="in_app",
+                                title="bench",
+                                body="bench",
+                            ),
+                        )
+                    key = "writes"
+                except OperationalError:
+                    key = "locked"
+                with lock:
+                    counters[key] += 1
+
+        threads = [
+            threading.Thread(target=reader, args=(user_ids[i % len(user_ids)],))
+            for i in range(readers)
+        ] + [
+            threading.Thread(target=writer, args=(user_ids[i % len(user_ids)],))
+            for i in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+        return counters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12}{'reads/s':>12}{'writes/s':>12}{'locked':>10}")
+    for profile in ("default", "production"):
+        result = _run(profile, args.seconds, args.readers, args.writers)
+        print(
+            f"{profile:<12}"
+            f"{result['reads'] / args.seconds:>12.1f}"
+            f"{result['writes'] / args.seconds:>12.1f}"
+            f"{result['locked']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""サービス呼び出しごとの COMMIT 回数とレイテンシのベンチマーク
+
+ファイル SQLite 上で主要なサービス（ユーザー登録・応募・応募判定・メッセージ送信）を
+繰り返し呼び出し、1 回あたりの COMMIT 数と SQL 文の数、平均レイテンシを表示する。
+
+使用方法:
+    uv run python scripts/bench_unit_of_work.py [--iterations 200]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.db import build_engine, create_schema
+from app.services.admin_service import approve_event
+from app.services.application_service import apply_to_event, decide_application
+from app.services.auth_service import register_user
+from app.services.event_service import create_event, submit_event_for_review
+from app.services.message_service import send_message
+
+
+class Counter:
+    def __init__(self, engine) -> None:
+        self.commits = 0
+        self.statements = 0
+        event.listen(engine, "commit", self._on_commit)
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_commit(self, conn) -> None:
+        self.commits += 1
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements += 1
+
+    def snapshot(self) -> tuple[int, int]:
+        return self.commits, self.statements
+
+
+def _open_event(session: Session, organizer, admin):
+    now = datetime.now(timezone.utc)
+    event_obj = create_event(
+        session,
+        organizer,
+        title="Bench",
+        description="bench",
+        region="Tokyo",
+        venue_address="Shibuya",
+        genre="Food",
+        start_date=now + timedelta(days=10),
+        end_date=now + timedelta(days=11),
+        application_deadline=now + timedelta(days=5),
+        capacity=10_000,
+    )
+    submit_event_for_review(session, organizer, event_obj.id)
+    return approve_event(session, admin, event_obj, True)
+
+
+def run(iterations: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = defaultdict(
+        lambda: {"calls": 0, "commits": 0, "statements": 0, "seconds": 0.0}
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(f"sqlite:///{Path(workdir) / 'bench.db'}", sqlite_profile="")
+        create_schema(engine)
+        counter = Counter(engine)
+
+        def measure(name: str, func):
+            before_commits, before_statements = counter.snapshot()
+            started = time.perf_counter()
+            value = func()
+            elapsed = time.perf_counter() - started
+            commits, statements = counter.snapshot()
+            entry = results[name]
+            entry["calls"] += 1
+            entry["commits"] += commits - before_commits
+            entry["statements"] += statements - before_statements
+            entry["seconds"] += elapsed
+            return value
+
+        with Session(engine) as session:
+            organizer = register_user(
+                session, "organizer@bench.example", "password123", "organizer"
+            )
+            admin = register_user(
+                session, "admin@bench.example", "password123", "admin", allow_admin=True
+            )
+            event_obj = _open_event(session, organizer, admin)
+            for index in range(iterations):
+                stallholder = measure(
+                    "register_user",
+                    lambda: register_user(
+                        session, f"s{index}@bench.example", "password123", "stallholder"
+                    ),
+                )
+                application = measure(
+                    "apply_to_event",
+                    lambda: apply_to_event(session, event_obj, stallholder, "memo"),
+                )
+                application = measure(
+                    "decide_application",
+                    lambda: decide_application(session, organizer, application.id, True),
+                )
+                measure(
+                    "send_message",
+                    lambda: send_message(session, application, stallholder, "hello"),
+                )
+        engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    print(f"{'service':<22}{'commits/call':>14}{'stmts/call':>12}{'ms/call':>10}")
+    for name, entry in results.items():
+        calls = entry["calls"]
+        print(
+            f"{name:<22}"
+            f"{entry['commits'] / calls:>14.2f}"
+            f"{entry['statements'] / calls:>12.2f}"
+            f"{entry['seconds'] / calls * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""ヘッダーの未読件数のベンチマーク
+
+ファイル SQLite に通知とメッセージの多いユーザーを作り、1 回の読み込みにかかる時間を
+- 都度数える（通知の COUNT と、応募をたどったメッセージの COUNT）
+- unread_counter の 1 行を主キーで読む
+- プロセス内キャッシュから読む
+で比較する。
+
+使用方法:
+    uv run python scripts/bench_unread_counts.py [--notifications 20000] [--messages 20000]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert, text
+from sqlmodel import Session
+
+from app.db import build_engine, create_schema
+from app.models import Application, Event, Message, Notification, User
+from app.repositories.unread_repo import get_unread_counts
+from app.services.unread_service import cached_unread_counts, reconcile_unread, unread_cache
+
+_COUNT_SQL = text(
+    """
+    SELECT
+        (SELECT COUNT(*) FROM notification WHERE user_id = :user_id AND NOT is_read),
+        (SELECT COUNT(*) FROM message m JOIN application a ON a.id = m.application_id
+         WHERE a.stallholder_id = :user_id AND NOT m.is_read AND m.sender_id != :user_id)
+    """
+)
+
+
+def _seed(engine, notifications: int, messages: int, applications: int = 200) -> int:
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        organizer = User(email="org@example.com", hashed_password="x", role="organizer")
+        stallholder = User(email="stall@example.com", hashed_password="x", role="stallholder")
+        session.add_all([organizer, stallholder])
+        session.commit()
+        event_ids = []
+        for index in range(applications):
+            event = Event(
+                organizer_id=organizer.id,
+                title=f"イベント {index}",
+                description="",
+                region="東京",
+                venue_address="",
+                genre="food",
+                start_date=now + timedelta(days=7),
+                end_date=now + timedelta(days=8),
+                application_deadline=now + timedelta(days=5),
+                capacity=10,
+                status="open",
+            )
+            session.add(event)
+            session.flush()
+            event_ids.append(event.id)
+        application_ids = []
+        for event_id in event_ids:
+            application = Application(
+                event_id=event_id, stallholder_id=stallholder.id, status="approved"
+            )
+            session.add(application)
+            session.flush()
+            application_ids.append(application.id)
+        session.execute(
+            insert(Notification),
+            [
+                {
+                    "user_id": stallholder.id,
+                    "event_type": "news",
+                    "channel": "in_app",
+                    "title": f"お知らせ {index}",
+                    "body": "",
+                    "is_read": index % 2 == 0,
+                    "created_at": now,
+                }
+                for index in range(notifications)
+            ],
+        )
+        session.execute(
+            insert(Message),
+            [
+                {
+                    "application_id": application_ids[index % len(application_ids)],
+                    "sender_id": organizer.id if index % 3 else stallholder.id,
+                    "content": "こんにちは",
+                    "is_read": index % 4 == 0,
+                    "created_at": now,
+                }
+                for index in range(messages)
+            ],
+        )
+        session.commit()
+        reconcile_unread(session)
+        return stallholder.id
+
+
+def _measure(func, samples: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=100)[98]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notifications", type=int, default=20_000)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_engine(f"sqlite:///{directory}/bench.db")
+        create_schema(engine)
+        user_id = _seed(engine, args.notifications, args.messages)
+
+        with Session(engine) as session:
+            counted = tuple(session.execute(_COUNT_SQL, {"user_id": user_id}).one())
+            stored = get_unread_counts(session, user_id)
+            assert counted == (stored["notifications"], stored["messages"]), (counted, stored)
+
+            def count():
+                session.execute(_COUNT_SQL, {"user_id": user_id}).one()
+                session.rollback()
+
+            def counter():
+                get_unread_counts(session, user_id)
+                session.rollback()
+
+            results = {
+                "COUNT each time": _measure(count, args.samples),
+                "unread_counter row": _measure(counter, args.samples),
+            }
+            unread_cache.clear()
+            cached_unread_counts(session, user_id)
+            results["in-process cache"] = _measure(
+                lambda: cached_unread_counts(session, user_id), args.samples
+            )
+        engine.dispose()
+
+    print(f"unread notifications / messages: {counted[0]} / {counted[1]}")
+    for name, (p50, p99) in results.items():
+        print(f"{name:<20} p50 {p50:.3f} ms  p99 {p99:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
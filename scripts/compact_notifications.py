@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""保存期間を過ぎた既読通知を notification_archive へ移すバッチ
+
+cron などで定期実行する。移した件数と、notification の表・インデックスごとに減った
+使用量（dbstat）を表示する。空いたページは DB 内で再利用され、ファイルは縮まない
+（縮めるにはメンテナンス時に VACUUM する）。
+
+使用方法:
+    uv run python scripts/compact_notifications.py [--days 90] [--chunk-size 500] [--pause 0.05]
+"""
+
+import argparse
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db import get_session
+from app.services.notification_retention import (
+    ARCHIVE_CHUNK_SIZE,
+    NOTIFICATION_RETENTION_DAYS,
+    compact_notifications,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=NOTIFICATION_RETENTION_DAYS)
+    parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+    parser.add_argument("--pause", type=float, default=0.0, help="単位ごとに待つ秒数")
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        report = compact_notifications(
+            session,
+            older_than=timedelta(days=args.days),
+            chunk_size=args.chunk_size,
+            pause_seconds=args.pause,
+        )
+    finally:
+        session.close()
+    print(
+        f"{report.cutoff:%Y-%m-%d %H:%M} より前の既読通知を {report.moved} 件移しました"
+        f"（{report.chunks} 回、1 回最長 {report.max_chunk_ms:.1f} ms、"
+        f"全体 {report.elapsed_seconds:.2f} 秒）"
+    )
+    if report.bytes_before is None:
+        print("dbstat が使えないため使用量は表示しません")
+        return
+    for name, before in report.bytes_before.items():
+        after = report.bytes_after.get(name, 0)
+        print(f"{name:<36} {before / 1024:>10.0f} KiB -> {after / 1024:>10.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
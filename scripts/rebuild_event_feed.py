@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""出店者ごとのおすすめイベント（event_feed）を作り直すバッチ
+
+イベントの公開・変更、プロフィール・応募の変更はその都度差分で反映されるが、
+主催者の評価の変化と、終了したイベントで空いた枠の補充はこのバッチで反映する
+（cron などで定期実行）。
+
+使用方法:
+    uv run python scripts/rebuild_event_feed.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlmodel import func, select
+
+from app.db import get_session
+from app.models import EventFeed
+from app.services.feed_service import rebuild_event_feed
+
+
+def main() -> None:
+    session = get_session()
+    try:
+        started = time.perf_counter()
+        stallholders = rebuild_event_feed(session)
+        rows = session.exec(select(func.count()).select_from(EventFeed)).one()
+        elapsed = time.perf_counter() - started
+        print(f"おすすめを作り直しました: 出店者 {stallholders} 人、{rows} 件（{elapsed:.2f} 秒）")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
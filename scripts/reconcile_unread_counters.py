@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""未読件数（unread_counter）を実際の件数と突き合わせて直すバッチ
+
+件数は通知・メッセージの作成と既読の都度加減算されるが、直接の SQL 更新などで
+ずれた場合はこのバッチで直す（cron などで定期実行）。
+
+使用方法:
+    uv run python scripts/reconcile_unread_counters.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db import get_session
+from app.services.unread_service import reconcile_unread
+
+
+def main() -> None:
+    session = get_session()
+    try:
+        started = time.perf_counter()
+        checked, repaired = reconcile_unread(session)
+        elapsed = time.perf_counter() - started
+        print(
+            f"未読件数を確認しました: ユーザー {checked} 人、修正 {repaired} 人（{elapsed:.2f} 秒）"
+        )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
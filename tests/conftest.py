@@ -1,9 +1,15 @@
-from datetime import datetime, timezone
+import asyncio
+from datetime import datetime, timedelta, timezone
 
 import pytest
-from sqlmodel import SQLModel, Session, create_engine
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
 
 import app.models  # noqa: F401
+from app.db import build_async_engine, build_engine, create_schema, to_async_url
+from app.services.admin_service import approve_event
+from app.services.auth_service import register_user
+from app.services.event_service import create_event, submit_event_for_review, update_event
 
 
 @pytest.fixture()
@@ -12,7 +18,7 @@ def session() -> Session:
         "sqlite://",
         connect_args={"check_same_thread": False},
     )
-    SQLModel.metadata.create_all(engine)
+    create_schema(engine)
     with Session(engine) as session:
         yield session
 
@@ -20,3 +26,155 @@ def session() -> Session:
 @pytest.fixture()
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
+
+
+@pytest.fixture()
+def users(session):
+    """イベントを作る主催者と、審査する管理者"""
+    organizer = register_user(session, "org@example.com", "password123", "organizer")
+    admin = register_user(session, "admin@example.com", "password123", "admin", allow_admin=True)
+    return organizer, admin
+
+
+def _make_event(
+    session: Session,
+    organizer,
+    admin=None,
+    *,
+    status: str | None = None,
+    title: str = "Event",
+    region: str = "Tokyo",
+    genre: str = "food",
+    start: datetime | None = None,
+    days: float = 1,
+    deadline_days: float = 2,
+    **fields,
+):
+    start = start or datetime.now(timezone.utc) + timedelta(days=7)
+    values = {
+        "title": title,
+        "description": "Desc",
+        "region": region,
+        "venue_address": "Venue",
+        "genre": genre,
+        "start_date": start,
+        "end_date": start + timedelta(days=days),
+        "application_deadline": start - timedelta(days=deadline_days),
+        "capacity": 10,
+        **fields,
+    }
+    event = create_event(session, organizer, **values)
+    if admin is not None:
+        submit_event_for_review(session, organizer, event.id)
+        return approve_event(session, admin, event, approve=True)
+    if status is not None:
+        # 審査を経ずに状態だけを変える
+        event.status = status
+        session.add(event)
+        session.commit()
+        session.refresh(event)
+    return event
+
+
+@pytest.fixture()
+def make_event():
+    """テスト用のイベントを作る。admin を渡すと審査を経て公開（open）にする
+
+    既定は 7 日後に始まる 1 日のイベントで、締め切りは開始の 2 日前。
+    """
+    return _make_event
+
+
+EVENT_FIELDS = (
+    "title", "description", "region", "venue_address", "genre",
+    "start_date", "end_date", "application_deadline", "capacity", "latitude", "longitude",
+)
+
+
+def _edit_event(session: Session, organizer, event, **changes):
+    fields = {name: getattr(event, name) for name in EVENT_FIELDS}
+    return update_event(session, organizer, event.id, **{**fields, **changes})
+
+
+@pytest.fixture()
+def edit_event():
+    """update_event に今の値を渡し、changes の項目だけを変える"""
+    return _edit_event
+
+
+class ReplicaPair:
+    """プライマリとレプリカの SQLite ファイルを sync() で同期するテスト用ヘルパー"""
+
+    def __init__(self, tmp_path) -> None:
+        connect_args = {"check_same_thread": False}
+        self.primary = create_engine(
+            f"sqlite:///{tmp_path / 'primary.db'}", connect_args=connect_args
+        )
+        self.replica = create_engine(
+            f"sqlite:///{tmp_path / 'replica.db'}", connect_args=connect_args
+        )
+        create_schema(self.primary)
+        self.sync()
+
+    def sync(self) -> None:
+        source = self.primary.raw_connection()
+        target = self.replica.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            source.close()
+            target.close()
+
+
+@pytest.fixture()
+def replica_pair(tmp_path, monkeypatch) -> ReplicaPair:
+    import app.db
+
+    pair = ReplicaPair(tmp_path)
+    monkeypatch.setattr(app.db, "engine", pair.primary)
+    monkeypatch.setattr(app.db, "replica_engine", pair.replica)
+    yield pair
+    pair.primary.dispose()
+    pair.replica.dispose()
+
+
+class AppClient(TestClient):
+    """ファイル SQLite に向けたアプリの TestClient（engine でデータを用意する）"""
+
+    def __init__(self, fastapi_app, engine) -> None:
+        super().__init__(fastapi_app)
+        self.engine = engine
+
+    def login(self, email: str, password: str = "password123"):
+        response = self.post(
+            "/login", data={"email": email, "password": password}, follow_redirects=False
+        )
+        assert response.status_code == 303, response.text
+        return response
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch) -> AppClient:
+    import app.db
+    from app.main import create_app
+    from app.services.calendar_cache import calendar_cache
+    from app.services.search_cache import search_cache
+    from app.services.unread_service import unread_cache
+
+    db_url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = build_engine(db_url)
+    async_engine = build_async_engine(to_async_url(db_url))
+    monkeypatch.setattr(app.db, "engine", engine)
+    monkeypatch.setattr(app.db, "_async_engines", {"primary": async_engine})
+    # 配信ワーカーとカタログはテストごとに状態を持ち越さないよう止める
+    monkeypatch.setenv("NOTIFICATION_WORKER_ENABLED", "false")
+    monkeypatch.setenv("EVENT_CATALOG_ENABLED", "false")
+    caches = (search_cache, calendar_cache, unread_cache)
+    for cache in caches:
+        cache.clear()
+    with AppClient(create_app(), engine) as test_client:
+        yield test_client
+    for cache in caches:
+        cache.clear()
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
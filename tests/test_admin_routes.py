@@ -0,0 +1,55 @@
+import pytest
+from sqlmodel import Session
+
+from app.services.application_service import apply_to_event
+from app.services.auth_service import register_user
+
+INVALID_MESSAGE = "応募の条件に解釈できない値があります"
+
+
+@pytest.fixture()
+def application_id(client, make_event):
+    with Session(client.engine) as session:
+        organizer = register_user(session, "org@example.com", "password123", "organizer")
+        register_user(session, "admin@example.com", "password123", "admin", allow_admin=True)
+        stallholder = register_user(session, "stall@example.com", "password123", "stallholder")
+        event = make_event(session, organizer, status="open", title="Route Market")
+        application_id = apply_to_event(session, event, stallholder, memo=None).id
+    client.login("admin@example.com")
+    return application_id
+
+
+def test_application_search_lists_matching_application(client, application_id):
+    # Given: one application
+
+    # When: searching applications by its id
+    response = client.get(
+        "/admin", params={"search_type": "application", "application_id": application_id}
+    )
+
+    # Then: the application is listed
+    assert response.status_code == 200
+    assert "Route Market" in response.text
+    assert INVALID_MESSAGE not in response.text
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"application_id": "abc"},
+        {"event_id": "99999999999999999999"},
+        {"application_id": "²"},
+        {"stallholder": "zzz"},
+        {"status": "bogus"},
+    ],
+)
+def test_application_search_with_invalid_filter_matches_nothing(client, application_id, filters):
+    # Given: one application
+
+    # When: searching with a value that cannot be parsed
+    response = client.get("/admin", params={"search_type": "application", **filters})
+
+    # Then: the page renders the input error and lists nothing
+    assert response.status_code == 200
+    assert INVALID_MESSAGE in response.text
+    assert "Route Market" not in response.text
@@ -0,0 +1,164 @@
+from sqlmodel import Session, SQLModel, create_engine, select, text
+
+from app.migrations import run_migrations
+from app.models import User
+from app.repositories.admin_search_repo import (
+    search_reviews_by_comment,
+    search_users_by_email,
+    user_email_fts,
+)
+from app.services.application_service import apply_to_event
+from app.services.auth_service import register_user
+from app.services.review_service import create_review
+
+
+def _register(session, count: int, domain: str = "example.com"):
+    return [
+        register_user(session, f"user{index}@{domain}", "password123", "stallholder")
+        for index in range(count)
+    ]
+
+
+def test_search_users_by_email_substring_newest_first(session):
+    # Given: users on two domains
+    shop = _register(session, 3, "shop.jp")
+    _register(session, 2)
+
+    # When: searching part of one domain
+    page = search_users_by_email(session, "shop")
+
+    # Then: only matching users are returned, newest first
+    assert [user.id for user in page.items] == [user.id for user in reversed(shop)]
+    assert page.next_cursor is None
+
+
+def test_search_users_by_email_pages_with_cursor(session):
+    # Given: five matching users
+    users = _register(session, 5)
+
+    # When: reading pages of two
+    first = search_users_by_email(session, "example", limit=2)
+    second = search_users_by_email(session, "example", limit=2, after=first.next_cursor)
+    back = search_users_by_email(session, "example", limit=2, before=second.prev_cursor)
+
+    # Then: pages follow id order without overlap and going back returns the first page
+    ids = [user.id for user in reversed(users)]
+    assert [user.id for user in first.items] == ids[:2]
+    assert [user.id for user in second.items] == ids[2:4]
+    assert [user.id for user in back.items] == ids[:2]
+
+
+def test_search_users_by_short_email_term_falls_back_to_like(session):
+    # Given: a user whose address contains a 2-character fragment
+    user = register_user(session, "qz_shop@example.com", "password123", "stallholder")
+    _register(session, 2)
+
+    # When: searching a 2-character fragment and one containing LIKE wildcards
+    short = search_users_by_email(session, "qz")
+    wildcard = search_users_by_email(session, "_s")
+
+    # Then: the LIKE fallback matches literally
+    assert [found.id for found in short.items] == [user.id]
+    assert [found.id for found in wildcard.items] == [user.id]
+
+
+def test_search_reviews_by_comment(session, make_event):
+    # Given: a review posted through the review service
+    organizer = register_user(session, "org@example.com", "password123", "organizer")
+    stallholder = register_user(session, "stall@example.com", "password123", "stallholder")
+    event = make_event(session, organizer, status="open")
+    application = apply_to_event(session, event, stallholder, memo="Join")
+    review = create_review(
+        session,
+        application=application,
+        author=organizer,
+        target=stallholder,
+        score=5,
+        comment="搬入がとても丁寧でした",
+    )
+
+    # When: searching part of the comment and an unrelated phrase
+    found = search_reviews_by_comment(session, "とても丁寧")
+    missing = search_reviews_by_comment(session, "遅刻しました")
+
+    # Then: only the matching review is returned
+    assert [item.id for item in found.items] == [review.id]
+    assert missing.items == []
+
+
+def test_direct_session_changes_reindex_users_and_reviews(session, make_event):
+    # Given: a user and a review
+    organizer = register_user(session, "org@example.com", "password123", "organizer")
+    stallholder = register_user(session, "stall@example.com", "password123", "stallholder")
+    event = make_event(session, organizer, status="open")
+    application = apply_to_event(session, event, stallholder, memo="Join")
+    review = create_review(
+        session,
+        application=application,
+        author=organizer,
+        target=stallholder,
+        score=5,
+        comment="搬入がとても丁寧でした",
+    )
+
+    # When: changing the email and comment directly on the session
+    stallholder.email = "renamed@shop.jp"
+    review.comment = "撤収が早かったです"
+    session.add(stallholder)
+    session.add(review)
+    session.commit()
+
+    # Then: the trigram indexes follow the rows without going through save_user / save_review
+    assert search_users_by_email(session, "stall@example").items == []
+    assert [user.id for user in search_users_by_email(session, "shop.jp").items] == [
+        stallholder.id
+    ]
+    assert search_reviews_by_comment(session, "とても丁寧").items == []
+    assert [item.id for item in search_reviews_by_comment(session, "撤収が早").items] == [
+        review.id
+    ]
+
+
+def test_search_users_plan_reads_trigram_index(session):
+    # Given: the email search statement
+    statement = (
+        select(User)
+        .join(user_email_fts, user_email_fts.c.rowid == User.id)
+        .where(text("user_email_fts MATCH '\"example\"'"))
+        .where(user_email_fts.c.rowid < 100)
+        .order_by(user_email_fts.c.rowid.desc())
+        .limit(21)
+    )
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # When: explaining the query
+    plan = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    # Then: matches come from the FTS index in rowid order, users by primary key
+    steps = [row[-1] for row in plan]
+    assert steps[0].startswith("SCAN user_email_fts VIRTUAL TABLE INDEX")
+    assert "SEARCH user USING INTEGER PRIMARY KEY (rowid=?)" in steps
+    assert not any("TEMP B-TREE" in step for step in steps)
+
+
+def test_migration_backfills_email_index(tmp_path):
+    # Given: users inserted before the trigram index existed
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO user "
+                "(email, hashed_password, role, is_active, created_at, updated_at) "
+                "VALUES ('legacy@old.example', 'x', 'stallholder', 1, '2020-01-01', '2020-01-01')"
+            )
+        )
+
+    # When: running migrations
+    run_migrations(engine)
+
+    # Then: the existing user is found by substring
+    with Session(engine) as session:
+        page = search_users_by_email(session, "old.exa")
+    assert [user.email for user in page.items] == ["legacy@old.example"]
+    engine.dispose()
@@ -0,0 +1,150 @@
+import pytest
+from sqlmodel import text
+from starlette.requests import Request
+
+from app.models import Application
+from app.repositories.application_repo import _application_search_statement, search_applications
+from app.repositories.pagination import _keyset_statement
+from app.routes.admin import _application_filters
+from app.services.application_service import apply_to_event, decide_application
+from app.services.auth_service import register_user
+
+
+@pytest.fixture()
+def applications(session, make_event):
+    organizer = register_user(session, "org@example.com", "password123", "organizer")
+    alice = register_user(session, "alice@example.com", "password123", "stallholder")
+    bob = register_user(session, "bob@example.com", "password123", "stallholder")
+    market = make_event(session, organizer, status="open", title="Market")
+    festival = make_event(session, organizer, status="open", title="Festival")
+    created = {
+        "alice_market": apply_to_event(session, market, alice, memo=None),
+        "bob_market": apply_to_event(session, market, bob, memo=None),
+        "alice_festival": apply_to_event(session, festival, alice, memo=None),
+    }
+    decide_application(session, organizer, created["bob_market"].id, approved=True)
+    return {"market": market, "festival": festival, "alice": alice, "bob": bob, **created}
+
+
+def _ids(page) -> list[int]:
+    return [row.id for row in page.items]
+
+
+def test_search_applications_without_filters_returns_newest_page(session, applications):
+    # Given: three applications
+
+    # When: searching with no conditions and a page size of two
+    page = search_applications(session, limit=2)
+
+    # Then: the newest two are returned with a cursor to the rest
+    assert _ids(page) == [applications["alice_festival"].id, applications["bob_market"].id]
+    assert page.next_cursor is not None
+
+
+def test_search_applications_by_each_filter(session, applications):
+    # Given: applications by two stallholders to two events
+    alice, market = applications["alice"], applications["market"]
+
+    # When / Then: each condition narrows the result
+    assert _ids(search_applications(session, application_id=applications["bob_market"].id)) == [
+        applications["bob_market"].id
+    ]
+    assert _ids(search_applications(session, event_id=market.id)) == [
+        applications["bob_market"].id,
+        applications["alice_market"].id,
+    ]
+    assert _ids(search_applications(session, stallholder_id=alice.id)) == [
+        applications["alice_festival"].id,
+        applications["alice_market"].id,
+    ]
+    assert _ids(search_applications(session, stallholder_email="bob@example.com")) == [
+        applications["bob_market"].id
+    ]
+    assert _ids(search_applications(session, status="approved")) == [applications["bob_market"].id]
+    assert _ids(
+        search_applications(session, event_id=market.id, stallholder_email="alice@example.com")
+    ) == [applications["alice_market"].id]
+    assert _ids(search_applications(session, stallholder_email="nobody@example.com")) == []
+
+
+def test_search_applications_includes_event_title_and_email(session, applications):
+    # Given: an application by alice to the festival
+
+    # When: searching it by id
+    row = search_applications(session, application_id=applications["alice_festival"].id).items[0]
+
+    # Then: the joined event title and stallholder email are returned
+    assert row.event_title == "Festival"
+    assert row.stallholder_email == "alice@example.com"
+    assert row.status == "pending"
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"application_id": 1},
+        {"event_id": 1},
+        {"event_id": 1, "status": "pending"},
+        {"stallholder_id": 1},
+        {"stallholder_email": "alice@example.com"},
+        {"status": "approved"},
+    ],
+)
+def test_search_applications_plan_uses_indexes(session, filters):
+    # Given: the first page statement for the filter combination
+    statement = _keyset_statement(
+        _application_search_statement(**filters),
+        Application.created_at,
+        Application.id,
+        None,
+        None,
+        20,
+        True,
+    )
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # When: explaining the query
+    plan = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    # Then: applications are read through an index in created_at order, never fully scanned
+    details = " / ".join(row[-1] for row in plan)
+    assert "SCAN application" not in details.replace("SCAN application USING INDEX", "")
+    assert "TEMP B-TREE" not in details
+
+
+def _filters(query: str):
+    return _application_filters(
+        Request({"type": "http", "query_string": query.encode(), "headers": []})
+    )
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["stallholder=foo", "application_id=12a", "event_id=-1", "status=bogus"],
+)
+def test_application_filters_reject_unparseable_values(query):
+    # Given: an admin search query with a value that is neither an id nor an email
+
+    # When: reading the filters
+    filters = _filters(query)
+
+    # Then: no filter set is returned, so the search matches nothing instead of everything
+    assert filters is None
+
+
+def test_application_filters_parse_ids_and_email():
+    # Given / When: valid ids, an email and an empty status
+    by_id = _filters("application_id=3&event_id=%207%20&stallholder=5&status=")
+    by_email = _filters("stallholder=alice%40example.com&status=approved")
+
+    # Then: each value is mapped to its condition
+    assert by_id == {
+        "application_id": 3,
+        "event_id": 7,
+        "stallholder_id": 5,
+        "stallholder_email": None,
+        "status": None,
+    }
+    assert by_email["stallholder_email"] == "alice@example.com"
+    assert (by_email["stallholder_id"], by_email["status"]) == (None, "approved")
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import build_async_engine, create_schema, to_async_url
+from app.repositories.event_repo import list_open_events_async
+from app.repositories.message_repo import list_messages_for_application_async
+from app.repositories.notification_repo import list_notifications_for_user_async
+from app.services.application_service import apply_to_event, decide_application
+from app.services.auth_service import register_user
+from app.services.event_service import search_events_async
+from app.services.message_service import send_message
+
+
+@pytest.fixture()
+def db_url(tmp_path) -> str:
+    return f"sqlite:///{tmp_path / 'async.db'}"
+
+
+@pytest.fixture()
+def file_session(db_url) -> Session:
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    create_schema(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _run(db_url: str, reader):
+    async def runner():
+        async_engine = build_async_engine(to_async_url(db_url))
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                return await reader(session)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(runner())
+
+
+def test_list_open_events_async(file_session, db_url, make_event):
+    # Given: one open and one draft event
+    organizer = register_user(file_session, "org@async.com", "password123", "organizer")
+    make_event(file_session, organizer, status="open", title="Open", region="Tokyo")
+    make_event(file_session, organizer, title="Draft")
+
+    # When: listing open events through the async session
+    page = _run(db_url, list_open_events_async)
+
+    # Then: only the open event is returned
+    assert [event.title for event in page.items] == ["Open"]
+
+
+def test_search_events_async_by_region(file_session, db_url, make_event):
+    # Given: open events in different regions
+    organizer = register_user(file_session, "org2@async.com", "password123", "organizer")
+    make_event(file_session, organizer, status="open", title="Tokyo Event", region="Tokyo")
+    make_event(file_session, organizer, status="open", title="Osaka Event", region="Osaka")
+
+    # When: searching by region asynchronously
+    events = _run(
+        db_url,
+        lambda session: search_events_async(session, region="Osaka", genre=None, date_value=None),
+    )
+
+    # Then: only the Osaka event is returned
+    assert [event.title for event in events] == ["Osaka Event"]
+
+
+def test_list_notifications_and_messages_async(file_session, db_url, make_event):
+    # Given: approved application with a message
+    organizer = register_user(file_session, "org3@async.com", "password123", "organizer")
+    stallholder = register_user(file_session, "stall3@async.com", "password123", "stallholder")
+    event = make_event(file_session, organizer, status="open", title="Chat Event")
+    application = apply_to_event(file_session, event, stallholder, memo=None)
+    decide_application(file_session, organizer, application.id, approved=True)
+    send_message(file_session, application, stallholder, content="Hello")
+
+    # When: reading messages and notifications asynchronously
+    messages = _run(
+        db_url, lambda session: list_messages_for_application_async(session, application.id)
+    )
+    notifications = _run(
+        db_url, lambda session: list_notifications_for_user_async(session, organizer.id)
+    )
+
+    # Then: the same rows as the sync path are visible
+    assert [message.content for message in messages.items] == ["Hello"]
+    assert {n.event_type for n in notifications.items} == {
+        "application_submitted",
+        "message_received",
+    }
@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+from sqlmodel import create_engine
+
+from app.db import (
+    InstrumentedQueuePool,
+    build_async_engine,
+    build_engine,
+    get_pool_stats,
+    get_read_session,
+    get_session,
+    to_async_url,
+)
+from app.models import User
+from app.repositories.user_repo import get_user_by_email, save_user
+
+
+def test_pool_stats_track_checkouts(tmp_path):
+    # Given: instrumented pool with a single connection
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+
+    # When: holding a connection
+    with engine.connect():
+        stats = get_pool_stats(engine)
+
+    # Then: checked out connection and checkout count are reported
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert stats["checked_out"] == 1
+    assert stats["checkouts"] == 1
+    assert get_pool_stats(engine)["checked_out"] == 0
+
+
+def test_pool_stats_count_timeouts(tmp_path):
+    # Given: exhausted pool with a short timeout
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+
+    # When: requesting a second connection while the first is held
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    # Then: timeout is recorded
+    assert get_pool_stats(engine)["timeouts"] == 1
+
+
+def test_async_pool_stats_track_checkouts_and_timeouts(tmp_path, monkeypatch):
+    # Given: async engine with a single pooled connection and a short timeout
+    monkeypatch.setenv("DB_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "1")
+    async_engine = build_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+
+    async def hold_and_wait():
+        try:
+            async with async_engine.connect():
+                held = get_pool_stats(async_engine)
+                with pytest.raises(exc.TimeoutError):
+                    await async_engine.connect()
+            return held, get_pool_stats(async_engine)
+        finally:
+            await async_engine.dispose()
+
+    # When: requesting a second connection while the first is held
+    held, stats = asyncio.run(hold_and_wait())
+
+    # Then: the async pool reports checkouts and timeouts like the sync pool
+    assert held["pool_class"] == "InstrumentedAsyncQueuePool"
+    assert held["checked_out"] == 1
+    assert (stats["checkouts"], stats["timeouts"]) == (1, 1)
+
+
+def test_pool_stats_memory_sqlite():
+    # Given: in-memory sqlite engine (non-queue pool)
+    engine = create_engine("sqlite://")
+
+    # When: reading stats
+    stats = get_pool_stats(engine)
+
+    # Then: only the pool class is reported
+    assert stats == {"pool_class": "SingletonThreadPool"}
+
+
+def test_async_url_is_derived_for_sqlite_and_postgresql():
+    # Given / When: converting SQLite, PostgreSQL and other URLs
+    sqlite_url = to_async_url("sqlite:////tmp/app.db")
+    pg_url = to_async_url("postgresql+psycopg2://user@localhost/app")
+
+    # Then: SQLite uses aiosqlite, PostgreSQL asyncpg, others must be configured explicitly
+    assert sqlite_url == "sqlite+aiosqlite:////tmp/app.db"
+    assert pg_url == "postgresql+asyncpg://user@localhost/app"
+    with pytest.raises(ValueError, match="ASYNC_DATABASE_URL"):
+        to_async_url("mysql://user@localhost/app")
+
+
+def test_async_engine_is_created_on_first_use(monkeypatch):
+    # Given: a database whose async URL cannot be derived
+    import app.db
+
+    monkeypatch.setattr(app.db, "DATABASE_URL", "mysql://user@localhost/app")
+    monkeypatch.setattr(app.db, "ASYNC_DATABASE_URL", None)
+    monkeypatch.setattr(app.db, "_async_engines", {})
+
+    # When / Then: nothing fails until the async engine is needed, then the error names the setting
+    with pytest.raises(RuntimeError, match="ASYNC_DATABASE_URL"):
+        app.db.get_async_session()
+    assert app.db._async_engines == {}
+
+
+def test_sqlite_production_profile_applies_pragmas(tmp_path):
+    # Given: file sqlite engine with production profile
+    engine = build_engine(f"sqlite:///{tmp_path / 'prod.db'}", sqlite_profile="production")
+
+    # When: reading pragmas on a new connection
+    with engine.connect() as conn:
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+        synchronous = conn.execute(text("PRAGMA synchronous")).scalar()
+        busy_timeout = conn.execute(text("PRAGMA busy_timeout")).scalar()
+
+    # Then: WAL / NORMAL / busy_timeout are applied
+    assert journal_mode == "wal"
+    assert synchronous == 1
+    assert busy_timeout > 0
+
+
+def test_sqlite_default_profile_keeps_rollback_journal(tmp_path):
+    # Given: file sqlite engine without profile
+    engine = build_engine(f"sqlite:///{tmp_path / 'default.db'}", sqlite_profile="")
+
+    # When: reading journal mode
+    with engine.connect() as conn:
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+
+    # Then: default journal is kept
+    assert journal_mode == "delete"
+
+
+def test_read_session_uses_replica(replica_pair):
+    # Given: a user written to the primary only
+    with get_session() as session:
+        save_user(
+            session, User(email="replica@example.com", hashed_password="x", role="stallholder")
+        )
+
+    # When: reading before and after the replica is synced
+    with get_read_session() as session:
+        before_sync = get_user_by_email(session, "replica@example.com")
+    replica_pair.sync()
+    with get_read_session() as session:
+        after_sync = get_user_by_email(session, "replica@example.com")
+
+    # Then: the read session sees the row only after replication
+    assert before_sync is None
+    assert after_sync is not None
+
+
+def test_read_session_use_primary_reads_own_writes(replica_pair):
+    # Given: a user written to the primary only (replica not synced)
+    with get_session() as session:
+        save_user(session, User(email="ryw@example.com", hashed_password="x", role="organizer"))
+
+    # When: reading with the read-your-writes escape hatch
+    with get_read_session(use_primary=True) as session:
+        user = get_user_by_email(session, "ryw@example.com")
+
+    # Then: the primary row is visible
+    assert user is not None
+
+
+def test_read_session_rejects_writes(replica_pair):
+    # Given: a read-only session
+    with get_read_session() as session:
+        # When: trying to persist a row
+        session.add(User(email="ro@example.com", hashed_password="x", role="stallholder"))
+
+        # Then: flush is rejected
+        with pytest.raises(RuntimeError, match="read_only_session"):
+            session.flush()
+
+
+def test_read_session_falls_back_to_primary(monkeypatch, tmp_path):
+    # Given: no replica configured
+    import app.db
+
+    primary = create_engine(f"sqlite:///{tmp_path / 'only.db'}")
+    monkeypatch.setattr(app.db, "engine", primary)
+    monkeypatch.setattr(app.db, "replica_engine", None)
+
+    # When: opening a read session
+    with get_read_session() as session:
+        bind = session.get_bind()
+
+    # Then: the primary engine is used
+    assert bind is primary
@@ -0,0 +1,140 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event as sa_event
+from sqlmodel import text
+
+from app.repositories.event_day_repo import _day_counts_statement
+from app.services.calendar_cache import MonthCalendar, MonthKey, calendar_cache
+from app.services.event_service import event_calendar, search_events
+
+OCTOBER = date(2030, 10, 1)
+
+
+@pytest.fixture(autouse=True)
+def _clear_calendar_cache():
+    calendar_cache.clear()
+    yield
+    calendar_cache.clear()
+
+
+@pytest.fixture()
+def event_on(session, users, make_event):
+    organizer, admin = users
+
+    def create(start: date, days: int = 1, region: str = "Tokyo", approve=True):
+        start_at = datetime(start.year, start.month, start.day, 10)
+        return make_event(
+            session,
+            organizer,
+            admin if approve else None,
+            region=region,
+            start=start_at,
+            end_date=start_at + timedelta(days=days - 1, hours=6),
+            deadline_days=10,
+        )
+
+    return create
+
+
+@pytest.fixture()
+def october(event_on):
+    event_on(date(2030, 9, 29), days=3)  # 9/29〜10/1
+    event_on(date(2030, 10, 1))
+    event_on(date(2030, 10, 15), days=2, region="Osaka")
+    event_on(date(2030, 10, 31), days=2)  # 10/31〜11/1
+    event_on(date(2030, 10, 20), approve=False)  # 下書きは数えない
+
+
+def test_calendar_counts_open_events_per_day(session, october):
+    # Given: open events inside and across the month boundaries, and a draft
+
+    # When: building the October calendar
+    calendar = event_calendar(session, date(2030, 10, 18))
+
+    # Then: every running day is counted, clipped to the month
+    assert calendar.month == OCTOBER
+    assert calendar.counts == {
+        date(2030, 10, 1): 2,
+        date(2030, 10, 15): 1,
+        date(2030, 10, 16): 1,
+        date(2030, 10, 31): 1,
+    }
+
+
+def test_calendar_matches_search_per_day(session, october):
+    # Given: the same events, filtered by region
+
+    # When: aggregating once, and searching each day separately
+    calendar = event_calendar(session, OCTOBER, region="Tokyo")
+    per_day = {
+        day: len(search_events(session, "Tokyo", None, day))
+        for day in (OCTOBER + timedelta(days=offset) for offset in range(31))
+    }
+
+    # Then: both agree
+    assert calendar.counts == {day: count for day, count in per_day.items() if count}
+
+
+def test_calendar_is_one_grouped_query(session, october):
+    # Given: a statement counter
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    bind = session.get_bind()
+    sa_event.listen(bind, "before_cursor_execute", _count)
+    try:
+        # When: building a month twice
+        event_calendar(session, OCTOBER)
+        event_calendar(session, OCTOBER)
+    finally:
+        sa_event.remove(bind, "before_cursor_execute", _count)
+
+    # Then: one query for the whole month, and the second call is served from the cache
+    assert len(statements) == 1
+    assert "GROUP BY" in statements[0]
+
+
+def test_calendar_plan_reads_event_day_index(session):
+    # Given: the aggregate statement for a month
+    statement = _day_counts_statement(OCTOBER, date(2030, 10, 31), "Tokyo", None)
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # When: explaining the query
+    plan = [row[-1] for row in session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()]
+
+    # Then: days are read by range from the index and events by primary key
+    assert any("event_day USING COVERING INDEX ix_event_day_day_event" in step for step in plan)
+    assert any(step.startswith("SEARCH event USING INTEGER PRIMARY KEY") for step in plan)
+    assert "SCAN event" not in plan
+
+
+def test_change_invalidates_only_affected_months(session, event_on, october):
+    # Given: cached calendars for October, November and Osaka in October
+    event_calendar(session, OCTOBER)
+    event_calendar(session, date(2030, 11, 1))
+    event_calendar(session, OCTOBER, region="Osaka")
+
+    # When: a Tokyo event is opened in October
+    event_on(date(2030, 10, 10))
+
+    # Then: only the calendars it can appear in are dropped, and the next read is fresh
+    assert calendar_cache.get(MonthKey.build(OCTOBER, None, None)) is None
+    assert calendar_cache.get(MonthKey.build(date(2030, 11, 1), None, None)) is not None
+    assert calendar_cache.get(MonthKey.build(OCTOBER, "Osaka", None)) is not None
+    assert event_calendar(session, OCTOBER).counts[date(2030, 10, 10)] == 1
+
+
+def test_month_calendar_weeks_start_on_sunday():
+    # Given: February 2026, which starts on a Sunday and spans four weeks
+    calendar = MonthCalendar(date(2026, 2, 1))
+
+    # When / Then: weeks are Sunday-first and the navigation moves by month
+    weeks = calendar.weeks()
+    assert weeks[0][0] == date(2026, 2, 1)
+    assert len(weeks) == 4
+    assert calendar.previous_month == date(2026, 1, 1)
+    assert calendar.next_month == date(2026, 3, 1)
+    assert MonthCalendar(date(2030, 10, 1)).weeks()[0][:2] == [None, None]
@@ -0,0 +1,227 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event as sa_event
+
+from app.models import Event
+from app.repositories.event_changes import EventChange
+from app.services.event_catalog import (
+    CatalogEvent,
+    EventCatalog,
+    attach_event_catalog,
+    detach_event_catalogs,
+)
+from app.services.event_service import search_events, search_events_page
+
+
+@pytest.fixture()
+def catalog_event(session, users, make_event):
+    organizer, admin = users
+
+    def create(title, region, genre, starts_in: int, open_: bool = True):
+        start = datetime.now(timezone.utc) + timedelta(days=starts_in)
+        return make_event(
+            session,
+            organizer,
+            admin if open_ else None,
+            title=title,
+            region=region,
+            genre=genre,
+            start=start,
+            days=2,
+            deadline_days=starts_in - 1,
+        )
+
+    return create
+
+
+@pytest.fixture()
+def catalog(session):
+    catalog = attach_event_catalog(session.get_bind())
+    # 定期的な作り直しを止め、差分更新だけで追従することを確かめる
+    catalog.refresh_seconds = float("inf")
+    yield catalog
+    detach_event_catalogs()
+
+
+def _sql(session, func, *args, **kwargs):
+    with patch("app.services.event_service.catalog_for", return_value=None):
+        return func(session, *args, **kwargs)
+
+
+def _ids(events) -> list[int]:
+    return [event.id for event in events]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"region": "Tokyo"},
+        {"genre": "food"},
+        {"region": ["Tokyo", "Osaka"], "genre": ["food", "craft"]},
+        {"date_offset": (11, None)},
+        {"date_offset": (None, 21)},
+        {"date_offset": (25, 9), "region": "Tokyo"},
+        {"region": "Sapporo"},
+    ],
+)
+def test_catalog_search_matches_sql(session, catalog_event, catalog, filters):
+    # Given: open events in several regions and dates, plus a draft
+    catalog_event("A", "Tokyo", "food", 10)
+    catalog_event("B", "Osaka", "craft", 20)
+    catalog_event("C", "Tokyo", "art", 30)
+    catalog_event("D", "Nagoya", "food", 12)
+    catalog_event("E", "Tokyo", "food", 11, open_=False)
+    today = datetime.now(timezone.utc).date()
+    filters = {"region": None, "genre": None, **filters}
+    start, end = filters.pop("date_offset", (None, None))
+    filters["date_value"] = today + timedelta(days=start) if start is not None else None
+    filters["date_until"] = today + timedelta(days=end) if end is not None else None
+
+    # When: searching through the catalog and through SQL
+    found = search_events(session, **filters)
+    expected = _sql(session, search_events, **filters)
+
+    # Then: the same events are returned as Event rows (newest first from the catalog)
+    assert all(isinstance(event, Event) for event in found)
+    assert _ids(found) == sorted(_ids(expected), reverse=True)
+
+
+def test_catalog_search_reads_only_matches_by_primary_key(session, catalog_event, catalog):
+    # Given: a loaded catalog
+    catalog_event("A", "Tokyo", "food", 10)
+    search_events(session, "Tokyo", None, None)
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    sa_event.listen(session.get_bind(), "before_cursor_execute", listener)
+
+    # When: searching again
+    try:
+        found = search_events(session, "Tokyo", "food", None)
+    finally:
+        sa_event.remove(session.get_bind(), "before_cursor_execute", listener)
+
+    # Then: the only SQL reads the matched events by primary key
+    assert [event.title for event in found] == ["A"]
+    assert len(statements) == 1
+    assert "WHERE event.id IN" in statements[0]
+
+
+def test_catalog_follows_approval_update_and_close(session, catalog_event, catalog):
+    # Given: a loaded catalog with one open event
+    first = catalog_event("A", "Tokyo", "food", 10)
+    assert _ids(search_events(session, None, None, None)) == [first.id]
+    loaded_at = catalog._loaded_at
+
+    # When: another event is approved, the first moves region and then closes
+    second = catalog_event("B", "Osaka", "craft", 20)
+    first.region = "Kyoto"
+    session.add(first)
+    session.commit()
+    moved = _ids(search_events(session, "Kyoto", None, None))
+    first.status = "closed"
+    session.add(first)
+    session.commit()
+
+    # Then: the catalog is updated incrementally without a reload
+    assert moved == [first.id]
+    assert _ids(search_events(session, "Tokyo", None, None)) == []
+    assert _ids(search_events(session, None, None, None)) == [second.id]
+    assert catalog._loaded_at == loaded_at
+    assert catalog.stats()["events"] == 1
+
+
+def test_catalog_ignores_rolled_back_changes(session, catalog_event, catalog):
+    # Given: a loaded catalog with one open event
+    event = catalog_event("A", "Tokyo", "food", 10)
+    search_events(session, None, None, None)
+
+    # When: closing the event is rolled back
+    event.status = "closed"
+    session.add(event)
+    session.flush()
+    session.rollback()
+
+    # Then: the event is still found
+    assert _ids(search_events(session, None, None, None)) == [event.id]
+
+
+def test_catalog_pages_match_sql_cursors(session, catalog_event, catalog):
+    # Given: five open events in Tokyo
+    for index in range(5):
+        catalog_event(f"E{index}", "Tokyo", "food", 10 + index)
+
+    # When: reading pages of two forwards and then back
+    first = search_events_page(session, "Tokyo", None, None, limit=2)
+    second = search_events_page(session, "Tokyo", None, None, after=first.next_cursor, limit=2)
+    back = search_events_page(session, "Tokyo", None, None, before=second.prev_cursor, limit=2)
+    expected = _sql(
+        session, search_events_page, "Tokyo", None, None, after=first.next_cursor, limit=2
+    )
+
+    # Then: pages and cursors agree with the SQL implementation
+    assert _ids(second.items) == _ids(expected.items)
+    assert second.next_cursor == expected.next_cursor
+    assert second.prev_cursor == expected.prev_cursor
+    assert _ids(back.items) == _ids(first.items)
+    assert back.prev_cursor is None
+
+
+def test_refresh_replays_changes_committed_while_loading(session, catalog_event):
+    # Given: a catalog whose load returns a snapshot taken before the event was deleted
+    event = catalog_event("A", "Tokyo", "food", 10)
+    catalog = EventCatalog(session.get_bind(), refresh_seconds=60)
+    snapshot = catalog._read_open_events()
+
+    def read_open_events():
+        # 読み込みと並行して COMMIT された削除が届く
+        catalog.apply([EventChange(event.id, {"status": "open"}, None)])
+        return snapshot
+
+    catalog._read_open_events = read_open_events
+
+    # When: refreshing
+    catalog.refresh()
+
+    # Then: the change received during the load is applied on top of the snapshot
+    assert len(snapshot) == 1
+    assert catalog.search(None, None, None) == []
+
+
+@pytest.mark.parametrize("region", ["Tokyo", "Rare"])
+def test_catalog_pages_sparse_and_dense_matches(region):
+    # Given: 300 events where every 30th is in a rare region (read by bit extraction)
+    now = datetime(2030, 1, 1)
+    catalog = EventCatalog(None, refresh_seconds=60)
+    catalog.load(
+        CatalogEvent(
+            id=index,
+            title=f"E{index}",
+            region="Rare" if index % 30 == 0 else "Tokyo",
+            genre="food",
+            venue_address="Shibuya",
+            start_date=now,
+            end_date=now,
+            application_deadline=now,
+            capacity=10,
+            created_at=now + timedelta(minutes=index % 100),
+        )
+        for index in range(1, 301)
+    )
+    expected = sorted(
+        (event for event in catalog.search(None, None, None) if event.region == region),
+        key=lambda event: (event.created_at, event.id),
+        reverse=True,
+    )
+
+    # When: walking all pages of four forwards, then one page back
+    pages = [catalog.page(region, None, None, limit=4)]
+    while pages[-1].next_cursor:
+        pages.append(catalog.page(region, None, None, after=pages[-1].next_cursor, limit=4))
+    back = catalog.page(region, None, None, before=pages[2].prev_cursor, limit=4)
+
+    # Then: pages cover every match once in order and going back returns the previous page
+    assert [event.id for page in pages for event in page.items] == _ids(expected)
+    assert _ids(back.items) == _ids(pages[1].items)
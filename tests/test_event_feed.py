@@ -0,0 +1,140 @@
+import pytest
+from sqlmodel import select
+
+from app.models import EventFeed, Review
+from app.repositories import feed_repo
+from app.services.application_service import apply_to_event, decide_application
+from app.services.auth_service import register_user
+from app.services.feed_service import rebuild_event_feed, recommended_events
+from app.services.profile_service import update_stallholder_profile
+
+
+@pytest.fixture()
+def users(session, users):
+    organizer, admin = users
+    other = register_user(session, "other@example.com", "password123", "organizer")
+    stallholder = register_user(session, "st@example.com", "password123", "stallholder")
+    _set_genre(session, stallholder, "food")
+    return organizer, other, admin, stallholder
+
+
+def _set_genre(session, stallholder, genre: str) -> None:
+    update_stallholder_profile(session, stallholder, "Shop", genre, "", None, None)
+
+
+@pytest.fixture()
+def open_event(session, users, make_event):
+    default_organizer, _, admin, _ = users
+
+    def create(title, region="Tokyo", genre="craft", organizer=None):
+        organizer = organizer or default_organizer
+        return make_event(session, organizer, admin, title=title, region=region, genre=genre)
+
+    return create
+
+
+def _titles(session, stallholder) -> list[str]:
+    return [event.title for event in recommended_events(session, stallholder, limit=50)]
+
+
+def _feed_rows(session) -> set[tuple[int, int, int]]:
+    rows = session.exec(select(EventFeed.stallholder_id, EventFeed.event_id, EventFeed.score))
+    return set(rows.all())
+
+
+def test_feed_ranks_matching_genre_first(session, users, open_event):
+    # Given: open events in the stallholder's genre and in another genre
+    open_event("craft-market")
+    open_event("food-festival", genre="food")
+
+    # When / Then: only the genre match is recommended (no other signal yet)
+    _, _, _, stallholder = users
+    assert _titles(session, stallholder) == ["food-festival"]
+
+
+def test_feed_uses_past_approvals_and_ratings(session, users, open_event):
+    # Given: an approved application in Osaka with the first organizer,
+    # and a five-star rating for the other organizer
+    organizer, other, _, stallholder = users
+    past = open_event("past", region="Osaka")
+    application = apply_to_event(session, past, stallholder, None)
+    decide_application(session, organizer, application.id, approved=True)
+    review = Review(
+        application_id=application.id,
+        author_id=stallholder.id,
+        target_id=other.id,
+        score=5,
+        comment="great",
+    )
+    session.add(review)
+    session.commit()
+
+    # When: events open for each signal
+    open_event("osaka-same-organizer", region="Osaka")
+    open_event("tokyo-same-organizer")
+    open_event("rated-organizer", organizer=other)
+    open_event("food-rated-organizer", "Nagoya", "food", organizer=other)
+
+    # Then: scores add up per signal and the applied event is not recommended
+    assert _titles(session, stallholder) == [
+        "food-rated-organizer",  # ジャンル 40 + 評価 15
+        "osaka-same-organizer",  # 地域 30 + 主催者 15
+        "rated-organizer",  # 評価 15
+        "tokyo-same-organizer",  # 主催者 15（新しい方が先）
+    ]
+
+
+def test_incremental_updates_match_rebuild(session, users, open_event):
+    # Given: events that open, change genre and close
+    _, _, _, stallholder = users
+    first = open_event("first", genre="food")
+    second = open_event("second")
+    second.genre = "food"
+    session.add(second)
+    first.status = "closed"
+    session.add(first)
+    session.commit()
+    open_event("third", genre="food")
+    incremental = _feed_rows(session)
+
+    # When: rebuilding the whole feed
+    rebuild_event_feed(session)
+
+    # Then: the incrementally maintained rows are the same
+    assert incremental == _feed_rows(session)
+    assert _titles(session, stallholder) == ["third", "second"]
+
+
+def test_profile_change_and_application_refresh_feed(session, users, open_event):
+    # Given: a stallholder whose genre matches one event
+    _, _, _, stallholder = users
+    food = open_event("food-event", genre="food")
+    open_event("craft-event")
+
+    # When: the profile genre changes, then the stallholder applies
+    _set_genre(session, stallholder, "craft")
+    after_profile = _titles(session, stallholder)
+    _set_genre(session, stallholder, "food")
+    apply_to_event(session, food, stallholder, None)
+
+    # Then: the feed follows the profile and drops applied events
+    assert after_profile == ["craft-event"]
+    assert _titles(session, stallholder) == []
+
+
+def test_feed_keeps_only_top_entries(session, users, open_event, monkeypatch):
+    # Given: a feed limited to two entries per stallholder
+    monkeypatch.setattr(feed_repo, "FEED_SIZE", 2)
+    _, _, _, stallholder = users
+    for index in range(3):
+        open_event(f"food-{index}", genre="food")
+
+    # When: an event opens with a lower score, and then one with the same score
+    open_event("craft")
+    low = _titles(session, stallholder)
+    open_event("food-new", genre="food")
+
+    # Then: only the best two (newest first on ties) are kept
+    assert low == ["food-2", "food-1"]
+    assert _titles(session, stallholder) == ["food-new", "food-2"]
+    assert len(_feed_rows(session)) == 2
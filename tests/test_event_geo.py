@@ -0,0 +1,238 @@
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import Session, SQLModel, create_engine, select, text
+
+from app.errors import ValidationError
+from app.migrations import MIGRATIONS, run_migrations
+from app.models import Event
+from app.repositories.event_geo_repo import GeoRadius, event_geo, within_radius
+from app.services.event_catalog import attach_event_catalog, detach_event_catalogs
+from app.services.event_service import (
+    _search_statement,
+    search_events,
+    search_events_page,
+)
+
+TOKYO_STATION = (35.6812, 139.7671)
+PLACES = {
+    "tokyo": TOKYO_STATION,
+    "shinjuku": (35.6896, 139.7006),  # 約 6 km
+    "yokohama": (35.4437, 139.6380),  # 約 29 km
+    # 30 km の外接矩形の内側だが円の外（約 32 km）
+    "corner": (35.8812, 140.0171),
+    "osaka": (34.7025, 135.4959),  # 約 400 km
+}
+
+
+def _at(location) -> dict:
+    return {"latitude": location[0], "longitude": location[1]}
+
+
+@pytest.fixture()
+def places(session, users, make_event):
+    organizer, admin = users
+    events = {
+        name: make_event(session, organizer, admin, title=name, region="Kanto", **_at(place))
+        for name, place in PLACES.items()
+    }
+    events["nowhere"] = make_event(session, organizer, admin, title="nowhere", region="Kanto")
+    return events
+
+
+def _titles(events) -> set[str]:
+    return {event.title for event in events}
+
+
+@pytest.mark.parametrize(
+    ("radius_km", "expected"),
+    [
+        (1, {"tokyo"}),
+        (10, {"tokyo", "shinjuku"}),
+        (30, {"tokyo", "shinjuku", "yokohama"}),
+        (500, {"tokyo", "shinjuku", "yokohama", "corner", "osaka"}),
+    ],
+)
+def test_search_events_within_radius(session, places, radius_km, expected):
+    # Given: open events around Tokyo and in Osaka, and one without coordinates
+
+    # When: searching within the radius of Tokyo Station
+    found = search_events(session, None, None, None, near=GeoRadius(*TOKYO_STATION, radius_km))
+
+    # Then: only events inside the circle are returned
+    assert _titles(found) == expected
+
+
+def test_search_within_radius_combines_with_other_filters(session, users, make_event, places):
+    # Given: a draft next to Tokyo Station and an open event in another region nearby
+    organizer, admin = users
+    make_event(session, organizer, title="draft", region="Kanto", **_at(TOKYO_STATION))
+    make_event(session, organizer, admin, title="other-region", **_at(PLACES["shinjuku"]))
+
+    # When: searching within 10 km in the Kanto region, one page at a time
+    near = GeoRadius(*TOKYO_STATION, 10)
+    page = search_events_page(session, "Kanto", None, None, near=near, limit=1)
+    rest = search_events_page(session, "Kanto", None, None, near=near, after=page.next_cursor)
+
+    # Then: only open Kanto events are returned, newest first
+    assert [event.title for event in page.items + rest.items] == ["shinjuku", "tokyo"]
+
+
+def test_near_search_bypasses_catalog(session, places):
+    # Given: an attached in-process catalog (which has no spatial index)
+    attach_event_catalog(session.get_bind())
+    try:
+        # When: searching with and without a radius
+        near = search_events(session, None, None, None, near=GeoRadius(*TOKYO_STATION, 10))
+        everything = search_events(session, None, None, None)
+    finally:
+        detach_event_catalogs()
+
+    # Then: the radius is still applied
+    assert _titles(near) == {"tokyo", "shinjuku"}
+    assert len(everything) == len(places)
+
+
+def test_update_event_moves_and_clears_spatial_index(session, users, make_event, edit_event):
+    # Given: a draft in Tokyo
+    organizer, _ = users
+    event = make_event(session, organizer, title="moving", **_at(TOKYO_STATION))
+
+    # When: moving it to Osaka, then clearing the coordinates
+    edit_event(session, organizer, event, **_at(PLACES["osaka"]))
+    moved = session.exec(select(event_geo.c.min_lat, event_geo.c.min_lng)).all()
+    edit_event(session, organizer, event, latitude=None, longitude=None)
+    cleared = session.exec(select(event_geo.c.id)).all()
+
+    # Then: the R*Tree follows the event row
+    assert [(round(lat, 2), round(lng, 2)) for lat, lng in moved] == [(34.70, 135.50)]
+    assert cleared == []
+
+
+def test_direct_session_changes_move_spatial_index(session, users, make_event):
+    # Given: an open event without coordinates
+    organizer, admin = users
+    event = make_event(session, organizer, admin, title="direct", region="Kanto")
+
+    # When: setting its location directly on the session
+    event.latitude, event.longitude = TOKYO_STATION
+    session.add(event)
+    session.commit()
+
+    # Then: the radius search finds it through the R*Tree
+    found = search_events(session, None, None, None, near=GeoRadius(*TOKYO_STATION, 1))
+    assert _titles(found) == {"direct"}
+
+
+@pytest.mark.parametrize(
+    ("center", "expected"),
+    [
+        ((35.0, 139.0), [(34.91, 35.09, 138.89, 139.11)]),
+        ((-17.0, 179.95), [(-17.09, -16.91, 179.86, 180.0), (-17.09, -16.91, -180.0, -179.96)]),
+        ((-17.0, -179.95), [(-17.09, -16.91, 179.96, 180.0), (-17.09, -16.91, -180.0, -179.86)]),
+        ((89.95, 0.0), [(89.86, 90.0, -180.0, 180.0)]),
+    ],
+)
+def test_bounding_boxes_split_at_antimeridian_and_open_at_poles(center, expected):
+    # Given / When: a 10 km radius in Japan, on either side of 180°, and next to the North Pole
+    boxes = GeoRadius(*center, 10).bounding_boxes()
+
+    # Then: latitude is clamped, boxes are split at ±180° and longitude is unbounded at the pole
+    assert [tuple(round(value, 2) for value in box) for box in boxes] == expected
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_search_within_radius_across_antimeridian_and_pole(session, users, make_event, use_index):
+    # Given: events on both sides of 180° in Fiji and on both sides of the North Pole
+    organizer, admin = users
+    for title, place in [
+        ("fiji-east", (-17.0, 179.95)),
+        ("fiji-west", (-17.0, -179.95)),
+        ("fiji-far", (-17.0, 178.0)),
+        ("pole-near", (89.95, 0.0)),
+        ("pole-across", (89.95, 180.0)),
+    ]:
+        make_event(session, organizer, admin, title=title, **_at(place))
+
+    def near(center):
+        statement = select(Event.title).where(*within_radius(GeoRadius(*center, 20), use_index))
+        return set(session.exec(statement).all())
+
+    # When / Then: both sides are found through the index and the column ranges
+    assert near((-17.0, 179.99)) == {"fiji-east", "fiji-west"}
+    assert near((-17.0, -179.99)) == {"fiji-east", "fiji-west"}
+    assert near((89.95, 90.0)) == {"pole-near", "pole-across"}
+
+
+@pytest.mark.parametrize(
+    ("location", "error"),
+    [((35.0, None), "location_incomplete"), ((91.0, 139.0), "location_invalid")],
+)
+def test_create_event_rejects_invalid_location(session, users, make_event, location, error):
+    # Given / When / Then: a partial or out-of-range location is rejected
+    organizer, _ = users
+    with pytest.raises(ValidationError, match=error):
+        make_event(session, organizer, title="bad", **_at(location))
+
+
+def test_radius_search_plan_reads_rtree(session):
+    # Given: the radius search statement
+    statement = _search_statement(None, None, None, near=GeoRadius(*TOKYO_STATION, 30)).limit(21)
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # When: explaining the query
+    plan = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    # Then: candidates come from the R*Tree and events are looked up by primary key
+    steps = [row[-1] for row in plan]
+    assert any(step.startswith("SCAN event_geo VIRTUAL TABLE INDEX") for step in steps)
+    assert any(step.startswith("SEARCH event USING INTEGER PRIMARY KEY") for step in steps)
+    assert not any(step == "SCAN event" for step in steps)
+
+
+def test_migration_adds_location_columns(tmp_path):
+    # Given: a database whose event table predates the location columns
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE event (id INTEGER PRIMARY KEY, title VARCHAR)"))
+    location = next(m for m in MIGRATIONS if m.name == "event_venue_location")
+
+    # When: running the migration
+    run_migrations(engine, [location])
+
+    # Then: the columns are added and the R*Tree is created
+    columns = {column["name"] for column in inspect(engine).get_columns("event")}
+    assert {"latitude", "longitude"} <= columns
+    assert "event_geo" in inspect(engine).get_table_names()
+    engine.dispose()
+
+
+def test_migration_backfills_rtree(tmp_path):
+    # Given: an event with a location stored before the R*Tree existed
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO user "
+                "(email, hashed_password, role, is_active, created_at, updated_at) "
+                "VALUES ('org@old.example', 'x', 'organizer', 1, '2020-01-01', '2020-01-01')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO event (organizer_id, title, description, region, venue_address, "
+                "genre, start_date, end_date, application_deadline, capacity, status, latitude, "
+                "longitude, created_at, updated_at) VALUES (1, 'legacy', '', 'Tokyo', '', "
+                "'food', '2020-02-01', '2020-02-01', '2020-01-15', 1, 'open', 35.68, 139.76, "
+                "'2020-01-01', '2020-01-01')"
+            )
+        )
+
+    # When: running migrations
+    run_migrations(engine)
+
+    # Then: the existing location is found by a radius search
+    with Session(engine) as session:
+        found = search_events(session, None, None, None, near=GeoRadius(*TOKYO_STATION, 5))
+    assert [event.title for event in found] == ["legacy"]
+    engine.dispose()
@@ -0,0 +1,152 @@
+from app.services.auth_service import register_user
+from app.services.event_service import search_all_events_by_keyword, search_events_page
+
+
+def test_keyword_search_ranks_fts_matches(session, make_event):
+    # Given: open events mentioning the keyword a different number of times
+    organizer = register_user(session, "fts@example.com", "password123", "organizer")
+    once = make_event(
+        session,
+        organizer,
+        status="open",
+        title="週末マルシェ",
+        description="手作り雑貨の出店",
+    )
+    twice = make_event(
+        session,
+        organizer,
+        status="open",
+        title="手作り市",
+        description="手作り雑貨と手作りパンのイベント",
+    )
+    make_event(session, organizer, status="open", title="古本市", description="古書の販売")
+
+    # When: searching with a Japanese keyword of 3+ characters
+    page = search_events_page(session, None, None, None, keyword="手作り")
+
+    # Then: only matching events are returned, more relevant first
+    assert [event.id for event in page.items] == [twice.id, once.id]
+    assert page.next_cursor is None
+
+
+def test_keyword_search_pages_through_ranked_results(session, make_event):
+    # Given: five open events matching the keyword, some equally relevant
+    organizer = register_user(session, "fts-page@example.com", "password123", "organizer")
+    for index in range(5):
+        make_event(
+            session,
+            organizer,
+            status="open",
+            title=f"手作り市 {index}",
+            description="手作り" * (index % 2 + 1),
+        )
+    ranked = [e.id for e in search_events_page(session, None, None, None, keyword="手作り").items]
+
+    # When: reading them two at a time, then going back from the last page
+    first = search_events_page(session, None, None, None, keyword="手作り", limit=2)
+    second = search_events_page(
+        session, None, None, None, keyword="手作り", after=first.next_cursor, limit=2
+    )
+    third = search_events_page(
+        session, None, None, None, keyword="手作り", after=second.next_cursor, limit=2
+    )
+    back = search_events_page(
+        session, None, None, None, keyword="手作り", before=third.prev_cursor, limit=2
+    )
+
+    # Then: the pages follow the relevance order without gaps or duplicates
+    assert [e.id for page in (first, second, third) for e in page.items] == ranked
+    assert third.next_cursor is None
+    assert [e.id for e in back.items] == [e.id for e in second.items]
+
+
+def test_keyword_search_short_term_falls_back_to_like(session, make_event):
+    # Given: open events in different regions
+    organizer = register_user(session, "fts2@example.com", "password123", "organizer")
+    tokyo = make_event(
+        session,
+        organizer,
+        status="open",
+        title="夏祭り",
+        description="屋台",
+        region="東京都",
+    )
+    make_event(
+        session,
+        organizer,
+        status="open",
+        title="秋祭り",
+        description="屋台",
+        region="大阪府",
+    )
+
+    # When: searching with a 2-character keyword
+    page = search_events_page(session, None, None, None, keyword="東京")
+
+    # Then: the LIKE fallback finds the event
+    assert [event.id for event in page.items] == [tokyo.id]
+
+
+def test_keyword_search_respects_status_and_filters(session, make_event):
+    # Given: a matching draft event and a matching open event in another genre
+    organizer = register_user(session, "fts3@example.com", "password123", "organizer")
+    make_event(session, organizer, status="draft", title="クラフト展", description="木工")
+    make_event(
+        session,
+        organizer,
+        status="open",
+        title="クラフト市",
+        description="木工",
+        genre="craft",
+    )
+
+    # When: searching open events with a genre filter
+    page = search_events_page(session, None, "food", None, keyword="クラフト")
+
+    # Then: nothing matches
+    assert page.items == []
+
+
+def test_update_event_reindexes_text(session, make_event, edit_event):
+    # Given: a draft event
+    organizer = register_user(session, "fts4@example.com", "password123", "organizer")
+    event = make_event(session, organizer, status="draft", title="春のマルシェ", description="花")
+
+    # When: renaming the event
+    edit_event(session, organizer, event, title="初夏のフリーマーケット")
+
+    # Then: admin search finds the new title only
+    assert search_all_events_by_keyword(session, "マルシェ").items == []
+    assert [e.id for e in search_all_events_by_keyword(session, "フリーマーケット").items] == [
+        event.id
+    ]
+
+
+def test_keyword_search_treats_operators_as_text(session, make_event):
+    # Given: an open event
+    organizer = register_user(session, "fts5@example.com", "password123", "organizer")
+    make_event(session, organizer, status="open", title="Night Market", description="street food")
+
+    # When: searching with FTS syntax characters
+    page = search_events_page(session, None, None, None, keyword='market" NOT "night')
+
+    # Then: the query does not fail and matches nothing extra
+    assert page.items == []
+
+
+def test_direct_session_changes_reindex_text(session, make_event):
+    # Given: an open event added directly on the session
+    organizer = register_user(session, "fts6@example.com", "password123", "organizer")
+    event = make_event(session, organizer, status="open", title="春のマルシェ")
+    removed = make_event(session, organizer, status="open", title="秋のマルシェ")
+
+    # When: renaming one and deleting the other without going through the services
+    event.title = "初夏のフリーマーケット"
+    session.add(event)
+    session.delete(removed)
+    session.commit()
+
+    # Then: the full-text index follows the rows
+    assert search_events_page(session, None, None, None, keyword="マルシェ").items == []
+    found = search_events_page(session, None, None, None, keyword="フリーマーケット")
+    assert [e.id for e in found.items] == [event.id]
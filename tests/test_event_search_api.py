@@ -0,0 +1,180 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import Session, create_engine, select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import build_async_engine, create_schema, to_async_url
+from app.errors import ValidationError
+from app.repositories.event_geo_repo import GeoRadius
+from app.repositories.event_repo import save_event
+from app.services.auth_service import register_user
+from app.services.event_service import (
+    EVENT_SORTS,
+    EVENT_SUMMARY_COLUMNS,
+    _search_conditions,
+    search_event_summaries_async,
+)
+
+
+@pytest.fixture()
+def db_url(tmp_path) -> str:
+    return f"sqlite:///{tmp_path / 'api.db'}"
+
+
+@pytest.fixture()
+def file_session(db_url) -> Session:
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    create_schema(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _search(db_url: str, **filters):
+    async def runner():
+        async_engine = build_async_engine(to_async_url(db_url))
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                return await search_event_summaries_async(session, **filters)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(runner())
+
+
+@pytest.fixture()
+def open_event(make_event):
+    def create(session, organizer, admin, title, region, genre, starts_in: int, deadline_in: int):
+        start = datetime.now(timezone.utc) + timedelta(days=starts_in)
+        return make_event(
+            session,
+            organizer,
+            admin,
+            title=title,
+            region=region,
+            genre=genre,
+            start=start,
+            deadline_days=starts_in - deadline_in,
+        )
+
+    return create
+
+
+@pytest.fixture()
+def events(file_session, open_event):
+    organizer = register_user(file_session, "org@example.com", "password123", "organizer")
+    admin = register_user(
+        file_session, "admin@example.com", "password123", "admin", allow_admin=True
+    )
+    return {
+        "tokyo_food": open_event(file_session, organizer, admin, "A", "Tokyo", "food", 30, 3),
+        "osaka_craft": open_event(file_session, organizer, admin, "B", "Osaka", "craft", 10, 8),
+        "nagoya_food": open_event(file_session, organizer, admin, "C", "Nagoya", "food", 20, 5),
+        "tokyo_art": open_event(file_session, organizer, admin, "D", "Tokyo", "art", 40, 1),
+    }
+
+
+def test_search_with_region_and_genre_lists(db_url, events):
+    # Given: open events in three regions and three genres
+
+    # When: searching two regions and two genres
+    page = _search(db_url, regions=["Tokyo", "Osaka"], genres=["food", "craft"])
+
+    # Then: only events matching one of each list are returned, newest first
+    assert [row.title for row in page.items] == ["B", "A"]
+
+
+def test_search_sorted_by_start_date_pages_with_cursor(db_url, events):
+    # Given: four open events with different start dates
+
+    # When: reading two pages sorted by start date
+    first = _search(db_url, sort="start_date", limit=2)
+    second = _search(db_url, sort="start_date", limit=2, after=first.next_cursor)
+
+    # Then: events come soonest first without overlap
+    assert [row.title for row in first.items] == ["B", "C"]
+    assert [row.title for row in second.items] == ["A", "D"]
+    assert second.next_cursor is None
+    back = _search(db_url, sort="start_date", limit=2, before=second.prev_cursor)
+    assert [row.title for row in back.items] == ["B", "C"]
+
+
+def test_search_sorted_by_deadline_with_date_range(db_url, events):
+    # Given: events starting in 10, 20, 30 and 40 days
+    today = datetime.now(timezone.utc).date()
+
+    # When: searching days 15〜35 sorted by application deadline
+    page = _search(
+        db_url,
+        date_value=today + timedelta(days=15),
+        date_until=today + timedelta(days=35),
+        sort="deadline",
+    )
+
+    # Then: only running events are returned, earliest deadline first
+    assert [row.title for row in page.items] == ["A", "C"]
+
+
+def test_search_rejects_unknown_sort(db_url, events):
+    # Given / When / Then: an unsupported sort key is rejected
+    with pytest.raises(ValidationError):
+        _search(db_url, sort="title")
+
+
+@pytest.mark.parametrize("sort", sorted(EVENT_SORTS))
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"region": ["Tokyo"]},
+        {"region": ["Tokyo", "Osaka"], "genre": ["food", "craft"]},
+        {"genre": ["food", "art"]},
+        {"date_value": datetime(2030, 1, 1).date(), "date_until": datetime(2030, 1, 31).date()},
+    ],
+)
+def test_search_plans_use_indexes(session, filters, sort):
+    # Given: an API search statement for the filter combination and sort
+    sort_column, descending = EVENT_SORTS[sort]
+    statement = (
+        select(*EVENT_SUMMARY_COLUMNS)
+        .where(
+            *_search_conditions(
+                filters.get("region"),
+                filters.get("genre"),
+                filters.get("date_value"),
+                filters.get("date_until"),
+            )
+        )
+        .order_by(sort_column.desc() if descending else sort_column)
+        .limit(21)
+    )
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # When: explaining the query
+    plan = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    # Then: the event table is searched through an index, never fully scanned
+    details = " / ".join(row[-1] for row in plan)
+    assert "SCAN event" not in details
+    assert "USING INDEX" in details or "USING COVERING INDEX" in details
+
+
+def test_search_within_radius_returns_coordinates(db_url, file_session, events, open_event):
+    # Given: one open event with a venue location in Tokyo
+    organizer = register_user(file_session, "geo@example.com", "password123", "organizer")
+    admin = register_user(
+        file_session, "geo-admin@example.com", "password123", "admin", allow_admin=True
+    )
+    located = open_event(file_session, organizer, admin, "Geo", "Tokyo", "food", 5, 2)
+    located.latitude, located.longitude = 35.6812, 139.7671
+    save_event(file_session, located)
+
+    # When: searching within 10 km of Shinjuku
+    page = _search(db_url, near=GeoRadius(35.6896, 139.7006, 10))
+
+    # Then: only the located event is returned with its coordinates
+    assert [(row.title, row.latitude, row.longitude) for row in page.items] == [
+        ("Geo", 35.6812, 139.7671)
+    ]
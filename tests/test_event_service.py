@@ -1,11 +1,13 @@
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from app.errors import AuthorizationError, ValidationError
 from app.services.auth_service import register_user
+from sqlalchemy import text
 from sqlmodel import select
 
-from app.models import Application, Notification, User
+from app.models import Application, EventDay, Notification, User
 from app.services.event_service import (
+    _search_statement,
     create_event,
     search_events,
     submit_event_for_review,
@@ -539,3 +541,98 @@ def test_update_event_notifies_approved_applicants(session):
         )
     ).first()
     assert notif is not None
+
+
+def test_search_events_by_date_range(session, make_event):
+    # Given: open events on different weeks
+    organizer = register_user(session, "org-range@example.com", "password123", "organizer")
+    base = datetime(2026, 5, 1, 10, 0, tzinfo=timezone.utc)
+    for title, offset, days in [("Week 1", 0, 1), ("Week 2", 7, 2), ("Week 4", 21, 0)]:
+        start = base + timedelta(days=offset)
+        make_event(session, organizer, status="open", title=title, start=start, days=days)
+
+    # When: searching a range overlapping the first two events
+    results = search_events(
+        session,
+        region=None,
+        genre=None,
+        date_value=date(2026, 5, 2),
+        date_until=date(2026, 5, 8),
+    )
+
+    # Then: events running on any day in the range are returned once
+    assert sorted(event.title for event in results) == ["Week 1", "Week 2"]
+
+
+def test_update_event_reindexes_event_days(session):
+    # Given: a draft event on May 1st
+    organizer = register_user(session, "org-days@example.com", "password123", "organizer")
+    base = datetime(2026, 5, 1, 10, 0, tzinfo=timezone.utc)
+    event = create_event(
+        session,
+        organizer,
+        title="Movable",
+        description="Desc",
+        region="Tokyo",
+        venue_address="Shibuya",
+        genre="food",
+        start_date=base,
+        end_date=base,
+        application_deadline=base - timedelta(days=1),
+        capacity=10,
+    )
+
+    # When: moving it to June 10th-11th
+    moved = base.replace(month=6, day=10)
+    update_event(
+        session,
+        organizer,
+        event.id,
+        title="Movable",
+        description="Desc",
+        region="Tokyo",
+        venue_address="Shibuya",
+        genre="food",
+        start_date=moved,
+        end_date=moved + timedelta(days=1),
+        application_deadline=moved - timedelta(days=1),
+        capacity=10,
+    )
+
+    # Then: event_day rows follow the new dates
+    days = session.exec(select(EventDay.day).where(EventDay.event_id == event.id)).all()
+    assert sorted(days) == [date(2026, 6, 10), date(2026, 6, 11)]
+
+
+def test_direct_session_changes_reindex_event_days(session, make_event):
+    # Given: an open event on May 1st
+    organizer = register_user(session, "org-direct@example.com", "password123", "organizer")
+    base = datetime(2026, 5, 1, 10, 0, tzinfo=timezone.utc)
+    event = make_event(session, organizer, status="open", start=base, days=0)
+
+    # When: moving it to June 10th-11th directly on the session, then deleting it
+    event.start_date = base.replace(month=6, day=10)
+    event.end_date = base.replace(month=6, day=11)
+    session.add(event)
+    session.commit()
+    moved = session.exec(select(EventDay.day).where(EventDay.event_id == event.id)).all()
+    session.delete(event)
+    session.commit()
+
+    # Then: event_day rows follow the row without going through save_event
+    assert sorted(moved) == [date(2026, 6, 10), date(2026, 6, 11)]
+    assert session.exec(select(EventDay)).all() == []
+
+
+def test_search_events_by_date_uses_event_day_index(session):
+    # Given: the date-filtered search statement
+    statement = _search_statement(None, None, date(2026, 5, 1))
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # When: explaining the query
+    plan = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    # Then: lookup starts from the event_day day index
+    details = " / ".join(row[-1] for row in plan)
+    assert "ix_event_day_day_event (day=?)" in details
+    assert "SCAN event" not in details
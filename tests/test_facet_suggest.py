@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from app.errors import ValidationError
+from app.services.event_catalog import attach_event_catalog, detach_event_catalogs
+from app.services.event_service import suggest_facet
+from app.services.prefix_index import PrefixIndex, normalize
+
+
+def _index(counts: dict[str, int]) -> PrefixIndex:
+    index = PrefixIndex()
+    for value, count in counts.items():
+        index.add(value, count)
+    return index
+
+
+def test_prefix_index_returns_top_matches_by_count():
+    # Given: regions with different event counts
+    index = _index({"東京都": 5, "東京都港区": 9, "栃木県": 7, "東大阪市": 5, "大阪府": 20})
+
+    # When: suggesting for a prefix
+    found = index.suggest("東", 3)
+
+    # Then: only matching values, most events first and ties by value
+    assert found == [("東京都港区", 9), ("東京都", 5), ("東大阪市", 5)]
+    assert index.suggest("奈良", 3) == []
+
+
+def test_prefix_index_ignores_case_and_width():
+    # Given: genres written in different cases and widths
+    index = _index({"Food": 2, "ｆｏｏｄ truck": 1, "craft": 3})
+
+    # When / Then: the prefix matches regardless of case and full-width letters
+    assert index.suggest("FO", 5) == [("Food", 2), ("ｆｏｏｄ truck", 1)]
+
+
+def test_prefix_index_removes_values_without_events():
+    # Given: a value whose events are all closed
+    index = _index({"Tokyo": 1, "Toyama": 2})
+
+    # When: decrementing it to zero
+    index.add("Tokyo", -1)
+
+    # Then: it is no longer suggested
+    assert index.suggest("To", 5) == [("Toyama", 2)]
+    assert len(index) == 1
+
+
+def test_prefix_index_matches_brute_force():
+    # Given: a random vocabulary with incremental updates
+    rng = random.Random(7)
+    alphabet = "abcdeあいう"
+    index = PrefixIndex()
+    counts: dict[str, int] = {}
+    for _ in range(3000):
+        value = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+        delta = rng.choice([1, 1, 1, -1])
+        if counts.get(value, 0) + delta < 0:
+            continue
+        counts[value] = counts.get(value, 0) + delta
+        index.add(value, delta)
+
+    for prefix in ["", "a", "ab", "あ", "cde", "zz"]:
+        # When: suggesting with short and long prefixes (both lookup strategies)
+        found = index.suggest(prefix, 5)
+
+        # Then: the result equals a full scan
+        expected = sorted(
+            (
+                (value, count)
+                for value, count in counts.items()
+                if count > 0 and normalize(value).startswith(prefix)
+            ),
+            key=lambda item: (-item[1], item[0]),
+        )[:5]
+        assert found == expected
+
+
+@pytest.fixture(params=["catalog", "sql"])
+def source(request, session):
+    if request.param == "catalog":
+        attach_event_catalog(session.get_bind()).refresh_seconds = float("inf")
+    yield request.param
+    detach_event_catalogs()
+
+
+def test_suggest_facet_follows_open_events(session, users, make_event, source):
+    # Given: open events in three regions
+    organizer, admin = users
+    make_event(session, organizer, admin, region="Tokyo", genre="food")
+    make_event(session, organizer, admin, region="Tokyo", genre="craft")
+    closing = make_event(session, organizer, admin, region="Toyama", genre="food")
+    make_event(session, organizer, admin, region="Osaka", genre="food")
+    before = suggest_facet(session, "region", "To")
+
+    # When: one event is closed
+    closing.status = "closed"
+    session.add(closing)
+    session.commit()
+
+    # Then: suggestions reflect open events only, most events first
+    assert before == [("Tokyo", 2), ("Toyama", 1)]
+    assert suggest_facet(session, "region", "To") == [("Tokyo", 2)]
+    assert suggest_facet(session, "genre", "", limit=1) == [("food", 2)]
+
+
+def test_suggest_facet_rejects_unknown_facet(session):
+    # Given / When / Then: only region and genre can be suggested
+    with pytest.raises(ValidationError):
+        suggest_facet(session, "title", "a")
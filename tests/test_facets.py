@@ -0,0 +1,70 @@
+from sqlalchemy import text
+
+from app.migrations import MIGRATIONS
+from app.repositories.facet_repo import list_open_event_facets
+
+
+def test_approve_event_increments_facets(session, users, make_event):
+    # Given: two events approved and one left as draft
+    organizer, admin = users
+    make_event(session, organizer, admin, region="Tokyo", genre="food")
+    make_event(session, organizer, admin, region="Tokyo", genre="craft")
+    make_event(session, organizer, region="Osaka", genre="food")
+
+    # When: reading facets
+    facets = list_open_event_facets(session)
+
+    # Then: only open events are counted
+    assert facets["region"] == [("Tokyo", 2)]
+    assert facets["genre"] == [("craft", 1), ("food", 1)]
+
+
+def test_status_and_region_changes_move_counts(session, users, make_event):
+    # Given: two open events in Tokyo
+    organizer, admin = users
+    first = make_event(session, organizer, admin, region="Tokyo", genre="food")
+    second = make_event(session, organizer, admin, region="Tokyo", genre="food")
+
+    # When: closing one and moving the other to Osaka directly on the session
+    first.status = "closed"
+    second.region = "Osaka"
+    session.add(first)
+    session.add(second)
+    session.commit()
+
+    # Then: counts follow the changes and empty values disappear
+    facets = list_open_event_facets(session)
+    assert facets["region"] == [("Osaka", 1)]
+    assert facets["genre"] == [("food", 1)]
+
+
+def test_rolled_back_change_keeps_facets(session, users, make_event):
+    # Given: an open event
+    organizer, admin = users
+    event = make_event(session, organizer, admin, region="Tokyo", genre="food")
+
+    # When: closing it and rolling back after the flush
+    event.status = "closed"
+    session.add(event)
+    session.flush()
+    session.rollback()
+
+    # Then: facet counts are unchanged
+    assert list_open_event_facets(session)["region"] == [("Tokyo", 1)]
+
+
+def test_facet_backfill_migration_matches_events(session, users, make_event):
+    # Given: open events and a wiped facet table
+    organizer, admin = users
+    make_event(session, organizer, admin, region="Tokyo", genre="food")
+    make_event(session, organizer, admin, region="Nagoya", genre="food")
+    expected = list_open_event_facets(session)
+    session.exec(text("DELETE FROM event_facet"))
+
+    # When: running the backfill operations
+    backfill = next(m for m in MIGRATIONS if m.name == "backfill_event_facets")
+    for operation in backfill.operations:
+        operation.apply(session.connection())
+
+    # Then: the rebuilt facets equal the incrementally maintained ones
+    assert list_open_event_facets(session) == expected
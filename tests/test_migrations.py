@@ -0,0 +1,151 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import SQLModel, create_engine, select
+
+from app.migrations import MIGRATIONS, AddColumn, applied_versions, run_migrations
+from app.models import Application, Notification
+
+
+def _index_columns(engine, table: str) -> dict[str, list[str]]:
+    return {index["name"]: index["column_names"] for index in inspect(engine).get_indexes(table)}
+
+
+def _legacy_engine(tmp_path):
+    # 旧インデックス構成の既存 DB を再現する
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_application_event_status_created"))
+        conn.execute(text("DROP INDEX ix_notification_user_created"))
+        conn.execute(
+            text(
+                "CREATE INDEX ix_application_event_status_created "
+                "ON application (event_id, stallholder_id, status, created_at)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX ix_notification_user_status_created "
+                "ON notification (user_id, is_read, created_at, delivery_status)"
+            )
+        )
+        conn.execute(text("CREATE INDEX ix_notification_user_id ON notification (user_id)"))
+    return engine
+
+
+def _plan(engine, statement) -> str:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return " / ".join(row[-1] for row in rows)
+
+
+def test_run_migrations_rebuilds_legacy_indexes(tmp_path):
+    # Given: an existing database with the old index layout
+    engine = _legacy_engine(tmp_path)
+
+    # When: running migrations
+    applied = run_migrations(engine)
+
+    # Then: old indexes are replaced and the version is recorded
+    application_indexes = _index_columns(engine, "application")
+    notification_indexes = _index_columns(engine, "notification")
+    assert applied == [migration.version for migration in MIGRATIONS]
+    assert application_indexes["ix_application_event_status_created"] == [
+        "event_id",
+        "status",
+        "created_at",
+    ]
+    assert "ix_notification_user_status_created" not in notification_indexes
+    assert "ix_notification_user_id" not in notification_indexes
+    assert notification_indexes["ix_notification_user_created"] == ["user_id", "created_at"]
+    assert applied_versions(engine) == {migration.version for migration in MIGRATIONS}
+
+
+def test_run_migrations_is_idempotent(tmp_path):
+    # Given: a fresh database already migrated
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
+    before = _index_columns(engine, "event")
+
+    # When: running migrations again
+    applied = run_migrations(engine)
+
+    # Then: nothing is applied and indexes are unchanged
+    assert applied == []
+    assert _index_columns(engine, "event") == before
+
+
+def test_hot_queries_use_revised_indexes(tmp_path):
+    # Given: a migrated database
+    engine = create_engine(f"sqlite:///{tmp_path / 'plan.db'}")
+    SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
+
+    # When: explaining the hot queries
+    application_plan = _plan(
+        engine,
+        select(Application.stallholder_id).where(
+            Application.event_id == 1, Application.status == "approved"
+        ),
+    )
+    notification_plan = _plan(
+        engine,
+        select(Notification)
+        .where(Notification.user_id == 1)
+        .order_by(Notification.created_at.desc(), Notification.id.desc()),
+    )
+
+    # Then: status is part of the index seek and the list needs no sort step
+    assert "ix_application_event_status_created (event_id=? AND status=?)" in application_plan
+    assert "ix_notification_user_created" in notification_plan
+    assert "TEMP B-TREE" not in notification_plan
+
+
+def test_backfill_event_days_for_existing_events(tmp_path):
+    # Given: an existing database with events but no event_day rows
+    engine = create_engine(f"sqlite:///{tmp_path / 'days.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO event (id, organizer_id, title, description, region, venue_address, "
+                "genre, start_date, end_date, application_deadline, capacity, status, "
+                "created_at, updated_at) VALUES (1, 1, 't', 'd', 'r', 'v', 'g', "
+                "'2026-05-01 10:00:00', '2026-05-03 18:00:00', '2026-04-20 00:00:00', 1, "
+                "'open', '2026-01-01 00:00:00', '2026-01-01 00:00:00')"
+            )
+        )
+
+    # When: running migrations
+    run_migrations(engine)
+
+    # Then: one row per running day is created
+    with engine.connect() as conn:
+        days = conn.execute(text("SELECT day FROM event_day WHERE event_id = 1 ORDER BY day"))
+        assert [row[0] for row in days] == ["2026-05-01", "2026-05-02", "2026-05-03"]
+
+
+def test_added_column_types_compile_for_each_dialect():
+    # Given: every column added by a migration
+    added = [
+        operation
+        for migration in MIGRATIONS
+        for operation in migration.operations
+        if isinstance(operation, AddColumn)
+    ]
+
+    # When: compiling the column types for PostgreSQL and SQLite
+    pg_types = {op.name: op.column_sql(postgresql.dialect()) for op in added}
+    sqlite_types = {op.name: op.column_sql(sqlite.dialect()) for op in added}
+
+    # Then: PostgreSQL gets its own type names and SQLite keeps the original DDL
+    assert pg_types == {
+        "latitude": "FLOAT",
+        "longitude": "FLOAT",
+        "attempts": "INTEGER NOT NULL DEFAULT 0",
+        "next_attempt_at": "TIMESTAMP WITHOUT TIME ZONE",
+        "last_error": "VARCHAR",
+    }
+    assert sqlite_types["next_attempt_at"] == "DATETIME"
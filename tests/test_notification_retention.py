@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+from sqlmodel import select
+
+from app.models import Notification, NotificationArchive
+from app.repositories.notification_archive_repo import archive_notifications
+from app.services.auth_service import register_user
+from app.services.notification_retention import compact_notifications
+
+
+def _notification(user, days_ago: int, is_read: bool = True, status: str = "sent"):
+    created_at = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return Notification(
+        user_id=user.id,
+        event_type="news",
+        channel="in_app",
+        title=f"{days_ago} days ago",
+        body="body",
+        related_type="event",
+        related_id=days_ago,
+        delivery_status=status,
+        is_read=is_read,
+        read_at=created_at if is_read else None,
+        created_at=created_at,
+    )
+
+
+def test_compaction_moves_only_old_read_delivered_notifications(session):
+    # Given: old read, old unread, old queued, old failed and recent read notifications
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    session.add_all(
+        [
+            _notification(user, 100),
+            _notification(user, 100, is_read=False),
+            _notification(user, 100, status="queued"),
+            _notification(user, 120, status="failed"),
+            _notification(user, 10),
+        ]
+    )
+    session.commit()
+
+    # When: compacting notifications older than 90 days
+    report = compact_notifications(session, older_than=timedelta(days=90))
+
+    # Then: the two old, read and delivered notifications are archived with their content
+    archived = session.exec(select(NotificationArchive).order_by(NotificationArchive.id)).all()
+    remaining = session.exec(select(Notification)).all()
+    assert report.moved == 2
+    assert [row.related_id for row in archived] == [100, 120]
+    assert all(row.user_id == user.id and row.read_at is not None for row in archived)
+    assert sorted((row.is_read, row.delivery_status) for row in remaining) == [
+        (False, "sent"),
+        (True, "queued"),
+        (True, "sent"),
+    ]
+
+
+def test_compaction_runs_in_chunks_and_pauses_between_them(session):
+    # Given: five archivable notifications
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    session.add_all([_notification(user, 100 + index) for index in range(5)])
+    session.commit()
+    pauses = []
+
+    # When: compacting two at a time
+    report = compact_notifications(
+        session,
+        older_than=timedelta(days=90),
+        chunk_size=2,
+        pause_seconds=0.5,
+        sleep=pauses.append,
+    )
+
+    # Then: three chunks are committed and a second run moves nothing
+    assert (report.moved, report.chunks) == (5, 3)
+    assert pauses == [0.5, 0.5, 0.5]
+    assert compact_notifications(session, older_than=timedelta(days=90)).moved == 0
+
+
+def test_zero_retention_is_not_replaced_by_the_default(session):
+    # Given: a notification read a day ago
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    session.add(_notification(user, 1))
+    session.commit()
+
+    # When: compacting with the default retention, then with zero retention
+    kept = compact_notifications(session).moved
+    moved = compact_notifications(session, older_than=timedelta(0)).moved
+
+    # Then: only the zero retention archives it
+    assert (kept, moved) == (0, 1)
+
+
+def test_compaction_reports_index_sizes(session):
+    # Given: many archivable notifications
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    session.add_all([_notification(user, 100) for _ in range(2000)])
+    session.commit()
+
+    # When: compacting
+    report = compact_notifications(session, older_than=timedelta(days=90))
+
+    # Then: the index shrinks and the saving is reported per index
+    index = "ix_notification_user_created"
+    assert report.bytes_after[index] < report.bytes_before[index]
+    assert report.saved_bytes[index] == report.bytes_before[index] - report.bytes_after[index]
+
+
+def test_archive_skips_notifications_changed_after_listing(session):
+    # Given: a notification listed for archiving, then marked unread again
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    notification = _notification(user, 100)
+    session.add(notification)
+    session.commit()
+    notification.is_read = False
+    session.add(notification)
+    session.commit()
+
+    # When: archiving it by id
+    now = datetime.now(timezone.utc)
+    moved = archive_notifications(session.connection(), [notification.id], now, now)
+    session.commit()
+
+    # Then: it is neither copied nor deleted
+    assert moved == 0
+    assert session.exec(select(NotificationArchive)).all() == []
+    assert session.get(Notification, notification.id) is not None
+
+
+def test_archivable_scan_walks_the_primary_key(session):
+    # Given: the SELECT issued to find archivable notifications
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    session.add(_notification(user, 100))
+    session.commit()
+    executed = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, *args: executed.append((statement, parameters)),
+    )
+    compact_notifications(session, older_than=timedelta(days=90))
+    sql, parameters = next(
+        item for item in executed if item[0].startswith("SELECT notification.id")
+    )
+
+    # When: explaining it
+    rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters)
+    plan = " ".join(str(row) for row in rows)
+
+    # Then: it continues from the last id without an index scan or a sort
+    assert "INTEGER PRIMARY KEY (rowid>?)" in plan
+    assert "TEMP B-TREE" not in plan
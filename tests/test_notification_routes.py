@@ -0,0 +1,108 @@
+import json
+from functools import partial
+
+from sqlmodel import Session
+
+import app.routes.notifications as notification_routes
+from app.models import Notification
+from app.services.auth_service import register_user
+from app.services.notification_hub import stream_notifications
+from app.services.notification_service import create_notification
+
+HTMX = {"HX-Request": "true"}
+
+
+def _seed(client, notifications: int = 1) -> tuple[list[int], int]:
+    """ログインするユーザーの通知 ID と、別のユーザーの通知 ID を返す"""
+    with Session(client.engine) as session:
+        user = register_user(session, "user@example.com", "password123", "stallholder")
+        other = register_user(session, "other@example.com", "password123", "stallholder")
+        ids = [
+            create_notification(session, user, "news", f"Hello {index}", "Body").id
+            for index in range(notifications)
+        ]
+        other_id = create_notification(session, other, "news", "Other", "Body").id
+    client.login("user@example.com")
+    return ids, other_id
+
+
+def _is_read(client, notification_id: int) -> bool:
+    with Session(client.engine) as session:
+        return session.get(Notification, notification_id).is_read
+
+
+def test_empty_inbox_renders_rows_and_template_for_live_notifications(client):
+    # Given: a logged-in user without notifications
+    _seed(client, notifications=0)
+
+    # When: opening the notification list
+    response = client.get("/notifications")
+
+    # Then: the table body and the row template exist, with the empty message shown
+    assert response.status_code == 200
+    assert 'id="notification-rows"' in response.text
+    assert 'id="notification-row-template"' in response.text
+    assert '<p id="notification-empty">' in response.text
+    assert '<div id="notification-list" hidden>' in response.text
+
+
+def test_htmx_read_returns_partial_with_row_states_and_badge(client):
+    # Given: two unread notifications
+    ids, _ = _seed(client, notifications=2)
+
+    # When: marking the selected one read with htmx
+    response = client.post("/notifications/read", data={"ids": ids[:1]}, headers=HTMX)
+
+    # Then: the partial reports one read row and the refreshed unread badge
+    assert response.status_code == 200
+    assert "1 件を既読にしました。" in response.text
+    assert f'id="notification-state-{ids[0]}" hx-swap-oob="true">既読' in response.text
+    assert 'id="notification-unread"' in response.text and ">1</span>" in response.text
+    assert _is_read(client, ids[0]) and not _is_read(client, ids[1])
+
+
+def test_read_of_another_users_notification_updates_nothing(client):
+    # Given: a notification owned by another user
+    _, other_id = _seed(client)
+
+    # When: marking it read by id
+    response = client.post(f"/notifications/{other_id}/read", headers=HTMX)
+
+    # Then: no row is updated
+    assert response.status_code == 200
+    assert "0 件を既読にしました。" in response.text
+    assert not _is_read(client, other_id)
+
+
+def test_form_post_without_htmx_redirects_to_the_list(client):
+    # Given: an unread notification
+    ids, _ = _seed(client)
+
+    # When: submitting the form without htmx
+    response = client.post(f"/notifications/{ids[0]}/read", follow_redirects=False)
+
+    # Then: the notification is read and the browser goes back to the list
+    assert response.status_code == 303
+    assert response.headers["location"] == "/notifications"
+    assert _is_read(client, ids[0])
+
+
+def test_stream_sends_unread_count_and_requires_login(client, monkeypatch):
+    # Given: a short stream for a user with one unread notification
+    monkeypatch.setattr(
+        notification_routes,
+        "stream_notifications",
+        partial(stream_notifications, keepalive_seconds=0.05, max_seconds=0.2),
+    )
+    anonymous = client.get("/notifications/stream")
+    _seed(client)
+
+    # When: connecting to the stream
+    response = client.get("/notifications/stream")
+
+    # Then: the count is sent as a Server-Sent Event, and anonymous users are rejected
+    assert anonymous.status_code == 401
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    first = response.text.split("event: unread\n", 1)[1].split("\n", 1)[0]
+    assert json.loads(first.removeprefix("data: ")) == {"unread": 1}
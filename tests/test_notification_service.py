@@ -0,0 +1,142 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlmodel import select
+
+from app.models import Notification
+from app.repositories.notification_repo import list_notifications_for_user
+from app.repositories.pagination import decode_cursor, encode_cursor
+from app.repositories.unread_repo import get_unread_counts
+from app.services.auth_service import register_user
+from app.services.notification_service import (
+    create_notification,
+    create_notifications_bulk,
+    mark_notifications_read,
+)
+
+
+def test_create_notifications_bulk_inserts_rows_in_one_commit(session):
+    # Given: three users and a commit counter
+    users = [
+        register_user(session, f"bulk{i}@example.com", "password123", "stallholder")
+        for i in range(3)
+    ]
+    commits = [0]
+    event.listen(session, "after_commit", lambda _session: commits.__setitem__(0, commits[0] + 1))
+
+    # When: notifying every user at once
+    created = create_notifications_bulk(
+        session,
+        [user.id for user in users],
+        event_type="event_updated",
+        title="更新",
+        body="本文",
+        related_type="event",
+        related_id=1,
+    )
+
+    # Then: one row per user, written in a single commit
+    rows = session.exec(select(Notification)).all()
+    assert created == 3
+    assert commits[0] == 1
+    assert sorted(row.user_id for row in rows) == sorted(user.id for user in users)
+    assert all(row.delivery_status == "queued" and row.is_read is False for row in rows)
+
+
+def test_create_notifications_bulk_deduplicates_users(session):
+    # Given: the same user listed twice
+    user = register_user(session, "dup@example.com", "password123", "stallholder")
+
+    # When: creating bulk notifications
+    created = create_notifications_bulk(
+        session, [user.id, user.id], event_type="event_updated", title="t", body="b"
+    )
+
+    # Then: only one notification is written
+    assert created == 1
+    assert len(session.exec(select(Notification)).all()) == 1
+
+
+def test_create_notifications_bulk_empty(session):
+    # Given: no recipients
+    # When: creating bulk notifications
+    created = create_notifications_bulk(
+        session, [], event_type="event_updated", title="t", body="b"
+    )
+
+    # Then: nothing is written
+    assert created == 0
+    assert session.exec(select(Notification)).all() == []
+
+
+def _statements(session) -> list[str]:
+    executed = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: executed.append(statement),
+    )
+    return executed
+
+
+def test_mark_notifications_read_by_ids_in_one_update(session):
+    # Given: unread notifications for two users and one already read
+    owner = register_user(session, "owner@example.com", "password123", "stallholder")
+    other = register_user(session, "other@example.com", "password123", "stallholder")
+    mine = [create_notification(session, owner, "news", f"n{i}", "b").id for i in range(3)]
+    theirs = create_notification(session, other, "news", "x", "b").id
+    mark_notifications_read(session, owner, ids=[mine[0]])
+    executed = _statements(session)
+
+    # When: marking mine, the read one and another user's notification
+    read_ids = mark_notifications_read(session, owner, ids=[mine[0], mine[1], theirs])
+
+    # Then: only my unread one is updated, in a single UPDATE, and the counter follows
+    assert read_ids == [mine[1]]
+    assert len([sql for sql in executed if sql.startswith("UPDATE notification")]) == 1
+    assert not any(sql.startswith("SELECT") and "FROM notification" in sql for sql in executed)
+    assert get_unread_counts(session, owner.id)["notifications"] == 1
+    assert get_unread_counts(session, other.id)["notifications"] == 1
+
+
+def test_mark_notifications_read_through_cursor(session):
+    # Given: four notifications, and a cursor at the second newest
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    created = [create_notification(session, user, "news", f"n{i}", "b") for i in range(4)]
+    page = list_notifications_for_user(session, user.id, limit=10)
+    cursor = decode_cursor(encode_cursor(page.items[1].created_at, page.items[1].id))
+
+    # When: marking everything up to the cursor as read
+    read_ids = mark_notifications_read(session, user, through=cursor)
+
+    # Then: the newest stays unread
+    assert sorted(read_ids) == [n.id for n in created[:3]]
+    assert [n.is_read for n in list_notifications_for_user(session, user.id).items] == [
+        False,
+        True,
+        True,
+        True,
+    ]
+    assert get_unread_counts(session, user.id)["notifications"] == 1
+    assert mark_notifications_read(session, user, through=cursor) == []
+
+
+def test_mark_notifications_read_through_cursor_uses_user_index(session):
+    # Given: the UPDATE issued for a cursor
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    create_notification(session, user, "news", "n", "b")
+    executed = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, *args: executed.append((statement, parameters)),
+    )
+    mark_notifications_read(session, user, through=(datetime.now(timezone.utc), 0))
+    sql, parameters = next(item for item in executed if item[0].startswith("UPDATE notification"))
+
+    # When: explaining it
+    rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters)
+    plan = " ".join(str(row) for row in rows)
+
+    # Then: it is a range read on the user's index
+    assert "ix_notification_user_created (user_id=? AND created_at<?)" in plan
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.errors import TooManyStreamsError
+from app.repositories.unit_of_work import unit_of_work
+from app.services.auth_service import register_user
+from app.services.notification_hub import NotificationHub, notification_hub, stream_notifications
+from app.services.notification_service import (
+    create_notification,
+    create_notifications_bulk,
+    mark_notification_read,
+)
+
+
+@pytest.fixture()
+def users(session):
+    return [
+        register_user(session, f"user{index}@example.com", "password123", "stallholder")
+        for index in range(2)
+    ]
+
+
+def _parse(chunks: list[str]) -> list[tuple[str, dict | None]]:
+    events = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            events.append(("keepalive", None))
+        elif chunk.startswith("event: "):
+            name, data = chunk.strip().split("\n")
+            events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+async def _take(stream, count: int) -> list[str]:
+    return [await anext(stream) for _ in range(count)]
+
+
+def test_committed_notifications_reach_only_their_user(session, users):
+    # Given: a stream for the first user
+    first, second = users
+
+    async def scenario():
+        subscription = notification_hub.subscribe(first.id)
+        try:
+            # When: notifications are committed for both users, and one is rolled back
+            create_notification(session, first, "news", "Hello", "Body")
+            create_notification(session, second, "news", "Other", "Body")
+            with pytest.raises(RuntimeError):
+                with unit_of_work(session):
+                    create_notification(session, first, "news", "Rolled back", "Body")
+                    raise RuntimeError("boom")
+            create_notifications_bulk(session, [first.id, second.id], "news", "Bulk", "Body")
+            return await subscription.next_messages(timeout=1)
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    messages = asyncio.run(scenario())
+
+    # Then: only the first user's committed notifications arrive, with their ids
+    assert [(message.event, message.data["title"]) for message in messages] == [
+        ("notification", "Hello"),
+        ("notification", "Bulk"),
+    ]
+    assert all(isinstance(message.data["id"], int) for message in messages)
+
+
+def test_stream_counts_unread_from_new_and_read_notifications(session, users):
+    # Given: a stream that counted two unread notifications up to id 5
+    user = users[0]
+    hub = NotificationHub(max_connections=10, max_per_user=2, queue_size=10)
+
+    async def scenario():
+        subscription = hub.subscribe(user.id)
+        stream = stream_notifications(subscription, 2, counted_through=5, hub=hub)
+        chunks = await _take(stream, 2)
+        # When: an already counted notification, a new one and a read arrive
+        hub.publish(user.id, "notification", {"id": 5, "title": "counted"})
+        hub.publish(user.id, "notification", {"id": 6, "title": "new"})
+        hub.publish(user.id, "read", {"ids": [1]})
+        chunks += await _take(stream, 4)
+        await stream.aclose()
+        return chunks, hub.stats()
+
+    chunks, stats = asyncio.run(scenario())
+
+    # Then: the count starts at 2, skips the counted id and ends at 2 again
+    assert chunks[0] == "retry: 3000\n\n"
+    assert _parse(chunks[1:]) == [
+        ("unread", {"unread": 2}),
+        ("notification", {"id": 5, "title": "counted"}),
+        ("notification", {"id": 6, "title": "new"}),
+        ("read", {"ids": [1]}),
+        ("unread", {"unread": 2}),
+    ]
+    assert stats["connections"] == 0
+
+
+def test_mark_read_publishes_once(session, users):
+    # Given: an unread notification and a stream
+    user = users[0]
+    notification = create_notification(session, user, "news", "Hello", "Body")
+
+    async def scenario():
+        subscription = notification_hub.subscribe(user.id)
+        try:
+            # When: it is marked read twice
+            mark_notification_read(session, notification)
+            mark_notification_read(session, notification)
+            return await subscription.next_messages(timeout=1)
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    # Then: one read event is published
+    messages = asyncio.run(scenario())
+    assert [(message.event, message.data) for message in messages] == [
+        ("read", {"ids": [notification.id]})
+    ]
+
+
+def test_idle_stream_sends_keepalive_and_ends_after_max_age():
+    # Given: a stream with short keepalive and lifetime
+    hub = NotificationHub(max_connections=10, max_per_user=2, queue_size=10)
+
+    async def scenario():
+        subscription = hub.subscribe(1)
+        stream = stream_notifications(
+            subscription, 0, hub=hub, keepalive_seconds=0.01, max_seconds=0.05
+        )
+        return [chunk async for chunk in stream], hub.stats()
+
+    # When: nothing is published
+    chunks, stats = asyncio.run(scenario())
+
+    # Then: only keepalives are sent until the stream ends and unsubscribes
+    assert {name for name, _ in _parse(chunks[2:])} == {"keepalive"}
+    assert stats["connections"] == 0
+
+
+def test_slow_stream_is_told_to_resync():
+    # Given: a stream whose queue holds two messages
+    hub = NotificationHub(max_connections=10, max_per_user=2, queue_size=2)
+
+    async def scenario():
+        subscription = hub.subscribe(1)
+        stream = stream_notifications(subscription, 0, hub=hub)
+        await _take(stream, 2)
+        # When: three messages arrive before the client reads any
+        for notification_id in range(1, 4):
+            hub.publish(1, "notification", {"id": notification_id})
+        await asyncio.sleep(0)
+        return [chunk async for chunk in stream], hub.stats()
+
+    chunks, stats = asyncio.run(scenario())
+
+    # Then: queued messages are dropped, resync is sent and the stream ends
+    assert _parse(chunks) == [("resync", {})]
+    assert stats["overflows"] == 1
+    assert stats["connections"] == 0
+
+
+def test_connection_limits():
+    # Given: a hub allowing three streams, two per user
+    hub = NotificationHub(max_connections=3, max_per_user=2, queue_size=10)
+
+    async def scenario():
+        first = [hub.subscribe(1), hub.subscribe(1)]
+        # When / Then: a third stream for the same user and a fourth overall are rejected
+        with pytest.raises(TooManyStreamsError):
+            hub.subscribe(1)
+        hub.subscribe(2)
+        with pytest.raises(TooManyStreamsError):
+            hub.subscribe(3)
+        hub.unsubscribe(first[0])
+        hub.subscribe(3)
+        return hub.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["connections"] == 3
+    assert stats["rejected"] == 2
+
+
+def test_publish_from_worker_thread():
+    # Given: a stream on the event loop
+    hub = NotificationHub(max_connections=10, max_per_user=2, queue_size=10)
+
+    async def scenario():
+        subscription = hub.subscribe(1)
+        # When: a notification is published from another thread (a sync route)
+        thread = threading.Thread(target=hub.publish, args=(1, "notification", {"id": 1}))
+        thread.start()
+        messages = await subscription.next_messages(timeout=1)
+        thread.join()
+        return messages
+
+    # Then: the stream wakes up with it
+    messages = asyncio.run(scenario())
+    assert [message.data for message in messages] == [{"id": 1}]
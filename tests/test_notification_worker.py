@@ -0,0 +1,230 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, create_engine, select
+
+from app.db import build_async_engine, create_schema, to_async_url
+from app.models import Notification
+from app.repositories.notification_repo import claim_notifications_async
+from app.services import notification_worker as worker_module
+from app.services.auth_service import register_user
+from app.services.notification_service import create_notification, create_notifications_bulk
+from app.services.notification_worker import NotificationWorker, retry_delay
+
+
+@pytest.fixture()
+def db_url(tmp_path) -> str:
+    return f"sqlite:///{tmp_path / 'outbox.db'}"
+
+
+@pytest.fixture()
+def file_session(db_url) -> Session:
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    create_schema(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture()
+def users(file_session):
+    return [
+        register_user(file_session, f"user{index}@example.com", "password123", "stallholder")
+        for index in range(3)
+    ]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = datetime.now(timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+def _run(db_url: str, work):
+    async def runner():
+        async_engine = build_async_engine(to_async_url(db_url))
+        try:
+            return await work(async_engine)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(runner())
+
+
+def _statuses(session) -> dict[int, tuple[str, int]]:
+    session.expire_all()
+    statement = select(Notification.id, Notification.delivery_status, Notification.attempts)
+    return {row_id: (status, attempts) for row_id, status, attempts in session.exec(statement)}
+
+
+def test_worker_delivers_queued_notifications_in_batches(db_url, file_session, users):
+    # Given: five queued in-app notifications
+    create_notifications_bulk(file_session, [user.id for user in users], "news", "Hi", "Body")
+    create_notification(file_session, users[0], "news", "Hi", "Body")
+    create_notification(file_session, users[1], "news", "Hi", "Body")
+
+    # When: draining the queue two rows at a time
+    async def work(engine):
+        worker = NotificationWorker(engine, batch_size=2)
+        delivered = await worker.drain()
+        return delivered, worker.stats()
+
+    delivered, stats = _run(db_url, work)
+
+    # Then: every row is sent once, in three batches, with sent_at filled
+    assert delivered == 5
+    assert set(_statuses(file_session).values()) == {("sent", 1)}
+    assert all(row.sent_at for row in file_session.exec(select(Notification)))
+    assert stats["batches"] == 3
+    assert stats["delivered"] == 5
+    assert stats["queue_depth"] == 0
+
+
+def test_failed_channel_backs_off_then_gives_up(db_url, file_session, users):
+    # Given: a channel that always fails and one that succeeds
+    create_notification(file_session, users[0], "news", "Hi", "Body", channel="email")
+    create_notification(file_session, users[1], "news", "Hi", "Body")
+    clock = Clock()
+
+    async def failing(items):
+        raise ConnectionError("smtp down")
+
+    async def work(engine):
+        worker = NotificationWorker(
+            engine, channels={**worker_module._channels, "email": failing}, clock=clock
+        )
+        first = await worker.run_once()
+        early = await worker.run_once()
+        for attempt in range(1, worker_module.MAX_ATTEMPTS):
+            clock.advance(retry_delay(attempt).total_seconds())
+            await worker.run_once()
+        return first, early, worker.stats()
+
+    first, early, stats = _run(db_url, work)
+
+    # Then: the failing row waits for its backoff and is failed after the last attempt
+    assert (first, early) == (2, 0)
+    email, in_app = sorted(file_session.exec(select(Notification)).all(), key=lambda n: n.id)
+    assert (email.delivery_status, email.attempts) == ("failed", worker_module.MAX_ATTEMPTS)
+    assert email.last_error == "ConnectionError: smtp down"
+    assert email.sent_at is None
+    assert (in_app.delivery_status, in_app.attempts) == ("sent", 1)
+    assert stats["retried"] == worker_module.MAX_ATTEMPTS - 1
+    assert stats["failed"] == 1
+
+
+def test_expired_lease_is_claimed_again(db_url, file_session, users):
+    # Given: a row claimed by a worker that stopped before recording the result
+    create_notification(file_session, users[0], "news", "Hi", "Body")
+    clock = Clock()
+
+    async def work(engine):
+        async with engine.begin() as connection:
+            await claim_notifications_async(
+                connection, clock.now, clock.now + timedelta(seconds=60), 10
+            )
+        worker = NotificationWorker(engine, clock=clock)
+        before_expiry = await worker.run_once()
+        clock.advance(61)
+        after_expiry = await worker.run_once()
+        return before_expiry, after_expiry
+
+    # When / Then: it is delivered only after the lease expires
+    assert _run(db_url, work) == (0, 1)
+    assert _statuses(file_session) == {1: ("sent", 2)}
+
+
+@pytest.mark.parametrize("tzinfo", [None, timezone.utc])
+def test_lag_accepts_naive_and_aware_due_times(db_url, file_session, monkeypatch, tzinfo):
+    # Given: a backlog whose oldest due time comes back from the driver naive or tz-aware
+    clock = Clock()
+    oldest_due = (clock.now - timedelta(seconds=30)).replace(tzinfo=tzinfo)
+
+    async def backlog(connection, now):
+        return 1, oldest_due
+
+    monkeypatch.setattr(worker_module, "outbox_backlog_async", backlog)
+
+    async def work(engine):
+        worker = NotificationWorker(engine, clock=clock)
+        await worker.run_once()
+        return worker.stats()
+
+    # When: the worker observes the queue
+    stats = _run(db_url, work)
+
+    # Then: the lag is measured in UTC without counting an error
+    assert stats["lag_seconds"] == 30.0
+    assert stats["errors"] == 0
+
+
+def test_concurrent_workers_do_not_claim_the_same_rows(db_url, file_session, users):
+    # Given: many queued notifications and a channel that records deliveries
+    for _ in range(20):
+        create_notifications_bulk(file_session, [user.id for user in users], "news", "Hi", "Body")
+    delivered: list[int] = []
+
+    async def record(items):
+        await asyncio.sleep(0)
+        delivered.extend(item.id for item in items)
+        return {}
+
+    # When: three workers drain the queue at the same time
+    async def work(engine):
+        workers = [
+            NotificationWorker(engine, batch_size=7, channels={"in_app": record}) for _ in range(3)
+        ]
+        return await asyncio.gather(*(worker.drain() for worker in workers))
+
+    counts = _run(db_url, work)
+
+    # Then: every notification is delivered exactly once
+    assert sum(counts) == 60
+    assert sorted(delivered) == list(range(1, 61))
+
+
+def test_claim_uses_due_index_without_sort(file_session):
+    # Given / When: the plan of the claim query
+    plan = file_session.exec(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM notification "
+            "WHERE delivery_status = 'queued' AND next_attempt_at <= :now "
+            "ORDER BY next_attempt_at, id LIMIT 100"
+        ),
+        params={"now": datetime.now(timezone.utc)},
+    ).all()
+    details = " ".join(row[-1] for row in plan)
+
+    # Then: it reads the due index in order
+    assert "ix_notification_delivery_due" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_background_worker_starts_and_stops(db_url, file_session, users):
+    # Given: a queued notification
+    create_notification(file_session, users[0], "news", "Hi", "Body")
+
+    # When: the worker runs as a task until the row is delivered
+    async def work(engine):
+        worker = worker_module.start_notification_worker(engine)
+        for _ in range(100):
+            if worker.stats()["delivered"]:
+                break
+            await asyncio.sleep(0.01)
+        running = worker_module.notification_worker().running
+        await worker_module.stop_notification_worker()
+        return running, worker.running, worker_module.notification_worker()
+
+    running, still_running, current = _run(db_url, work)
+
+    # Then: it delivered in the background and stopped cleanly
+    assert _statuses(file_session) == {1: ("sent", 1)}
+    assert running is True
+    assert still_running is False
+    assert current is None
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models import Notification
+from app.repositories.notification_repo import list_notifications_for_user
+from app.repositories.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.services.auth_service import register_user
+
+
+def _seed_notifications(session, user, count: int) -> None:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for index in range(count):
+        session.add(
+            Notification(
+                user_id=user.id,
+                event_type="test",
+                channel="in_app",
+                title=f"n{index}",
+                body="body",
+                created_at=base + timedelta(minutes=index),
+            )
+        )
+    session.commit()
+
+
+def test_paginate_walks_forward_newest_first(session):
+    # Given: 5 notifications
+    user = register_user(session, "page@example.com", "password123", "stallholder")
+    _seed_notifications(session, user, 5)
+
+    # When: walking pages of size 2
+    first = list_notifications_for_user(session, user.id, limit=2)
+    second = list_notifications_for_user(session, user.id, after=first.next_cursor, limit=2)
+    third = list_notifications_for_user(session, user.id, after=second.next_cursor, limit=2)
+
+    # Then: pages are newest first without gaps or duplicates
+    assert [n.title for n in first.items] == ["n4", "n3"]
+    assert [n.title for n in second.items] == ["n2", "n1"]
+    assert [n.title for n in third.items] == ["n0"]
+    assert first.prev_cursor is None
+    assert third.next_cursor is None
+
+
+def test_paginate_walks_backward_with_prev_cursor(session):
+    # Given: the second page of 5 notifications
+    user = register_user(session, "page2@example.com", "password123", "stallholder")
+    _seed_notifications(session, user, 5)
+    first = list_notifications_for_user(session, user.id, limit=2)
+    second = list_notifications_for_user(session, user.id, after=first.next_cursor, limit=2)
+
+    # When: going back with prev_cursor
+    back = list_notifications_for_user(session, user.id, before=second.prev_cursor, limit=2)
+
+    # Then: the first page is returned in the same order
+    assert [n.title for n in back.items] == ["n4", "n3"]
+    assert back.prev_cursor is None
+    assert back.next_cursor is not None
+
+
+def test_paginate_same_timestamp_uses_id_tiebreak(session):
+    # Given: 3 notifications sharing one created_at
+    user = register_user(session, "page3@example.com", "password123", "stallholder")
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for index in range(3):
+        session.add(
+            Notification(
+                user_id=user.id,
+                event_type="test",
+                channel="in_app",
+                title=f"t{index}",
+                body="body",
+                created_at=created_at,
+            )
+        )
+    session.commit()
+
+    # When: paging one row at a time
+    titles = []
+    cursor = None
+    while True:
+        page = list_notifications_for_user(session, user.id, after=cursor, limit=1)
+        titles.extend(n.title for n in page.items)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+
+    # Then: every row appears exactly once
+    assert sorted(titles) == ["t0", "t1", "t2"]
+
+
+def test_invalid_cursor_returns_first_page(session):
+    # Given: notifications and a broken cursor
+    user = register_user(session, "page4@example.com", "password123", "stallholder")
+    _seed_notifications(session, user, 3)
+
+    # When: paginating with the broken cursor
+    page = list_notifications_for_user(session, user.id, after="%%%broken", limit=2)
+
+    # Then: first page is returned
+    assert [n.title for n in page.items] == ["n2", "n1"]
+
+
+def test_limit_is_clamped(session):
+    # Given: limit 0 and limit above the maximum
+    user = register_user(session, "page5@example.com", "password123", "stallholder")
+    _seed_notifications(session, user, 3)
+
+    # When: paginating with out-of-range limits
+    zero = list_notifications_for_user(session, user.id, limit=0)
+    huge = list_notifications_for_user(session, user.id, limit=MAX_PAGE_SIZE + 1)
+
+    # Then: defaults / maximum are applied
+    assert len(zero.items) == 3
+    assert len(huge.items) == 3
+
+
+def test_cursor_round_trip():
+    # Given: a timestamp and id
+    value = datetime(2026, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+    # When: encoding and decoding
+    decoded = decode_cursor(encode_cursor(value, 42))
+
+    # Then: the original key is restored
+    assert decoded == (value, 42)
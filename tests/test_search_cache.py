@@ -0,0 +1,187 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import build_async_engine, create_schema, to_async_url
+from app.repositories.event_repo import save_event
+from app.repositories.pagination import Page
+from app.services.auth_service import register_user
+from app.services.event_service import search_events_page_cached_async
+from app.services.search_cache import SearchCache, SearchKey, search_cache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _clear_search_cache():
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+
+def _cache(keys: list[SearchKey]) -> None:
+    generation = search_cache.generation()
+    for key in keys:
+        search_cache.put(key, Page(items=[]), generation)
+
+
+def test_search_key_normalizes_filters():
+    # Given / When: equivalent filters written differently
+    first = SearchKey.build(" Tokyo ", "", date(2030, 1, 5), date(2030, 1, 1), "  手作り   雑貨 ")
+    second = SearchKey.build("Tokyo", None, date(2030, 1, 1), date(2030, 1, 5), "手作り 雑貨")
+
+    # Then: they share one cache key
+    assert first == second
+
+
+def test_cache_evicts_least_recently_used_entry():
+    # Given: a cache holding two entries, the first one read again
+    cache = SearchCache(max_entries=2, ttl_seconds=60)
+    tokyo, osaka, nagoya = (SearchKey.build(r, None, None) for r in ("Tokyo", "Osaka", "Nagoya"))
+    generation = cache.generation()
+    cache.put(tokyo, Page(items=[]), generation)
+    cache.put(osaka, Page(items=[]), generation)
+    assert cache.get(tokyo) is not None
+
+    # When: a third entry is stored
+    cache.put(nagoya, Page(items=[]), generation)
+
+    # Then: the least recently used entry is evicted
+    assert cache.get(osaka) is None
+    assert cache.get(tokyo) is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_cache_entry_expires_after_ttl():
+    # Given: an entry stored at t=0 with a 30 second TTL
+    clock = FakeClock()
+    cache = SearchCache(max_entries=10, ttl_seconds=30, clock=clock)
+    key = SearchKey.build("Tokyo", None, None)
+    cache.put(key, Page(items=[]), cache.generation())
+
+    # When / Then: it is served before the TTL and dropped after it
+    clock.now = 29
+    assert cache.get(key) is not None
+    clock.now = 30
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_result_computed_before_invalidation_is_not_stored():
+    # Given: a search started before an invalidation
+    cache = SearchCache(max_entries=10, ttl_seconds=60)
+    key = SearchKey.build("Tokyo", None, None)
+    generation = cache.generation()
+    cache.invalidate([])
+
+    # When: its result is stored afterwards
+    cache.put(key, Page(items=[]), generation)
+
+    # Then: the possibly stale result is discarded
+    assert cache.get(key) is None
+
+
+def test_approve_event_invalidates_only_matching_searches(session, users, make_event):
+    # Given: cached searches for Tokyo, Osaka, all regions and Tokyo by keyword
+    organizer, admin = users
+    tokyo = SearchKey.build("Tokyo", None, None)
+    osaka = SearchKey.build("Osaka", None, None)
+    all_regions = SearchKey.build(None, None, None)
+    tokyo_keyword = SearchKey.build("Tokyo", None, None, keyword="マルシェ")
+    _cache([tokyo, osaka, all_regions, tokyo_keyword])
+
+    # When: an event in Tokyo is approved
+    make_event(session, organizer, admin, region="Tokyo")
+
+    # Then: searches the event now appears in are dropped, Osaka stays cached
+    assert search_cache.get(tokyo) is None
+    assert search_cache.get(all_regions) is None
+    assert search_cache.get(tokyo_keyword) is None
+    assert search_cache.get(osaka) is not None
+
+
+def test_save_event_invalidates_by_old_and_new_values(session, users, make_event):
+    # Given: an open event in Tokyo and cached searches per region and by date
+    organizer, admin = users
+    event = make_event(session, organizer, admin, region="Tokyo")
+    day = event.start_date.date()
+    tokyo = SearchKey.build("Tokyo", None, None)
+    osaka = SearchKey.build("Osaka", None, None)
+    nagoya = SearchKey.build("Nagoya", None, None)
+    running = SearchKey.build(None, None, day)
+    elsewhere = SearchKey.build(None, None, day + timedelta(days=30))
+    _cache([tokyo, osaka, nagoya, running, elsewhere])
+
+    # When: the open event is moved from Tokyo to Osaka
+    event.region = "Osaka"
+    save_event(session, event)
+
+    # Then: both regions and the date it runs on are dropped, unrelated ones stay
+    assert search_cache.get(tokyo) is None
+    assert search_cache.get(osaka) is None
+    assert search_cache.get(running) is None
+    assert search_cache.get(nagoya) is not None
+    assert search_cache.get(elsewhere) is not None
+
+
+def test_changes_to_draft_events_keep_cache(session, users, make_event, edit_event):
+    # Given: cached searches and a draft event
+    organizer, _ = users
+    all_regions = SearchKey.build(None, None, None)
+    _cache([all_regions])
+
+    # When: a draft event is created and edited
+    event = make_event(session, organizer, region="Tokyo")
+    edit_event(session, organizer, event, title="Renamed")
+
+    # Then: open event searches stay cached
+    assert search_cache.get(all_regions) is not None
+
+
+def test_cached_dashboard_search_serves_repeat_from_cache(tmp_path, make_event):
+    # Given: two open events in Tokyo in a file database
+    db_url = f"sqlite:///{tmp_path / 'cache.db'}"
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    create_schema(engine)
+    with Session(engine) as session:
+        organizer = register_user(session, "org@example.com", "password123", "organizer")
+        admin = register_user(
+            session, "admin@example.com", "password123", "admin", allow_admin=True
+        )
+        first = make_event(session, organizer, admin, region="Tokyo")
+        second = make_event(session, organizer, admin, region="Tokyo")
+        expected = [second.id, first.id]
+
+    async def search_twice():
+        async_engine = build_async_engine(to_async_url(db_url))
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                miss = await search_events_page_cached_async(session, "Tokyo", None, None)
+                hit = await search_events_page_cached_async(session, "Tokyo ", None, None)
+                return miss, hit
+        finally:
+            await async_engine.dispose()
+
+    # When: the same search runs twice
+    before = search_cache.stats()
+    miss, hit = asyncio.run(search_twice())
+
+    # Then: the second call is a hit returning the same events in order
+    after = search_cache.stats()
+    assert [event.id for event in miss.items] == expected
+    assert [event.id for event in hit.items] == expected
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    engine.dispose()
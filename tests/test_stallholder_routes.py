@@ -0,0 +1,47 @@
+import pytest
+from sqlmodel import Session
+
+from app.services.auth_service import register_user
+
+
+@pytest.fixture()
+def stallholder(client, make_event):
+    with Session(client.engine) as session:
+        organizer = register_user(session, "org@example.com", "password123", "organizer")
+        make_event(session, organizer, status="open", region="Tokyo")
+        register_user(session, "stall@example.com", "password123", "stallholder")
+    client.login("stall@example.com")
+
+
+@pytest.mark.parametrize(
+    ("month", "heading"),
+    [
+        ("2030-10", "2030年10月の開催"),
+        ("2030-13", None),
+        ("9999-12", "9998年12月の開催"),
+        ("0001-01", "2年1月の開催"),
+    ],
+)
+def test_calendar_renders_partial_for_any_month(client, stallholder, month, heading):
+    # Given: a logged-in stallholder
+
+    # When: requesting a month that is valid, malformed or at the edge of the date range
+    response = client.get("/stallholder/calendar", params={"month": month})
+
+    # Then: the calendar partial is returned (out-of-range months are clamped)
+    assert response.status_code == 200
+    assert 'id="event-calendar"' in response.text
+    if heading:
+        assert heading in response.text
+
+
+@pytest.mark.parametrize("params", [{}, {"region": ""}, {"region": "   "}])
+def test_suggest_with_empty_prefix_returns_top_values(client, stallholder, params):
+    # Given: an open event in Tokyo
+
+    # When: asking for region suggestions without a prefix
+    response = client.get("/stallholder/suggest/region", params=params)
+
+    # Then: the most common regions are suggested
+    assert response.status_code == 200
+    assert '<option value="Tokyo">Tokyo（1）</option>' in response.text
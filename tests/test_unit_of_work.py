@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import select
+
+from app.models import Notification, StallholderProfile, User
+from app.repositories.unit_of_work import in_unit_of_work, persist, unit_of_work
+from app.services.auth_service import register_user
+
+
+def _count_commits(session) -> list[int]:
+    commits = [0]
+
+    def _on_commit(_session) -> None:
+        commits[0] += 1
+
+    event.listen(session, "after_commit", _on_commit)
+    return commits
+
+
+def test_register_user_commits_once(session):
+    # Given: a commit counter on the session
+    commits = _count_commits(session)
+
+    # When: registering a stallholder (user + profile)
+    user = register_user(session, "uow@example.com", "password123", "stallholder")
+
+    # Then: both rows are written in a single commit
+    assert commits[0] == 1
+    assert user.id is not None
+    profile = session.exec(
+        select(StallholderProfile).where(StallholderProfile.user_id == user.id)
+    ).first()
+    assert profile is not None
+
+
+def test_persist_assigns_primary_key_without_commit(session):
+    # Given: a commit counter and an open unit of work
+    commits = _count_commits(session)
+
+    with unit_of_work(session):
+        # When: persisting a new row
+        user = persist(session, User(email="pk@example.com", hashed_password="x", role="organizer"))
+
+        # Then: the primary key is available before the commit
+        assert user.id is not None
+        assert commits[0] == 0
+    assert commits[0] == 1
+
+
+def test_unit_of_work_rolls_back_on_error(session):
+    # Given: a unit of work that fails after staging a row
+    with pytest.raises(ValueError):
+        with unit_of_work(session):
+            persist(session, User(email="rb@example.com", hashed_password="x", role="organizer"))
+            raise ValueError("boom")
+
+    # When: reading the table afterwards
+    users = session.exec(select(User)).all()
+
+    # Then: nothing was committed and the depth is reset
+    assert users == []
+    assert not in_unit_of_work(session)
+
+
+def test_nested_unit_of_work_commits_at_outermost(session):
+    # Given: a commit counter
+    commits = _count_commits(session)
+
+    # When: calling services inside an outer unit of work
+    with unit_of_work(session):
+        user = register_user(session, "nested@example.com", "password123", "organizer")
+        session.add(
+            Notification(
+                user_id=user.id, event_type="test", channel="in_app", title="t", body="b"
+            )
+        )
+        assert commits[0] == 0
+
+    # Then: only the outermost block commits
+    assert commits[0] == 1
@@ -0,0 +1,186 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.requests import Request
+
+from app.db import build_async_engine, create_schema, to_async_url
+from app.repositories.unread_repo import add_unread, get_unread_counts
+from app.routes.deps import load_unread_counts, unread_context
+from app.services.application_service import apply_to_event
+from app.services.auth_service import register_user
+from app.services.message_service import mark_messages_read, send_message
+from app.services.notification_service import (
+    create_notification,
+    create_notifications_bulk,
+    mark_notification_read,
+)
+from app.services.unread_service import (
+    UnreadCache,
+    cached_unread_counts,
+    reconcile_unread,
+    unread_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_unread_cache():
+    unread_cache.clear()
+    yield
+    unread_cache.clear()
+
+
+@pytest.fixture()
+def approved_application(session, make_event):
+    organizer = register_user(session, "org@app.com", "password123", "organizer")
+    stallholder = register_user(session, "stall@app.com", "password123", "stallholder")
+    event = make_event(session, organizer, status="open")
+    application = apply_to_event(session, event, stallholder, memo="Join")
+    application.status = "approved"
+    session.add(application)
+    session.commit()
+    session.refresh(application)
+    return application, organizer, stallholder
+
+
+def test_notification_counter_follows_create_bulk_and_read(session):
+    # Given: two users
+    first = register_user(session, "first@example.com", "password123", "stallholder")
+    second = register_user(session, "second@example.com", "password123", "stallholder")
+
+    # When: notifications are created one by one and in bulk, then one is read twice
+    notification = create_notification(session, first, "news", "Hello", "Body")
+    create_notifications_bulk(session, [first.id, second.id], "news", "Bulk", "Body")
+    mark_notification_read(session, notification)
+    mark_notification_read(session, notification)
+
+    # Then: each counter matches the unread notifications
+    assert get_unread_counts(session, first.id)["notifications"] == 1
+    assert get_unread_counts(session, second.id)["notifications"] == 1
+
+
+def test_message_counter_counts_only_received_and_clears_on_read(session, approved_application):
+    # Given: an approved application with messages in both directions
+    application, organizer, stallholder = approved_application
+    send_message(session, application, stallholder, content="Hello")
+    send_message(session, application, stallholder, content="Are you there?")
+    send_message(session, application, organizer, content="Yes")
+
+    # When: the organizer opens the room
+    read = mark_messages_read(session, application, organizer)
+
+    # Then: only the organizer's received messages are cleared
+    assert read == 2
+    assert get_unread_counts(session, organizer.id)["messages"] == 0
+    assert get_unread_counts(session, stallholder.id)["messages"] == 1
+    assert mark_messages_read(session, application, organizer) == 0
+
+
+def test_counter_never_goes_negative(session):
+    # Given: a user without a counter row
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+
+    # When: decrementing more than the current value
+    add_unread(session, "notifications", {user.id: -3})
+    session.commit()
+
+    # Then: the counter stays at zero
+    assert get_unread_counts(session, user.id) == {"notifications": 0, "messages": 0}
+
+
+def test_reconcile_repairs_drifted_counters(session, approved_application):
+    # Given: counters that drifted after direct SQL updates
+    application, organizer, stallholder = approved_application
+    create_notification(session, stallholder, "news", "Hello", "Body")
+    send_message(session, application, stallholder, content="Hello")
+    session.exec(text("UPDATE notification SET is_read = 1"))
+    session.exec(
+        text("UPDATE unread_counter SET messages = 5 WHERE user_id = :id"),
+        params={"id": organizer.id},
+    )
+    session.commit()
+
+    # When: reconciling in small chunks
+    checked, repaired = reconcile_unread(session, chunk_size=1)
+
+    # Then: only the drifted users are rewritten, and a second run finds nothing
+    assert (checked, repaired) == (2, 2)
+    assert get_unread_counts(session, stallholder.id) == {"notifications": 0, "messages": 0}
+    assert get_unread_counts(session, organizer.id)["messages"] == 1
+    assert reconcile_unread(session) == (2, 0)
+
+
+def test_cached_counts_hit_and_invalidate_on_commit(session):
+    # Given: a user whose counts are cached
+    user = register_user(session, "user@example.com", "password123", "stallholder")
+    before = unread_cache.stats()
+    assert cached_unread_counts(session, user.id)["notifications"] == 0
+    assert cached_unread_counts(session, user.id)["notifications"] == 0
+    cached = unread_cache.stats()
+    assert (cached["misses"], cached["hits"]) == (before["misses"] + 1, before["hits"] + 1)
+
+    # When: a notification is committed for the user
+    create_notification(session, user, "news", "Hello", "Body")
+
+    # Then: the next read misses the cache and sees the new count
+    assert cached_unread_counts(session, user.id)["notifications"] == 1
+    after = unread_cache.stats()
+    assert after["misses"] == before["misses"] + 2
+    assert after["invalidations"] == before["invalidations"] + 1
+
+
+def test_cache_discards_reads_started_before_invalidation():
+    # Given: a read that started before an invalidation
+    clock = [0.0]
+    cache = UnreadCache(max_entries=1, ttl_seconds=30, clock=lambda: clock[0])
+    generation = cache.generation()
+    cache.invalidate({1})
+
+    # When: the stale result is stored, then entries expire or overflow
+    cache.put(1, {"notifications": 1, "messages": 0}, generation)
+    stale = cache.get(1)
+    cache.put(1, {"notifications": 2, "messages": 0}, cache.generation())
+    cache.put(2, {"notifications": 0, "messages": 0}, cache.generation())
+    evicted = cache.get(1)
+    clock[0] = 31
+    expired = cache.get(2)
+
+    # Then: nothing stale is returned
+    assert stale is None
+    assert evicted is None
+    assert expired is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_counts_are_loaded_by_async_dependency_not_while_rendering(tmp_path):
+    # Given: a user with one unread notification in a file database
+    db_url = f"sqlite:///{tmp_path / 'unread.db'}"
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    create_schema(engine)
+    with Session(engine) as session:
+        user = register_user(session, "user@example.com", "password123", "stallholder")
+        create_notification(session, user, "news", "Hello", "Body")
+        user_id = user.id
+    request = Request({"type": "http", "session": {"user_id": user_id}, "headers": []})
+
+    async def load():
+        async_engine = build_async_engine(to_async_url(db_url))
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                await load_unread_counts(request, session)
+                return session.in_transaction()
+        finally:
+            await async_engine.dispose()
+
+    # When: the dependency runs, then the template context is built
+    in_transaction = asyncio.run(load())
+    context = unread_context(request)
+
+    # Then: the counts come from the dependency, which already ended its read transaction
+    assert context["unread_counts"] == {"notifications": 1, "messages": 0}
+    assert in_transaction is False
+    assert unread_context(Request({"type": "http", "headers": []})) == {"unread_counts": None}
+    engine.dispose()
+